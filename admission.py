@@ -0,0 +1,263 @@
+"""
+Agent Admission Control
+=======================
+
+Concurrency ceilings and resource-aware admission for agent processes.
+
+The orchestrator used to cap itself at a hard-coded 5 coding agents and 10
+total child processes, which leaves most of a large build host idle. The
+ceilings are now configurable, and an AdmissionController sizes the coding
+and testing pools from live host signals before every spawn:
+
+- Memory: the measured RSS of running agents (or an estimate before any are
+  running) is used to work out how many more fit before memory use reaches
+  the high-water mark. Above that mark no new agents are admitted, and above
+  the critical mark the pool shrinks so finished agents are not replaced.
+- CPU: no growth while CPU usage or the 1-minute load average per CPU is
+  saturated. Agents spend most of their time waiting on the API, so the
+  CPU count itself is not a ceiling.
+
+The testing pool backs off first: it only gets capacity that is left over
+once the coding pool is sized. At least one coding agent is always admitted
+so a project can make progress on a busy host.
+
+Configuration (environment variables, typically set in .env):
+- AUTOCODER_MAX_CONCURRENCY: ceiling for concurrent coding agents (default 5)
+- AUTOCODER_MAX_TOTAL_AGENTS: ceiling for all agent processes (default 2x the above)
+- AUTOCODER_MEMORY_HIGH_PERCENT: stop admitting above this memory use (default 85)
+- AUTOCODER_MEMORY_CRITICAL_PERCENT: shrink the pools above this memory use (default 92)
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+import psutil
+
+# Largest max_concurrency the API and the schedules table accept, regardless of
+# configuration (the schedules CHECK constraint in api/database.py must match)
+CONCURRENCY_HARD_LIMIT = 64
+
+DEFAULT_MAX_CONCURRENCY = 5
+DEFAULT_MEMORY_HIGH_PERCENT = 85.0
+DEFAULT_MEMORY_CRITICAL_PERCENT = 92.0
+
+# Assumed RSS of one agent (Claude CLI + MCP servers + browser) until one is measured
+ESTIMATED_AGENT_RSS_BYTES = 768 * 1024 * 1024
+
+# Host is considered saturated above these
+CPU_HIGH_PERCENT = 90.0
+LOAD_HIGH_PER_CPU = 1.5
+
+# Host signals are re-sampled at most this often
+SAMPLE_INTERVAL_SECONDS = 2.0
+
+
+def _get_int_env(name: str, default: int, minimum: int, maximum: int) -> int:
+    """Read an integer environment variable, clamped to [minimum, maximum]."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        parsed = int(value)
+    except ValueError:
+        print(f"   - Warning: Invalid {name}='{value}', defaulting to {default}")
+        return default
+    return max(minimum, min(parsed, maximum))
+
+
+def _get_percent_env(name: str, default: float) -> float:
+    """Read a percentage environment variable (0-100)."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        parsed = float(value)
+    except ValueError:
+        print(f"   - Warning: Invalid {name}='{value}', defaulting to {default}")
+        return default
+    return max(0.0, min(parsed, 100.0))
+
+
+def get_max_concurrency() -> int:
+    """
+    Get the ceiling for concurrent coding agents.
+
+    Reads from AUTOCODER_MAX_CONCURRENCY, defaults to 5.
+    Clamped to 1..CONCURRENCY_HARD_LIMIT.
+    """
+    return _get_int_env("AUTOCODER_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY, 1, CONCURRENCY_HARD_LIMIT)
+
+
+def get_max_total_agents() -> int:
+    """
+    Get the ceiling for all agent processes (coding + testing).
+
+    Reads from AUTOCODER_MAX_TOTAL_AGENTS, defaults to twice the coding ceiling.
+    Never lower than the coding ceiling.
+    """
+    max_concurrency = get_max_concurrency()
+    return _get_int_env(
+        "AUTOCODER_MAX_TOTAL_AGENTS", 2 * max_concurrency, max_concurrency, 2 * CONCURRENCY_HARD_LIMIT
+    )
+
+
+@dataclass(frozen=True)
+class AdmissionLimits:
+    """Pool sizes for the next admission decisions."""
+    coding: int  # Max concurrent coding agents
+    testing: int  # Max concurrent testing agents
+    total: int  # Max agent processes overall
+    reason: str  # Which signal bounded the total (for logging)
+
+
+@dataclass(frozen=True)
+class HostSample:
+    """A snapshot of the host signals used for admission."""
+    cpu_percent: float
+    load_per_cpu: float | None  # None where getloadavg is unavailable (Windows)
+    memory_percent: float
+    memory_total: int
+    memory_available: int
+    agent_rss: int  # Combined RSS of running agents and their children
+    agent_count: int
+
+
+class AdmissionController:
+    """
+    Sizes the coding and testing agent pools from configured ceilings and
+    live host signals.
+
+    Thread-safe. Sampling is rate-limited, so limits() can be called before
+    every spawn.
+    """
+
+    def __init__(
+        self,
+        max_coding: int,
+        max_testing: int,
+        max_total: int,
+        memory_high_percent: float | None = None,
+        memory_critical_percent: float | None = None,
+    ):
+        self.max_coding = max(1, max_coding)
+        self.max_testing = max(0, max_testing)
+        self.max_total = max(1, max_total)
+        if memory_high_percent is None:
+            memory_high_percent = _get_percent_env("AUTOCODER_MEMORY_HIGH_PERCENT", DEFAULT_MEMORY_HIGH_PERCENT)
+        if memory_critical_percent is None:
+            memory_critical_percent = _get_percent_env(
+                "AUTOCODER_MEMORY_CRITICAL_PERCENT", DEFAULT_MEMORY_CRITICAL_PERCENT
+            )
+        self.memory_high_percent = memory_high_percent
+        self.memory_critical_percent = max(memory_critical_percent, memory_high_percent)
+        self.cpu_count = psutil.cpu_count() or 1
+
+        self._lock = threading.Lock()
+        self._processes: dict[int, psutil.Process] = {}
+        self._sample: HostSample | None = None
+        self._sampled_at = 0.0
+        # Prime the CPU counter: the first interval=None call always returns 0.0
+        psutil.cpu_percent(interval=None)
+
+    def limits(self, coding_pids: list[int], testing_pids: list[int]) -> AdmissionLimits:
+        """
+        Compute pool sizes for the currently running agents.
+
+        Args:
+            coding_pids: PIDs of running coding agents
+            testing_pids: PIDs of running testing agents
+
+        Returns:
+            AdmissionLimits to compare the running counts against
+        """
+        running = len(coding_pids) + len(testing_pids)
+        sample = self.sample(coding_pids + testing_pids)
+        total, reason = self._capacity(sample, running)
+
+        coding = max(1, min(self.max_coding, total))
+        testing = min(self.max_testing, max(0, total - coding))
+        return AdmissionLimits(coding=coding, testing=testing, total=max(1, total), reason=reason)
+
+    def sample(self, pids: list[int]) -> HostSample:
+        """Return host signals, re-sampling at most every SAMPLE_INTERVAL_SECONDS."""
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._sample is not None
+                and now - self._sampled_at < SAMPLE_INTERVAL_SECONDS
+                and self._sample.agent_count == len(pids)
+            ):
+                return self._sample
+
+            memory = psutil.virtual_memory()
+            load_per_cpu = None
+            if hasattr(os, "getloadavg"):
+                try:
+                    load_per_cpu = os.getloadavg()[0] / self.cpu_count
+                except OSError:
+                    pass
+
+            self._sample = HostSample(
+                cpu_percent=psutil.cpu_percent(interval=None),
+                load_per_cpu=load_per_cpu,
+                memory_percent=memory.percent,
+                memory_total=memory.total,
+                memory_available=memory.available,
+                agent_rss=self._agent_rss(pids),
+                agent_count=len(pids),
+            )
+            self._sampled_at = now
+            return self._sample
+
+    def _agent_rss(self, pids: list[int]) -> int:
+        """Combined RSS of the given agents and their child processes."""
+        # Keep Process objects across samples so psutil can reuse its handles
+        self._processes = {pid: self._processes.get(pid) or _process(pid) for pid in pids}
+        total = 0
+        for proc in self._processes.values():
+            if proc is None:
+                continue
+            try:
+                total += proc.memory_info().rss
+                for child in proc.children(recursive=True):
+                    try:
+                        total += child.memory_info().rss
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        pass
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return total
+
+    def _capacity(self, sample: HostSample, running: int) -> tuple[int, str]:
+        """Total agent processes the host can take right now, and why."""
+        if sample.memory_percent >= self.memory_critical_percent:
+            # Back off: don't replace agents as they finish until pressure drops
+            return running // 2, "memory critical"
+        if sample.memory_percent >= self.memory_high_percent:
+            return min(running, self.max_total), "memory high"
+
+        if sample.cpu_percent >= CPU_HIGH_PERCENT:
+            return min(running, self.max_total), "cpu saturated"
+        if sample.load_per_cpu is not None and sample.load_per_cpu >= LOAD_HIGH_PER_CPU:
+            return min(running, self.max_total), "load saturated"
+
+        per_agent = ESTIMATED_AGENT_RSS_BYTES
+        if sample.agent_count and sample.agent_rss:
+            per_agent = max(sample.agent_rss // sample.agent_count, 1)
+        reserve = sample.memory_total * (100.0 - self.memory_high_percent) / 100.0
+        headroom = max(0.0, sample.memory_available - reserve)
+        by_memory = running + int(headroom // per_agent)
+
+        capacity, reason = self.max_total, "configured ceiling"
+        if by_memory < capacity:
+            capacity, reason = by_memory, "memory headroom"
+        return capacity, reason
+
+
+def _process(pid: int) -> psutil.Process | None:
+    try:
+        return psutil.Process(pid)
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
@@ -7,8 +7,10 @@ Core agent interaction functions for running autonomous coding sessions.
 
 import asyncio
 import io
+import json
 import re
 import sys
+import traceback
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
@@ -31,6 +33,7 @@ from prompts import (
     get_single_feature_prompt,
     get_testing_prompt,
 )
+from worker_pool import WORKER_DONE_MARKER, WORKER_READY_MARKER
 
 # Configuration
 AUTO_CONTINUE_DELAY_SECONDS = 3
@@ -355,3 +358,55 @@ async def run_autonomous_agent(
     print("-" * 70)
 
     print("\nDone!")
+
+
+async def run_agent_worker(
+    project_dir: Path,
+    model: str,
+    yolo_mode: bool = False,
+) -> None:
+    """
+    Run as a pooled worker for the parallel orchestrator.
+
+    Imports and setup are paid once; each assignment then runs a single
+    session exactly like a `--max-iterations 1` subprocess would. Assignments
+    arrive as JSON lines on stdin:
+
+        {"agent_type": "coding", "feature_id": 42}
+        {"agent_type": "testing", "testing_feature_id": 7}
+
+    After each assignment a done marker with the exit status (0 or 1) is
+    printed. The worker exits when stdin is closed.
+
+    Args:
+        project_dir: Directory for the project
+        model: Claude model to use
+        yolo_mode: If True, skip browser testing in coding agent prompts
+    """
+    print(WORKER_READY_MARKER, flush=True)
+
+    while True:
+        line = await asyncio.to_thread(sys.stdin.readline)
+        if not line:
+            break  # Orchestrator closed the pipe
+        if not line.strip():
+            continue
+
+        status = 0
+        try:
+            assignment = json.loads(line)
+            await run_autonomous_agent(
+                project_dir=project_dir,
+                model=model,
+                max_iterations=1,
+                yolo_mode=yolo_mode,
+                feature_id=assignment.get("feature_id"),
+                agent_type=assignment["agent_type"],
+                testing_feature_id=assignment.get("testing_feature_id"),
+            )
+        except Exception as e:
+            print(f"\nFatal error: {e}")
+            traceback.print_exc(file=sys.stdout)
+            status = 1
+
+        print(f"{WORKER_DONE_MARKER} {json.dumps({'status': status})}", flush=True)
@@ -5,6 +5,6 @@ API Package
 Database models and utilities for feature management.
 """
 
-from api.database import Feature, create_database, get_database_path
+from api.database import Feature, create_database, get_database, get_database_path
 
-__all__ = ["Feature", "create_database", "get_database_path"]
+__all__ = ["Feature", "create_database", "get_database", "get_database_path"]
@@ -5,10 +5,14 @@ Database Models and Connection
 SQLite database schema for feature storage using SQLAlchemy.
 """
 
+import os
+import re
+import sqlite3
 import sys
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 
 def _utc_now() -> datetime:
@@ -20,19 +24,48 @@ from sqlalchemy import (
     CheckConstraint,
     Column,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
     String,
     Text,
     create_engine,
+    desc,
+    select,
     text,
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Session, relationship, sessionmaker
 from sqlalchemy.types import JSON
 
-Base = declarative_base()
+from api.sqlite_profile import (
+    apply_pragma_profile,
+    forget_engine,
+    get_pragma_profile,
+    install_profile,
+    start_wal_checkpointer,
+)
+
+# Any: mypy can't see the classes declarative_base() returns
+Base: Any = declarative_base()
+
+
+class FeatureContent(Base):
+    """Cold, large text of a feature, stored apart from the hot status columns.
+
+    Status, scheduling and stats queries scan the narrow features table
+    without paging description and steps through the SQLite cache. Feature
+    exposes both as ordinary attributes, so callers never use this directly.
+    """
+
+    __tablename__ = "feature_content"
+
+    # Same value as features.id; rows are removed with their feature by trigger
+    feature_id = Column(Integer, primary_key=True)
+    description = Column(Text, nullable=False)
+    steps = Column(JSON, nullable=False)  # Stored as JSON array
 
 
 class Feature(Base):
@@ -44,19 +77,72 @@ class Feature(Base):
     # Used by feature_get_stats, get_ready_features, and other status queries
     __table_args__ = (
         Index('ix_feature_status', 'passes', 'in_progress'),
+        # Kanban columns in display order, for keyset-paginated listings
+        Index('ix_feature_status_order', 'passes', 'in_progress', 'priority', 'id'),
+        # Ready features in scheduling order, so top-N ready queries stop after N rows
+        Index('ix_feature_ready_order', 'passes', 'in_progress', desc('scheduling_score'), 'priority', 'id'),
     )
 
     id = Column(Integer, primary_key=True, index=True)
     priority = Column(Integer, nullable=False, default=999, index=True)
     category = Column(String(100), nullable=False)
     name = Column(String(255), nullable=False)
-    description = Column(Text, nullable=False)
-    steps = Column(JSON, nullable=False)  # Stored as JSON array
     passes = Column(Boolean, nullable=False, default=False, index=True)
     in_progress = Column(Boolean, nullable=False, default=False, index=True)
     # Dependencies: list of feature IDs that must be completed before this feature
     # NULL/empty = no dependencies (backwards compatible)
     dependencies = Column(JSON, nullable=True, default=None)
+    # Claim lease (see api/feature_claims.py): who holds in_progress and until when.
+    # NULL lease_expires_at on an in-progress feature = legacy claim without a lease
+    claimed_by = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True, index=True)
+    # Persisted SchedulingIndex score (higher = schedule first), recomputed lazily
+    # when the graph changes (see api/feature_queries.refresh_scheduling_scores)
+    scheduling_score = Column(Float, nullable=False, default=0.0)
+    # data_version.version of the last visible change, stamped by triggers
+    # (see get_changes_since in api/feature_queries.py)
+    updated_version = Column(Integer, nullable=False, default=0, index=True)
+
+    # description and steps live in feature_content, loaded with one extra
+    # IN query per result batch and written along with the feature
+    content = relationship(
+        FeatureContent,
+        primaryjoin="Feature.id == foreign(FeatureContent.feature_id)",
+        uselist=False,
+        lazy="selectin",
+        cascade="all, delete-orphan",
+    )
+
+    def _content(self) -> FeatureContent:
+        if self.content is None:
+            self.content = FeatureContent(description="", steps=[])
+        return self.content
+
+    @hybrid_property
+    def description(self) -> Optional[str]:
+        return self.content.description if self.content is not None else None
+
+    @description.inplace.setter
+    def _description_setter(self, value: Optional[str]) -> None:
+        self._content().description = value  # type: ignore[assignment]
+
+    @description.inplace.expression
+    @classmethod
+    def _description_expression(cls):
+        return select(FeatureContent.description).where(FeatureContent.feature_id == cls.id).scalar_subquery()
+
+    @hybrid_property
+    def steps(self) -> Optional[list]:
+        return self.content.steps if self.content is not None else None
+
+    @steps.inplace.setter
+    def _steps_setter(self, value: Optional[list]) -> None:
+        self._content().steps = value  # type: ignore[assignment]
+
+    @steps.inplace.expression
+    @classmethod
+    def _steps_expression(cls):
+        return select(FeatureContent.steps).where(FeatureContent.feature_id == cls.id).scalar_subquery()
 
     def to_dict(self) -> dict:
         """Convert feature to dictionary for JSON serialization."""
@@ -74,6 +160,13 @@ class Feature(Base):
             "dependencies": self.dependencies if self.dependencies else [],
         }
 
+    def clear_claim(self) -> None:
+        """Clear in_progress along with its lease."""
+        # Column attributes are typed as Column[...] on instances, not their values
+        self.in_progress = False  # type: ignore[assignment]
+        self.claimed_by = None  # type: ignore[assignment]
+        self.lease_expires_at = None  # type: ignore[assignment]
+
     def get_dependencies_safe(self) -> list[int]:
         """Safely extract dependencies, handling NULL and malformed data."""
         if self.dependencies is None:
@@ -83,6 +176,143 @@ class Feature(Base):
         return []
 
 
+class FeatureDependency(Base):
+    """Dependency edge: feature_id cannot start until depends_on_id passes.
+
+    A normalized copy of Feature.dependencies, indexed in both directions so
+    graph questions can be answered in SQL (see api/feature_queries.py).
+    Triggers keep it in sync with the JSON column on every write, whatever the
+    writer, so it is never written directly.
+    """
+
+    __tablename__ = "feature_dependencies"
+
+    __table_args__ = (
+        # Reverse lookups: "what depends on X?"
+        Index('ix_feature_dependencies_reverse', 'depends_on_id', 'feature_id'),
+        {"sqlite_with_rowid": False},
+    )
+
+    feature_id = Column(Integer, primary_key=True)
+    # May reference a feature that doesn't exist (yet) - such an edge never passes
+    depends_on_id = Column(Integer, primary_key=True)
+
+
+class SchedulingState(Base):
+    """Single-row bookkeeping for persisted scheduling scores.
+
+    Triggers bump graph_version whenever a change can move scores (features
+    added or removed, passes/priority/dependencies updated). Scores are
+    current when scored_version == graph_version.
+    """
+
+    __tablename__ = "scheduling_state"
+
+    id = Column(Integer, primary_key=True)
+    graph_version = Column(Integer, nullable=False, default=0)
+    scored_version = Column(Integer, nullable=False, default=0)
+
+
+class PrioritySequence(Base):
+    """Single-row counter handing out feature priorities (see allocate_priorities).
+
+    Triggers keep next_priority above any priority written explicitly (the
+    REST API, JSON imports), so allocated priorities always sort last.
+    """
+
+    __tablename__ = "priority_sequence"
+
+    id = Column(Integer, primary_key=True)
+    next_priority = Column(Integer, nullable=False, default=1)
+
+
+_ALLOCATE_PRIORITIES_SQL = text(
+    "UPDATE priority_sequence SET next_priority = next_priority + :count "
+    "WHERE id = 1 RETURNING next_priority - :count"
+)
+
+
+def allocate_priorities(session: Session, count: int = 1) -> int:
+    """Reserve `count` consecutive priorities after every existing one.
+
+    A single UPDATE ... RETURNING on the counter row, so it is O(1) and safe
+    across processes: the update takes SQLite's write lock, which is held
+    until the caller commits the transaction that uses the priorities.
+
+    Returns:
+        The first reserved priority.
+    """
+    start = session.execute(_ALLOCATE_PRIORITIES_SQL, {"count": count}).scalar()
+    if start is None:
+        # Counter row missing (created by an older schema) - seed it once
+        session.execute(text(
+            "INSERT OR IGNORE INTO priority_sequence (id, next_priority) "
+            "SELECT 1, COALESCE(MAX(priority), 0) + 1 FROM features"
+        ))
+        start = session.execute(_ALLOCATE_PRIORITIES_SQL, {"count": count}).scalar_one()
+    return int(start)
+
+
+class DataVersion(Base):
+    """Single-row change counter for the feature data shown by the UI.
+
+    Triggers bump version on every insert, delete and update of a visible
+    feature column, whichever process writes (MCP server, REST API, expand
+    session, orchestrator). Lease renewals and scheduling scores don't count.
+    epoch is random per database, so a recreated database never reuses a
+    version. Together they make a cheap validator for conditional GETs.
+    """
+
+    __tablename__ = "data_version"
+
+    id = Column(Integer, primary_key=True)
+    epoch = Column(String(32), nullable=False)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class FeatureTombstone(Base):
+    """Deleted feature ID with the data version of its deletion, written by triggers.
+
+    Lets delta-sync clients learn about deletions; a re-created ID removes
+    its tombstone.
+    """
+
+    __tablename__ = "feature_tombstones"
+
+    feature_id = Column(Integer, primary_key=True)
+    deleted_version = Column(Integer, nullable=False, index=True)
+
+
+class FeatureAttempt(Base):
+    """One coding-agent run on a feature, recorded by the orchestrator when the agent exits.
+
+    category and steps (the step count) are copied from the feature at the
+    time, so history outlives edits and deletions. Feeds the duration
+    estimates behind critical-path scheduling (see api/feature_durations.py).
+    """
+
+    __tablename__ = "feature_attempts"
+
+    id = Column(Integer, primary_key=True)
+    feature_id = Column(Integer, nullable=False, index=True)
+    category = Column(String(100), nullable=False)
+    steps = Column(Integer, nullable=False)
+    started_at = Column(DateTime, nullable=False)
+    duration_seconds = Column(Float, nullable=False)
+    # "passed", "failed" or "stopped" (killed by the user or on shutdown)
+    outcome = Column(String(16), nullable=False)
+
+
+def get_data_version(session: Session) -> Optional[tuple[str, int]]:
+    """(epoch, version) of the feature data, or None if the row is missing.
+
+    A primary-key lookup on data_version; the features table isn't read.
+    """
+    table = DataVersion.__table__
+    row = session.execute(select(table.c.epoch, table.c.version).where(table.c.id == 1)).first()
+    return (row.epoch, row.version) if row else None
+
+
 class Schedule(Base):
     """Time-based schedule for automated agent start/stop."""
 
@@ -92,7 +322,7 @@ class Schedule(Base):
     __table_args__ = (
         CheckConstraint('duration_minutes >= 1 AND duration_minutes <= 1440', name='ck_schedule_duration'),
         CheckConstraint('days_of_week >= 0 AND days_of_week <= 127', name='ck_schedule_days'),
-        CheckConstraint('max_concurrency >= 1 AND max_concurrency <= 5', name='ck_schedule_concurrency'),
+        CheckConstraint('max_concurrency >= 1 AND max_concurrency <= 64', name='ck_schedule_concurrency'),
         CheckConstraint('crash_count >= 0', name='ck_schedule_crash_count'),
     )
 
@@ -112,7 +342,7 @@ class Schedule(Base):
     # Agent configuration for scheduled runs
     yolo_mode = Column(Boolean, nullable=False, default=False)
     model = Column(String(50), nullable=True)  # None = use global default
-    max_concurrency = Column(Integer, nullable=False, default=3)  # 1-5 concurrent agents
+    max_concurrency = Column(Integer, nullable=False, default=3)  # 1-64 (admission.CONCURRENCY_HARD_LIMIT)
 
     # Crash recovery tracking
     crash_count = Column(Integer, nullable=False, default=0)  # Resets at window start
@@ -332,46 +562,498 @@ def _migrate_add_schedules_tables(engine) -> None:
                 conn.commit()
 
 
+def _migrate_relax_schedule_concurrency_limit(engine) -> None:
+    """Raise the schedules max_concurrency CHECK from 5 to 64.
+
+    SQLite cannot alter a CHECK constraint in place, so the table is rebuilt
+    from its own DDL with the new bound (the documented create-copy-drop-rename
+    procedure). Databases created with the new constraint, or whose
+    max_concurrency column was added without one, are left untouched.
+    """
+    old_check = "max_concurrency <= 5)"
+    with engine.connect() as conn:
+        table_sql = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'schedules'")
+        ).scalar()
+        if not table_sql or old_check not in table_sql:
+            return
+
+        index_sql = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'schedules' AND sql IS NOT NULL")
+        ).scalars().all()
+        new_sql = re.sub(
+            r'^CREATE TABLE\s+"?schedules"?', "CREATE TABLE _schedules_new", table_sql, count=1
+        ).replace(old_check, "max_concurrency <= 64)")
+
+        conn.execute(text(new_sql))
+        conn.execute(text("INSERT INTO _schedules_new SELECT * FROM schedules"))
+        conn.execute(text("DROP TABLE schedules"))
+        conn.execute(text("ALTER TABLE _schedules_new RENAME TO schedules"))
+        for sql in index_sql:
+            conn.execute(text(sql))
+        conn.commit()
+
+
+def _migrate_add_lease_columns(engine) -> None:
+    """Add claimed_by and lease_expires_at (with index) for claim leases."""
+    with engine.connect() as conn:
+        columns = [row[1] for row in conn.execute(text("PRAGMA table_info(features)")).fetchall()]
+        if "claimed_by" not in columns:
+            conn.execute(text("ALTER TABLE features ADD COLUMN claimed_by VARCHAR(100) DEFAULT NULL"))
+        if "lease_expires_at" not in columns:
+            conn.execute(text("ALTER TABLE features ADD COLUMN lease_expires_at DATETIME DEFAULT NULL"))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_features_lease_expires_at ON features (lease_expires_at)"
+        ))
+        conn.commit()
+
+
+# Dependency IDs of a features row as a JSON array, '[]' if NULL or malformed
+# (json_each raises on malformed JSON; CASE guarantees the guards run first)
+_DEPENDENCY_ARRAY_SQL = (
+    "CASE WHEN json_valid({row}.dependencies) THEN "
+    "CASE WHEN json_type({row}.dependencies) = 'array' THEN {row}.dependencies ELSE '[]' END "
+    "ELSE '[]' END"
+)
+
+_INSERT_DEPENDENCY_EDGES_SQL = (
+    "INSERT OR IGNORE INTO feature_dependencies (feature_id, depends_on_id) "
+    "SELECT {row}.id, dep.value FROM {source}json_each(" + _DEPENDENCY_ARRAY_SQL + ") AS dep "
+    "WHERE dep.type = 'integer'"
+)
+
+_DEPENDENCY_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_feature_dependencies_insert
+    AFTER INSERT ON features
+    BEGIN
+        {_INSERT_DEPENDENCY_EDGES_SQL.format(row="NEW", source="")};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_feature_dependencies_update
+    AFTER UPDATE OF id, dependencies ON features
+    BEGIN
+        DELETE FROM feature_dependencies WHERE feature_id = OLD.id;
+        {_INSERT_DEPENDENCY_EDGES_SQL.format(row="NEW", source="")};
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_feature_dependencies_delete
+    AFTER DELETE ON features
+    BEGIN
+        DELETE FROM feature_dependencies WHERE feature_id = OLD.id;
+    END""",
+]
+
+
+def _migrate_add_dependency_edges(engine) -> None:
+    """Create the feature_dependencies edge table, its sync triggers, and backfill it.
+
+    The backfill rebuilds the table from the JSON column, so re-running it is
+    harmless.
+    """
+    FeatureDependency.__table__.create(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        for trigger_sql in _DEPENDENCY_TRIGGERS:
+            conn.execute(text(trigger_sql))
+        conn.execute(text("DELETE FROM feature_dependencies"))
+        conn.execute(text(_INSERT_DEPENDENCY_EDGES_SQL.format(row="f", source="features AS f, ")))
+        conn.commit()
+
+
+_GRAPH_VERSION_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_scheduling_state_{name}
+    AFTER {event} ON features
+    BEGIN
+        UPDATE scheduling_state SET graph_version = graph_version + 1 WHERE id = 1;
+    END"""
+    for name, event in (
+        ("insert", "INSERT"),
+        ("update", "UPDATE OF passes, priority, dependencies"),
+        ("delete", "DELETE"),
+    )
+]
+
+
+def _migrate_add_scheduling_scores(engine) -> None:
+    """Add the persisted scheduling_score column, its ready-order index, and score bookkeeping."""
+    with engine.connect() as conn:
+        columns = [row[1] for row in conn.execute(text("PRAGMA table_info(features)")).fetchall()]
+        if "scheduling_score" not in columns:
+            conn.execute(text("ALTER TABLE features ADD COLUMN scheduling_score FLOAT NOT NULL DEFAULT 0.0"))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_feature_ready_order "
+            "ON features (passes, in_progress, scheduling_score DESC, priority, id)"
+        ))
+        conn.commit()
+    SchedulingState.__table__.create(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        # graph_version ahead of scored_version: the first reader computes scores
+        conn.execute(text(
+            "INSERT OR IGNORE INTO scheduling_state (id, graph_version, scored_version) VALUES (1, 1, 0)"
+        ))
+        for trigger_sql in _GRAPH_VERSION_TRIGGERS:
+            conn.execute(text(trigger_sql))
+        conn.commit()
+
+
+_PRIORITY_SEQUENCE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_priority_sequence_{name}
+    AFTER {event} ON features
+    WHEN NEW.priority IS NOT NULL
+    BEGIN
+        UPDATE priority_sequence SET next_priority = NEW.priority + 1
+        WHERE id = 1 AND next_priority <= NEW.priority;
+    END"""
+    for name, event in (("insert", "INSERT"), ("update", "UPDATE OF priority"))
+]
+
+
+def _migrate_add_priority_sequence(engine) -> None:
+    """Create the priority counter, seeded after the current maximum, and its triggers."""
+    PrioritySequence.__table__.create(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        conn.execute(text(
+            "INSERT OR IGNORE INTO priority_sequence (id, next_priority) "
+            "SELECT 1, COALESCE(MAX(priority), 0) + 1 FROM features"
+        ))
+        for trigger_sql in _PRIORITY_SEQUENCE_TRIGGERS:
+            conn.execute(text(trigger_sql))
+        conn.commit()
+
+
+def _migrate_add_status_order_index(engine) -> None:
+    """Add the (passes, in_progress, priority, id) index for paginated feature listings."""
+    with engine.connect() as conn:
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_feature_status_order "
+            "ON features (passes, in_progress, priority, id)"
+        ))
+        conn.commit()
+
+
+# Feature columns the UI renders; other updates (leases, scores) keep the version
+_DATA_VERSION_COLUMNS = "priority, category, name, description, steps, passes, in_progress, dependencies"
+
+_DATA_VERSION_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_data_version_{name}
+    AFTER {event} ON features
+    BEGIN
+        UPDATE data_version SET version = version + 1 WHERE id = 1;
+    END"""
+    for name, event in (
+        ("insert", "INSERT"),
+        ("update", f"UPDATE OF {_DATA_VERSION_COLUMNS}"),
+        ("delete", "DELETE"),
+    )
+]
+
+
+def _migrate_add_data_version(engine) -> None:
+    """Create the data version counter with a random epoch, and its triggers."""
+    DataVersion.__table__.create(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        conn.execute(text(
+            "INSERT OR IGNORE INTO data_version (id, epoch, version) VALUES (1, lower(hex(randomblob(8))), 1)"
+        ))
+        for trigger_sql in _DATA_VERSION_TRIGGERS:
+            conn.execute(text(trigger_sql))
+        conn.commit()
+
+
+_CURRENT_DATA_VERSION_SQL = "COALESCE((SELECT version FROM data_version WHERE id = 1), 0)"
+
+# Replace the data version triggers: also stamp updated_version on the row and
+# record deletions (an id change deletes the old id)
+_CHANGE_TRACKING_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_feature_changes_insert
+    AFTER INSERT ON features
+    BEGIN
+        UPDATE data_version SET version = version + 1 WHERE id = 1;
+        UPDATE features SET updated_version = {_CURRENT_DATA_VERSION_SQL} WHERE id = NEW.id;
+        DELETE FROM feature_tombstones WHERE feature_id = NEW.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_feature_changes_update
+    AFTER UPDATE OF id, {_DATA_VERSION_COLUMNS} ON features
+    BEGIN
+        UPDATE data_version SET version = version + 1 WHERE id = 1;
+        UPDATE features SET updated_version = {_CURRENT_DATA_VERSION_SQL} WHERE id = NEW.id;
+        INSERT OR REPLACE INTO feature_tombstones (feature_id, deleted_version)
+        SELECT OLD.id, {_CURRENT_DATA_VERSION_SQL} WHERE OLD.id != NEW.id;
+        DELETE FROM feature_tombstones WHERE feature_id = NEW.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_feature_changes_delete
+    AFTER DELETE ON features
+    BEGIN
+        UPDATE data_version SET version = version + 1 WHERE id = 1;
+        INSERT OR REPLACE INTO feature_tombstones (feature_id, deleted_version)
+        VALUES (OLD.id, {_CURRENT_DATA_VERSION_SQL});
+    END""",
+]
+
+
+def _migrate_add_change_tracking(engine) -> None:
+    """Add features.updated_version and feature_tombstones for delta sync."""
+    FeatureTombstone.__table__.create(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        columns = [row[1] for row in conn.execute(text("PRAGMA table_info(features)")).fetchall()]
+        if "updated_version" not in columns:
+            conn.execute(text("ALTER TABLE features ADD COLUMN updated_version INTEGER NOT NULL DEFAULT 0"))
+            # Existing rows are as new as the current version
+            conn.execute(text(f"UPDATE features SET updated_version = {_CURRENT_DATA_VERSION_SQL}"))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_features_updated_version ON features (updated_version)"
+        ))
+        for name in ("insert", "update", "delete"):
+            conn.execute(text(f"DROP TRIGGER IF EXISTS trg_data_version_{name}"))
+        for trigger_sql in _CHANGE_TRACKING_TRIGGERS:
+            conn.execute(text(trigger_sql))
+        conn.commit()
+
+
+# After the content split: visible columns left in features, plus feature_content writes
+_CONTENT_SPLIT_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_feature_changes_update
+    AFTER UPDATE OF id, priority, category, name, passes, in_progress, dependencies ON features
+    BEGIN
+        UPDATE data_version SET version = version + 1 WHERE id = 1;
+        UPDATE features SET updated_version = {_CURRENT_DATA_VERSION_SQL} WHERE id = NEW.id;
+        INSERT OR REPLACE INTO feature_tombstones (feature_id, deleted_version)
+        SELECT OLD.id, {_CURRENT_DATA_VERSION_SQL} WHERE OLD.id != NEW.id;
+        DELETE FROM feature_tombstones WHERE feature_id = NEW.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_feature_content_cleanup
+    AFTER DELETE ON features
+    BEGIN
+        DELETE FROM feature_content WHERE feature_id = OLD.id;
+    END""",
+] + [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_feature_content_{name}
+    AFTER {event} ON feature_content
+    BEGIN
+        UPDATE data_version SET version = version + 1 WHERE id = 1;
+        UPDATE features SET updated_version = {_CURRENT_DATA_VERSION_SQL} WHERE id = NEW.feature_id;
+    END"""
+    for name, event in (("insert", "INSERT"), ("update", "UPDATE OF description, steps"))
+]
+
+
+def _migrate_split_feature_content(engine) -> None:
+    """Move description and steps out of features into feature_content.
+
+    Runs in one IMMEDIATE transaction, so a concurrent migrator waits and then
+    finds the columns gone instead of failing with "no such column".
+    """
+    with engine.connect() as conn:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        FeatureContent.__table__.create(bind=conn, checkfirst=True)
+        columns = [row[1] for row in conn.execute(text("PRAGMA table_info(features)")).fetchall()]
+        conn.execute(text("DROP TRIGGER IF EXISTS trg_feature_changes_update"))
+        if "description" in columns:
+            conn.execute(text(
+                "INSERT OR IGNORE INTO feature_content (feature_id, description, steps) "
+                "SELECT id, COALESCE(description, ''), COALESCE(steps, '[]') FROM features"
+            ))
+            # Rewrites features without the text; freed pages are reused by later writes
+            conn.execute(text("ALTER TABLE features DROP COLUMN description"))
+            conn.execute(text("ALTER TABLE features DROP COLUMN steps"))
+        for trigger_sql in _CONTENT_SPLIT_TRIGGERS:
+            conn.execute(text(trigger_sql))
+        conn.commit()
+
+
+def _migrate_add_feature_attempts(engine) -> None:
+    """Create the feature_attempts history table."""
+    FeatureAttempt.__table__.create(bind=engine, checkfirst=True)
+
+
+# Ordered schema migrations: (version, migration). The database records the
+# last applied version in PRAGMA user_version, so a current database skips
+# create_all and every migration after a single PRAGMA read.
+#
+# Migrations must be idempotent: they also run on freshly created databases
+# and on legacy databases that predate versioning (user_version 0). To change
+# the schema, append a new entry - never renumber or remove existing ones.
+_MIGRATIONS = [
+    (1, _migrate_add_in_progress_column),
+    (2, _migrate_fix_null_boolean_fields),
+    (3, _migrate_add_dependencies_column),
+    (4, _migrate_add_testing_columns),
+    (5, _migrate_add_schedules_tables),
+    (6, _migrate_relax_schedule_concurrency_limit),
+    (7, _migrate_add_lease_columns),
+    (8, _migrate_add_dependency_edges),
+    (9, _migrate_add_scheduling_scores),
+    (10, _migrate_add_priority_sequence),
+    (11, _migrate_add_status_order_index),
+    (12, _migrate_add_data_version),
+    (13, _migrate_add_change_tracking),
+    (14, _migrate_split_feature_content),
+    (15, _migrate_add_feature_attempts),
+]
+
+SCHEMA_VERSION = _MIGRATIONS[-1][0]
+
+
+def get_schema_version(engine) -> int:
+    """Return the schema version stamped in the database (0 if never stamped)."""
+    with engine.connect() as conn:
+        return conn.execute(text("PRAGMA user_version")).scalar() or 0
+
+
+def _set_schema_version(engine, version: int) -> None:
+    with engine.connect() as conn:
+        conn.execute(text(f"PRAGMA user_version = {int(version)}"))
+        conn.commit()
+
+
+def _run_migrations(engine, current_version: int) -> None:
+    """Apply migrations newer than current_version, stamping after each one."""
+    for version, migration in _MIGRATIONS:
+        if version > current_version:
+            migration(engine)
+            _set_schema_version(engine, version)
+
+
+# Oldest SQLite library the schema and queries work with: claims, priority
+# allocation and bulk ingestion use UPDATE/INSERT ... RETURNING, and the
+# content split migration uses ALTER TABLE ... DROP COLUMN (both 3.35).
+MIN_SQLITE_VERSION = (3, 35, 0)
+
+
 def create_database(project_dir: Path) -> tuple:
     """
     Create database and return engine + session maker.
 
+    If the database is already at SCHEMA_VERSION, schema setup is skipped
+    entirely: no create_all, no journal mode change, no migration writes.
+
     Args:
         project_dir: Directory containing the project
 
     Returns:
         Tuple of (engine, SessionLocal)
+
+    Raises:
+        RuntimeError: If the SQLite library is older than MIN_SQLITE_VERSION
     """
+    if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+        raise RuntimeError(
+            f"SQLite {sqlite3.sqlite_version} is too old; autocoder needs "
+            f"{'.'.join(map(str, MIN_SQLITE_VERSION))} or newer. "
+            "Upgrade Python or the system SQLite library."
+        )
     db_url = get_database_url(project_dir)
+    profile = get_pragma_profile()
     engine = create_engine(db_url, connect_args={
         "check_same_thread": False,
-        "timeout": 30  # Wait up to 30s for locks
+        "timeout": profile.busy_timeout_ms / 1000,  # Wait for locks (default 30s)
     })
-    Base.metadata.create_all(bind=engine)
+    # Pragmas on every connection, plus lock-wait accounting (see api/sqlite_profile.py)
+    install_profile(engine, profile)
 
-    # Choose journal mode based on filesystem type
-    # WAL mode doesn't work reliably on network filesystems and can cause corruption
-    is_network = _is_network_path(project_dir)
-    journal_mode = "DELETE" if is_network else "WAL"
+    current_version = get_schema_version(engine)
+    if current_version < SCHEMA_VERSION:
+        Base.metadata.create_all(bind=engine)
 
-    with engine.connect() as conn:
-        conn.execute(text(f"PRAGMA journal_mode={journal_mode}"))
-        conn.execute(text("PRAGMA busy_timeout=30000"))
-        conn.commit()
+        # Choose journal mode based on filesystem type
+        # WAL mode doesn't work reliably on network filesystems and can cause corruption
+        # (journal mode is persistent, so it only needs setting here)
+        is_network = _is_network_path(project_dir)
+        journal_mode = "DELETE" if is_network else "WAL"
 
-    # Migrate existing databases
-    _migrate_add_in_progress_column(engine)
-    _migrate_fix_null_boolean_fields(engine)
-    _migrate_add_dependencies_column(engine)
-    _migrate_add_testing_columns(engine)
+        with engine.connect() as conn:
+            conn.execute(text(f"PRAGMA journal_mode={journal_mode}"))
+            conn.commit()
+            # The profile depends on the journal mode this connection was opened with
+            apply_pragma_profile(conn.connection.dbapi_connection, profile)
 
-    # Migrate to add schedules tables
-    _migrate_add_schedules_tables(engine)
+        # Migrate existing databases
+        _run_migrations(engine, current_version)
 
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     return engine, SessionLocal
 
 
+# Process-wide cache of databases, keyed by resolved features.db path:
+# path -> (engine, SessionLocal, inode of the file the engine was opened on, WalCheckpointer or None)
+_databases: dict[str, tuple] = {}
+_databases_lock = threading.Lock()
+
+
+def _database_key(project_dir: Path) -> str:
+    return str((project_dir / "features.db").resolve())
+
+
+def _file_inode(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_ino
+    except OSError:
+        return None
+
+
+def get_database(project_dir: Path) -> tuple:
+    """
+    Get the cached engine + session maker for a project, creating it on first use.
+
+    Long-lived processes (the UI server) should use this instead of
+    create_database(), which builds a new engine and runs schema setup and
+    migrations on every call. Cached engines get a WAL checkpointer. If the database file was deleted or replaced
+    since it was opened, the stale engine is disposed and a new one created.
+
+    Args:
+        project_dir: Directory containing the project
+
+    Returns:
+        Tuple of (engine, SessionLocal)
+    """
+    key = _database_key(project_dir)
+    inode = _file_inode(key)
+
+    cached = _databases.get(key)
+    if cached is not None and inode is not None and cached[2] == inode:
+        return cached[0], cached[1]
+
+    with _databases_lock:
+        cached = _databases.get(key)
+        if cached is not None and inode is not None and cached[2] == inode:
+            return cached[0], cached[1]
+        if cached is not None:
+            _close_cached(cached)
+
+        engine, SessionLocal = create_database(project_dir)
+        # Long-lived engines also checkpoint the WAL while the project is idle
+        checkpointer = start_wal_checkpointer(engine, Path(key))
+        _databases[key] = (engine, SessionLocal, _file_inode(key), checkpointer)
+        return engine, SessionLocal
+
+
+def _close_cached(cached: tuple) -> None:
+    engine, _, _, checkpointer = cached
+    if checkpointer is not None:
+        checkpointer.stop()
+    engine.dispose()
+    forget_engine(engine)
+
+
+def dispose_database(project_dir: Path) -> None:
+    """
+    Drop a project's cached database and close its pooled connections.
+
+    Call when a project is deleted or moved so no stale engine (or open
+    file handle) outlives it.
+    """
+    with _databases_lock:
+        cached = _databases.pop(_database_key(project_dir), None)
+    if cached is not None:
+        _close_cached(cached)
+
+
+def dispose_all_databases() -> None:
+    """Dispose every cached database. Called on server shutdown."""
+    with _databases_lock:
+        cached = list(_databases.values())
+        _databases.clear()
+    for entry in cached:
+        _close_cached(entry)
+
+
 # Global session maker - will be set when server starts
 _session_maker: Optional[sessionmaker] = None
 
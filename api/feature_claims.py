@@ -0,0 +1,237 @@
+"""
+Feature Claims
+==============
+
+Atomic claim/lease operations on features.
+
+A claim sets in_progress together with a lease: who holds it (claimed_by)
+and until when (lease_expires_at). Every claim is a single conditional
+UPDATE ... RETURNING, so two agents racing for the same feature cannot both
+win - the loser's UPDATE matches no row.
+
+Leases are renewed by whoever drives the agent: the orchestrator renews the
+features it is running, and a feature MCP server renews the claims its
+agents took for as long as the agent's MCP session is connected. Each agent
+claims under its own owner (agent_claim_owner), so when the orchestrator
+sees an agent's worker process exit it releases that agent's claims at once
+(release_owner_claims). Any other holder that crashes stops renewing, and
+release_expired_leases() returns its features to the ready pool with an
+index range scan on lease_expires_at instead of a full-table scan.
+
+Callers own the session and commit.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import DateTime, bindparam, or_, text, update
+from sqlalchemy.orm import Session
+
+from api.database import Feature
+from api.feature_queries import refresh_scheduling_scores
+
+# Lease comparisons go through the table (see _features in api/feature_graph.py)
+_features = Feature.__table__
+
+# How long a claim is held without renewal
+LEASE_DURATION = timedelta(minutes=30)
+# Seconds between renewals by a live holder (well inside LEASE_DURATION)
+LEASE_RENEW_INTERVAL = 60.0
+
+# Lease owners. Only one orchestrator runs per project, so its claims share a
+# stable owner and survive an orchestrator restart (they can be resumed).
+# Agent claims are tagged with the agent that took them.
+ORCHESTRATOR_CLAIM_OWNER = "orchestrator"
+AGENT_CLAIM_OWNER = "agent"
+
+# How an agent identifies itself to the feature MCP server: a header on the
+# shared HTTP server, an environment variable for a stdio server it spawned
+AGENT_ID_HEADER = "X-Agent-Id"
+AGENT_ID_ENV = "AUTOCODER_AGENT_ID"
+
+# Picks the best ready feature and claims it in one statement. A feature is
+# ready when it is neither passing nor in progress and every dependency edge
+# points at a passing feature - the same rule as feature_queries.is_ready().
+_CLAIM_NEXT_SQL = text("""
+    UPDATE features
+    SET in_progress = 1, claimed_by = :owner, lease_expires_at = :expires
+    WHERE id = (
+        SELECT f.id FROM features AS f
+        WHERE f.passes = 0 AND f.in_progress = 0
+          AND NOT EXISTS (
+              SELECT 1 FROM feature_dependencies AS e
+              WHERE e.feature_id = f.id
+                AND NOT EXISTS (SELECT 1 FROM features AS d WHERE d.id = e.depends_on_id AND d.passes = 1)
+          )
+        ORDER BY f.scheduling_score DESC, f.priority, f.id
+        LIMIT 1
+    )
+    AND passes = 0 AND in_progress = 0
+    RETURNING id
+""").bindparams(bindparam("expires", type_=DateTime))
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def agent_claim_owner(agent_id: str | None = None) -> str:
+    """Owner of the claims an agent takes through the feature tools.
+
+    Args:
+        agent_id: The agent's ID (its process ID); defaults to AUTOCODER_AGENT_ID,
+            then to this process's ID
+    """
+    return f"{AGENT_CLAIM_OWNER}:{agent_id or os.getenv(AGENT_ID_ENV) or os.getpid()}"
+
+
+def claim_feature(
+    session: Session,
+    feature_id: int,
+    owner: str,
+    duration: timedelta = LEASE_DURATION,
+) -> Feature | None:
+    """Claim a feature that is not passing and not in progress.
+
+    Returns:
+        The claimed feature, or None if it doesn't exist or isn't claimable.
+    """
+    return session.scalars(
+        update(Feature)
+        .where(Feature.id == feature_id, Feature.passes == False, Feature.in_progress == False)
+        .values(in_progress=True, claimed_by=owner, lease_expires_at=_now() + duration)
+        .returning(Feature),
+        execution_options={"synchronize_session": False},
+    ).first()
+
+
+def claim_next_feature(
+    session: Session,
+    owner: str,
+    duration: timedelta = LEASE_DURATION,
+) -> Feature | None:
+    """Pick the best ready feature (by scheduling score) and claim it atomically.
+
+    Expired leases are released first, so abandoned features are eligible,
+    and stale scheduling scores are recomputed.
+
+    Returns:
+        The claimed feature, or None if nothing is ready.
+    """
+    release_expired_leases(session)
+    refresh_scheduling_scores(session)
+    feature_id = session.execute(
+        _CLAIM_NEXT_SQL, {"owner": owner, "expires": _now() + duration}
+    ).scalar()
+    if feature_id is None:
+        return None
+    return session.get(Feature, feature_id, populate_existing=True)
+
+
+def take_over_claim(
+    session: Session,
+    feature_id: int,
+    owner: str,
+    duration: timedelta = LEASE_DURATION,
+) -> Feature | None:
+    """Resume an in-progress feature whose claim is ours, expired, or lease-less.
+
+    Used to pick up work left in progress by a previous session. A live
+    lease held by someone else is never taken over.
+
+    Returns:
+        The claimed feature, or None if it isn't resumable.
+    """
+    now = _now()
+    return session.scalars(
+        update(Feature)
+        .where(
+            Feature.id == feature_id,
+            Feature.passes == False,
+            Feature.in_progress == True,
+            or_(
+                Feature.lease_expires_at.is_(None),
+                _features.c.lease_expires_at < now,
+                Feature.claimed_by == owner,
+            ),
+        )
+        .values(claimed_by=owner, lease_expires_at=now + duration)
+        .returning(Feature),
+        execution_options={"synchronize_session": False},
+    ).first()
+
+
+def renew_leases(
+    session: Session,
+    feature_ids: list[int],
+    duration: timedelta = LEASE_DURATION,
+) -> int:
+    """Extend the leases of in-progress features. Returns the number renewed."""
+    if not feature_ids:
+        return 0
+    renewed = session.scalars(
+        update(Feature)
+        .where(Feature.id.in_(feature_ids), Feature.in_progress == True)
+        .values(lease_expires_at=_now() + duration)
+        .returning(_features.c.id),
+        execution_options={"synchronize_session": False},
+    )
+    return len(renewed.all())
+
+
+def renew_owner_leases(
+    session: Session,
+    owner: str,
+    duration: timedelta = LEASE_DURATION,
+) -> int:
+    """Extend every in-progress lease held by owner. Returns the number renewed."""
+    renewed = session.scalars(
+        update(Feature)
+        .where(Feature.claimed_by == owner, Feature.in_progress == True)
+        .values(lease_expires_at=_now() + duration)
+        .returning(_features.c.id),
+        execution_options={"synchronize_session": False},
+    )
+    return len(renewed.all())
+
+
+def release_claim(session: Session, feature_id: int, owner: str | None = None) -> bool:
+    """Clear a claim (optionally only if held by owner). Returns True if released."""
+    stmt = update(Feature).where(Feature.id == feature_id, Feature.in_progress == True)
+    if owner is not None:
+        stmt = stmt.where(Feature.claimed_by == owner)
+    released = session.scalar(
+        stmt.values(in_progress=False, claimed_by=None, lease_expires_at=None).returning(_features.c.id),
+        execution_options={"synchronize_session": False},
+    )
+    return released is not None
+
+
+def release_owner_claims(session: Session, owner: str) -> list[int]:
+    """Clear every claim held by owner, e.g. an agent whose process exited.
+
+    Returns:
+        IDs of the released features.
+    """
+    return list(session.scalars(
+        update(Feature)
+        .where(Feature.claimed_by == owner, Feature.in_progress == True)
+        .values(in_progress=False, claimed_by=None, lease_expires_at=None)
+        .returning(_features.c.id),
+        execution_options={"synchronize_session": False},
+    ))
+
+
+def release_expired_leases(session: Session) -> list[int]:
+    """Return features with expired leases to the ready pool.
+
+    Returns:
+        IDs of the released features.
+    """
+    return list(session.scalars(
+        update(Feature)
+        .where(_features.c.lease_expires_at < _now())
+        .values(in_progress=False, claimed_by=None, lease_expires_at=None)
+        .returning(_features.c.id),
+        execution_options={"synchronize_session": False},
+    ))
@@ -0,0 +1,214 @@
+"""
+Feature Durations
+=================
+
+Attempt history and remaining-duration estimates for critical-path scheduling.
+
+The orchestrator records every coding-agent run in feature_attempts: how
+long it took and whether the feature passed. From that history each pending
+feature gets an expected remaining duration in seconds of agent time:
+
+- Its step count times the seconds per step of passed attempts in its
+  category, falling back to all categories, then to a fixed prior.
+- Scaled up for retries by the failure rate of its category (and of the
+  feature itself, if it failed before): with failure rate p, a feature needs
+  p / (1 - p) failed attempts on average before the one that passes.
+
+Sparse groups are shrunk towards the next broader group, so one fast or slow
+attempt doesn't swing a category's estimate. Stopped attempts (killed by the
+user or on shutdown) say nothing about the work and are ignored.
+
+Callers own the session and commit.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from api.database import Feature, FeatureAttempt, FeatureContent
+
+ATTEMPT_OUTCOMES = ("passed", "failed", "stopped")
+
+# Prior for projects without history: agent seconds per feature step
+DEFAULT_SECONDS_PER_STEP = 120.0
+# Prior failure rate, and the cap that keeps the retry factor finite
+DEFAULT_FAILURE_RATE = 0.1
+MAX_FAILURE_RATE = 0.9
+# Prior length of a failed attempt relative to a passed one
+DEFAULT_FAILED_ATTEMPT_RATIO = 0.5
+
+# Weight of the broader group's estimate, in steps (rates) and attempts (failure rates)
+_PRIOR_STEPS = 15.0
+_PRIOR_ATTEMPTS = 3.0
+
+# Queries go through the tables, as in api/feature_graph.py
+_features = Feature.__table__
+_content = FeatureContent.__table__
+_attempts = FeatureAttempt.__table__
+
+_STEP_COUNT = func.coalesce(func.json_array_length(_content.c.steps), 0)
+
+
+def record_attempt(
+    session: Session,
+    feature_id: int,
+    started_at: datetime,
+    duration_seconds: float,
+    outcome: str,
+) -> bool:
+    """Record a finished coding-agent run on a feature.
+
+    Returns:
+        False if the feature no longer exists (nothing is recorded)
+    """
+    if outcome not in ATTEMPT_OUTCOMES:
+        raise ValueError(f"Unknown attempt outcome: {outcome}")
+    row = session.execute(
+        select(_features.c.category, _STEP_COUNT)
+        .outerjoin(_content, _content.c.feature_id == _features.c.id)
+        .where(_features.c.id == feature_id)
+    ).first()
+    if row is None:
+        return False
+    category, steps = row
+    session.add(FeatureAttempt(
+        feature_id=feature_id,
+        category=category,
+        steps=steps,
+        started_at=started_at,
+        duration_seconds=max(duration_seconds, 0.0),
+        outcome=outcome,
+    ))
+    return True
+
+
+@dataclass
+class _History:
+    """Passed and failed attempt totals for one group of attempts."""
+    passed: int = 0
+    passed_seconds: float = 0.0
+    passed_steps: int = 0
+    failed: int = 0
+    failed_seconds: float = 0.0
+
+    def add(self, outcome: str, count: int, seconds: float, steps: int) -> None:
+        if outcome == "passed":
+            self.passed += count
+            self.passed_seconds += seconds
+            self.passed_steps += steps
+        elif outcome == "failed":
+            self.failed += count
+            self.failed_seconds += seconds
+
+    def seconds_per_step(self, prior: float) -> float:
+        return (self.passed_seconds + _PRIOR_STEPS * prior) / (self.passed_steps + _PRIOR_STEPS)
+
+    def failure_rate(self, prior: float) -> float:
+        return (self.failed + _PRIOR_ATTEMPTS * prior) / (self.passed + self.failed + _PRIOR_ATTEMPTS)
+
+
+class DurationEstimator:
+    """Expected remaining agent seconds for a feature, from attempt history."""
+
+    def __init__(self, attempts: list[tuple[int, str, str, int, float, int]]):
+        """Build the estimator.
+
+        Args:
+            attempts: (feature_id, category, outcome, count, total seconds, total steps)
+                aggregates of recorded attempts
+        """
+        self._all = _History()
+        self._categories: dict[str, _History] = {}
+        self._features: dict[int, _History] = {}
+        for feature_id, category, outcome, count, seconds, steps in attempts:
+            self._all.add(outcome, count, seconds, steps)
+            self._categories.setdefault(category, _History()).add(outcome, count, seconds, steps)
+            self._features.setdefault(feature_id, _History()).add(outcome, count, seconds, steps)
+
+        everything = self._all
+        self._seconds_per_step = everything.seconds_per_step(DEFAULT_SECONDS_PER_STEP)
+        self._failure_rate = everything.failure_rate(DEFAULT_FAILURE_RATE)
+        if everything.passed and everything.failed:
+            self._failed_ratio = (everything.failed_seconds / everything.failed) / max(
+                everything.passed_seconds / everything.passed, 1.0
+            )
+        else:
+            self._failed_ratio = DEFAULT_FAILED_ATTEMPT_RATIO
+
+    @classmethod
+    def load(cls, session: Session) -> "DurationEstimator":
+        """Build an estimator from the recorded attempts (one aggregate query)."""
+        rows = session.execute(
+            select(
+                _attempts.c.feature_id,
+                _attempts.c.category,
+                _attempts.c.outcome,
+                func.count(),
+                func.sum(_attempts.c.duration_seconds),
+                func.sum(_attempts.c.steps),
+            )
+            .where(_attempts.c.outcome.in_(("passed", "failed")))
+            .group_by(_attempts.c.feature_id, _attempts.c.category, _attempts.c.outcome)
+        )
+        return cls([tuple(row) for row in rows])
+
+    def estimate(self, category: str, steps: int, feature_id: int | None = None) -> float:
+        """Expected agent seconds to get a feature passing, retries included.
+
+        Args:
+            category: Feature category
+            steps: Number of feature steps (at least one is assumed)
+            feature_id: The feature, to take its own attempts into account
+        """
+        group = self._categories.get(category, _History())
+        rate = group.seconds_per_step(self._seconds_per_step)
+        failure_rate = group.failure_rate(self._failure_rate)
+        expected = rate * max(steps, 1)
+
+        own = self._features.get(feature_id) if feature_id is not None else None
+        if own is not None:
+            if own.passed:
+                expected = (own.passed_seconds + _PRIOR_ATTEMPTS * expected) / (own.passed + _PRIOR_ATTEMPTS)
+            failure_rate = own.failure_rate(failure_rate)
+
+        failure_rate = min(failure_rate, MAX_FAILURE_RATE)
+        retries = failure_rate / (1 - failure_rate)
+        return expected * (1 + retries * self._failed_ratio)
+
+
+def get_attempts(session: Session) -> list[tuple[int, str, int, float, str]]:
+    """Recorded passed and failed attempts as (feature_id, category, steps, seconds, outcome)."""
+    rows = session.execute(
+        select(
+            _attempts.c.feature_id,
+            _attempts.c.category,
+            _attempts.c.steps,
+            _attempts.c.duration_seconds,
+            _attempts.c.outcome,
+        )
+        .where(_attempts.c.outcome.in_(("passed", "failed")))
+        .order_by(_attempts.c.id)
+    )
+    return [tuple(row) for row in rows]
+
+
+def get_feature_sizes(session: Session, pending_only: bool = False) -> dict[int, tuple[str, int]]:
+    """Map of feature_id -> (category, step count), without loading descriptions or steps."""
+    stmt = (
+        select(_features.c.id, _features.c.category, _STEP_COUNT)
+        .outerjoin(_content, _content.c.feature_id == _features.c.id)
+    )
+    if pending_only:
+        stmt = stmt.where(_features.c.passes == False)
+    return {fid: (category, steps) for fid, category, steps in session.execute(stmt)}
+
+
+def estimate_remaining_durations(session: Session) -> dict[int, float]:
+    """Expected remaining agent seconds for every feature that isn't passing."""
+    estimator = DurationEstimator.load(session)
+    return {
+        fid: estimator.estimate(category, steps, fid)
+        for fid, (category, steps) in get_feature_sizes(session, pending_only=True).items()
+    }
@@ -0,0 +1,372 @@
+"""
+Feature Graph
+=============
+
+Persistent in-process view of the feature dependency graph.
+
+The orchestrator asks "what is ready?" every few seconds. Instead of loading
+every row, converting it with to_dict() and re-scoring the whole backlog on
+each call, FeatureGraph loads the narrow scheduling columns once and then
+applies row-level deltas. Ready/blocked sets are maintained incrementally as
+features flip passes/in_progress, and scheduling scores are kept in a
+SchedulingIndex that is updated edge-by-edge instead of being rebuilt.
+
+Change detection uses SQLite's ``PRAGMA data_version`` on a dedicated
+connection: the value only changes when another connection (an agent's MCP
+server, the UI, or another session in this process) commits, so an idle
+refresh costs a single PRAGMA. When it moves, only features whose
+updated_version is past the last synced data version are fetched, plus
+tombstones of deleted ones; a new epoch (recreated database) reloads
+everything.
+"""
+
+import threading
+
+from sqlalchemy import select
+from sqlalchemy.engine import Connection, Engine
+
+from api.database import DataVersion, Feature, FeatureTombstone
+from api.dependency_resolver import SchedulingIndex, compute_critical_paths
+
+# Core tables: their columns type-check as SQL expressions, while SQLAlchemy
+# 2.1's stubs type the declarative classes' Column attributes as Never
+_features = Feature.__table__
+_tombstones = FeatureTombstone.__table__
+_versions = DataVersion.__table__
+
+# Columns needed for scheduling decisions - description/steps are never loaded
+_GRAPH_COLUMNS = (
+    _features.c.id,
+    _features.c.name,
+    _features.c.priority,
+    _features.c.passes,
+    _features.c.in_progress,
+    _features.c.dependencies,
+)
+
+# A refresh touching more rows than this rebuilds the SchedulingIndex in one
+# topological pass instead of applying the rows one at a time
+_INDEX_REBUILD_THRESHOLD = 64
+
+
+def _normalize_dependencies(value) -> tuple[int, ...]:
+    """Return dependency IDs as a de-duplicated tuple, dropping malformed entries."""
+    if not isinstance(value, list):
+        return ()
+    return tuple(dict.fromkeys(d for d in value if isinstance(d, int)))
+
+
+class FeatureGraph:
+    """Incrementally maintained feature graph for scheduling.
+
+    Thread-safe: all public methods acquire an internal lock.
+
+    Attributes exposed as read-only snapshots via methods:
+    - ready: not passing, not in progress, all dependencies passing
+    - blocked: not passing, at least one dependency not passing (or missing)
+    - passing / in_progress: status sets
+    """
+
+    def __init__(self, engine: Engine):
+        self._engine = engine
+        self._lock = threading.Lock()
+        self._conn: Connection | None = None
+        self._data_version: int | None = None
+        # (epoch, version) of the feature data last applied; None forces a full load
+        self._synced: tuple[str, int] | None = None
+        # Bumped whenever a refresh changes the graph, for callers caching derived data
+        self._generation = 0
+
+        # feature_id -> {id, name, priority, passes, in_progress, dependencies}
+        self._features: dict[int, dict] = {}
+        # dep_id -> ids of features that depend on it (dep may not exist yet)
+        self._dependents: dict[int, set[int]] = {}
+        # feature_id -> number of dependencies that are not passing (or missing)
+        self._unmet: dict[int, int] = {}
+
+        self._passing: set[int] = set()
+        self._in_progress: set[int] = set()
+        self._ready: set[int] = set()
+        self._blocked: set[int] = set()
+
+        # Built lazily, then updated incrementally; None means "rebuild on next use"
+        self._index: SchedulingIndex | None = None
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _connection(self) -> Connection:
+        if self._conn is None:
+            self._conn = self._engine.connect()
+        return self._conn
+
+    def refresh(self) -> bool:
+        """Apply any committed changes since the last refresh.
+
+        Returns:
+            True if the graph changed, False if the database was untouched.
+        """
+        with self._lock:
+            conn = self._connection()
+            try:
+                version = conn.exec_driver_sql("PRAGMA data_version").scalar()
+                if version == self._data_version:
+                    return False
+                # Read the feature version first: rows committed after it are re-applied next time
+                current = conn.execute(
+                    select(_versions.c.epoch, _versions.c.version).where(_versions.c.id == 1)
+                ).first()
+                if current is None or self._synced is None or current.epoch != self._synced[0]:
+                    rows = conn.execute(select(*_GRAPH_COLUMNS)).all()
+                    deleted = None
+                elif current.version == self._synced[1]:
+                    # Only untracked columns (leases, scores) or other tables changed
+                    rows, deleted = [], []
+                else:
+                    since = self._synced[1]
+                    rows = conn.execute(select(*_GRAPH_COLUMNS).where(_features.c.updated_version > since)).all()
+                    deleted = list(conn.scalars(
+                        select(_tombstones.c.feature_id).where(_tombstones.c.deleted_version > since)
+                    ))
+            finally:
+                # Never hold a read transaction open between refreshes
+                conn.rollback()
+
+            self._data_version = version
+            self._synced = (current.epoch, current.version) if current is not None else None
+            changed = self._apply_rows(rows, deleted)
+            if changed:
+                self._generation += 1
+            return changed
+
+    def close(self) -> None:
+        """Release the dedicated connection (call before disposing the engine)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._data_version = None
+            self._synced = None
+
+    def _apply_rows(self, rows, deleted: list[int] | None) -> bool:
+        """Diff narrow rows against the cached graph.
+
+        Args:
+            rows: Every feature (full load) or the changed ones (delta)
+            deleted: IDs deleted since the last sync, or None when rows is a
+                full load and missing features count as deleted
+        """
+        changes: list[tuple[dict | None, dict]] = []
+        seen: set[int] = set()
+
+        for fid, name, priority, passes, in_progress, dependencies in rows:
+            seen.add(fid)
+            new = {
+                "id": fid,
+                "name": name,
+                "priority": priority if priority is not None else 999,
+                "passes": bool(passes),
+                "in_progress": bool(in_progress),
+                "dependencies": _normalize_dependencies(dependencies),
+            }
+            old = self._features.get(fid)
+            if old != new:
+                changes.append((old, new))
+        if deleted is None:
+            deleted = [f for f in self._features if f not in seen]
+        else:
+            # A re-created ID is a change, not a deletion
+            deleted = [f for f in deleted if f in self._features and f not in seen]
+
+        if len(changes) + len(deleted) > _INDEX_REBUILD_THRESHOLD:
+            self._index = None
+
+        for old, new in changes:
+            if old is None:
+                self._insert(new)
+            else:
+                self._update(old, new)
+        for fid in deleted:
+            self._delete(fid)
+
+        return bool(changes or deleted)
+
+    # ------------------------------------------------------------------
+    # Delta application
+    # ------------------------------------------------------------------
+
+    def _insert(self, row: dict) -> None:
+        fid = row["id"]
+        self._features[fid] = row
+        self._link(fid, row["dependencies"])
+        if row["passes"]:
+            self._passing.add(fid)
+            self._propagate_passing(fid, now_passing=True)
+        if row["in_progress"]:
+            self._in_progress.add(fid)
+        self._update_index(
+            lambda index: index.add_feature(fid, row["priority"], list(row["dependencies"]), row["passes"])
+        )
+        self._classify(fid)
+
+    def _update(self, old: dict, new: dict) -> None:
+        fid = new["id"]
+        self._features[fid] = new
+
+        if old["dependencies"] != new["dependencies"]:
+            self._unlink(fid, old["dependencies"])
+            self._link(fid, new["dependencies"])
+            removed = set(old["dependencies"]) - set(new["dependencies"])
+            added = [d for d in new["dependencies"] if d not in old["dependencies"]]
+
+            def apply_dependencies(index: SchedulingIndex) -> None:
+                for dep_id in removed:
+                    index.remove_edge(fid, dep_id)
+                for dep_id in added:
+                    index.add_edge(fid, dep_id)
+
+            self._update_index(apply_dependencies)
+        if old["priority"] != new["priority"]:
+            self._update_index(lambda index: index.set_priority(fid, new["priority"]))
+
+        if old["in_progress"] != new["in_progress"]:
+            if new["in_progress"]:
+                self._in_progress.add(fid)
+            else:
+                self._in_progress.discard(fid)
+
+        if old["passes"] != new["passes"]:
+            if new["passes"]:
+                self._passing.add(fid)
+            else:
+                self._passing.discard(fid)
+            self._propagate_passing(fid, now_passing=new["passes"])
+            self._update_index(lambda index: index.mark_passing(fid, new["passes"]))
+
+        self._classify(fid)
+
+    def _delete(self, fid: int) -> None:
+        row = self._features.pop(fid)
+        self._unlink(fid, row["dependencies"])
+        if row["passes"]:
+            # Dependents now reference a missing feature, which never passes
+            self._propagate_passing(fid, now_passing=False)
+        self._passing.discard(fid)
+        self._in_progress.discard(fid)
+        self._ready.discard(fid)
+        self._blocked.discard(fid)
+        self._unmet.pop(fid, None)
+        self._update_index(lambda index: index.remove_feature(fid))
+
+    def _link(self, fid: int, deps: tuple[int, ...]) -> None:
+        for dep_id in deps:
+            self._dependents.setdefault(dep_id, set()).add(fid)
+        self._unmet[fid] = sum(1 for d in deps if d not in self._passing)
+
+    def _unlink(self, fid: int, deps: tuple[int, ...]) -> None:
+        for dep_id in deps:
+            dependents = self._dependents.get(dep_id)
+            if dependents is not None:
+                dependents.discard(fid)
+                if not dependents:
+                    del self._dependents[dep_id]
+
+    def _propagate_passing(self, fid: int, now_passing: bool) -> None:
+        """Adjust unmet-dependency counts of direct dependents of fid."""
+        delta = -1 if now_passing else 1
+        for child_id in self._dependents.get(fid, ()):
+            self._unmet[child_id] = self._unmet.get(child_id, 0) + delta
+            self._classify(child_id)
+
+    def _update_index(self, update) -> None:
+        """Apply an incremental update to the scheduling index, if one is built."""
+        if self._index is None:
+            return
+        try:
+            update(self._index)
+        except ValueError:
+            # Cycle committed by another writer - rebuild, which tolerates cycles
+            self._index = None
+
+    def _classify(self, fid: int) -> None:
+        row = self._features.get(fid)
+        if row is None:
+            return
+        self._ready.discard(fid)
+        self._blocked.discard(fid)
+        if row["passes"]:
+            return
+        if self._unmet.get(fid, 0) > 0:
+            self._blocked.add(fid)
+        elif not row["in_progress"]:
+            self._ready.add(fid)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get(self, feature_id: int) -> dict | None:
+        """Return a copy of the narrow row for a feature (dependencies as list)."""
+        with self._lock:
+            row = self._features.get(feature_id)
+            if row is None:
+                return None
+            return {**row, "dependencies": list(row["dependencies"])}
+
+    def ready_ids(self) -> set[int]:
+        with self._lock:
+            return set(self._ready)
+
+    def blocked_ids(self) -> set[int]:
+        with self._lock:
+            return set(self._blocked)
+
+    def passing_ids(self) -> set[int]:
+        with self._lock:
+            return set(self._passing)
+
+    def in_progress_ids(self) -> set[int]:
+        """IDs of features that are in progress and not yet passing."""
+        with self._lock:
+            return self._in_progress - self._passing
+
+    def pending_ids(self) -> set[int]:
+        """IDs of all features that are not passing."""
+        with self._lock:
+            return self._features.keys() - self._passing
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._features)
+
+    @property
+    def generation(self) -> int:
+        """Number of refreshes that changed the graph; equal values mean an unchanged graph."""
+        with self._lock:
+            return self._generation
+
+    def critical_paths(self, durations: dict[int, float]) -> dict[int, float]:
+        """Critical path length per feature for the given remaining durations.
+
+        See compute_critical_paths() in api/dependency_resolver.py.
+        """
+        with self._lock:
+            return compute_critical_paths(list(self._features.values()), durations)
+
+    def _scheduling_index(self) -> SchedulingIndex:
+        if self._index is None:
+            self._index = SchedulingIndex(list(self._features.values()))
+        return self._index
+
+    def score(self, feature_id: int) -> float:
+        """Scheduling score for one feature (higher = schedule first)."""
+        with self._lock:
+            if feature_id not in self._features:
+                return 0.0
+            return self._scheduling_index().score(feature_id)
+
+    def scores(self) -> dict[int, float]:
+        """Scheduling scores for all features."""
+        with self._lock:
+            return self._scheduling_index().scores()
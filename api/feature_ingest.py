@@ -0,0 +1,240 @@
+"""
+Feature Ingestion
+=================
+
+Shared bulk-create path for feature_create_bulk (MCP), POST /features/bulk
+(REST) and the expand-project chat session.
+
+Initializers emit hundreds to thousands of features at once. Instead of
+adding ORM objects one by one, rows are validated in a single pass and
+written with Core executemany INSERT ... RETURNING in chunked transactions
+(status columns into features, description and steps into feature_content),
+so ingestion is bound by SQLite rather than ORM unit-of-work overhead.
+
+Invalid rows are reported individually and skipped; the rest of the batch is
+still created. A row that depends on a skipped row is skipped as well, and so
+is a row naming a dependency ID that doesn't exist.
+"""
+
+from dataclasses import dataclass, field
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.orm import Session
+
+from api.database import Feature, FeatureContent, allocate_priorities
+from api.dependency_resolver import MAX_DEPENDENCIES_PER_FEATURE
+
+# Rows per INSERT transaction
+INGEST_CHUNK_SIZE = 500
+
+_REQUIRED_FIELDS = ("category", "name", "description", "steps")
+
+_features = Feature.__table__
+_content = FeatureContent.__table__
+
+
+@dataclass
+class IngestResult:
+    """Outcome of a bulk ingestion."""
+    # (batch index, new feature ID) for every created row, in batch order
+    created: list[tuple[int, int]] = field(default_factory=list)
+    # {"index": batch index, "error": message} for every skipped row
+    errors: list[dict] = field(default_factory=list)
+    # Number of created rows that have dependencies
+    with_dependencies: int = 0
+
+    @property
+    def created_ids(self) -> list[int]:
+        return [feature_id for _, feature_id in self.created]
+
+
+def _is_feature_id(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 1
+
+
+def _existing_ids(session: Session, features: list) -> set[int]:
+    """IDs named in the batch's `dependencies` that exist, in one IN query."""
+    named = {
+        dep_id
+        for data in features
+        if isinstance(data, dict) and isinstance(data.get("dependencies"), list)
+        for dep_id in data["dependencies"]
+        if _is_feature_id(dep_id)
+    }
+    if not named:
+        return set()
+    return set(session.scalars(select(_features.c.id).where(_features.c.id.in_(named))))
+
+
+def _validate_row(i: int, data, rejected: set[int], existing: set[int]) -> str | None:
+    """Return an error message for batch row i, or None if it is valid."""
+    if not isinstance(data, dict):
+        return f"Feature at index {i} is not an object"
+    if not all(key in data for key in _REQUIRED_FIELDS):
+        return f"Feature at index {i} missing required fields (category, name, description, steps)"
+    if not isinstance(data["steps"], list):
+        return f"Feature at index {i} has non-list steps"
+
+    indices = data.get("depends_on_indices") or []
+    dependencies = data.get("dependencies") or []
+    if not isinstance(indices, list) or not isinstance(dependencies, list):
+        return f"Feature at index {i} has non-list dependencies"
+    if len(indices) + len(dependencies) > MAX_DEPENDENCIES_PER_FEATURE:
+        return (
+            f"Feature at index {i} has {len(indices) + len(dependencies)} dependencies, "
+            f"max is {MAX_DEPENDENCIES_PER_FEATURE}"
+        )
+    if len(indices) != len(set(indices)) or len(dependencies) != len(set(dependencies)):
+        return f"Feature at index {i} has duplicate dependencies"
+    for dep_id in dependencies:
+        if not _is_feature_id(dep_id):
+            return f"Feature at index {i} has invalid dependency ID: {dep_id}"
+        if dep_id not in existing:
+            return f"Feature at index {i} depends on feature {dep_id}, which does not exist"
+    for idx in indices:
+        if not isinstance(idx, int) or isinstance(idx, bool) or idx < 0:
+            return f"Feature at index {i} has invalid dependency index: {idx}"
+        # Can only depend on earlier features
+        if idx >= i:
+            return f"Feature at index {i} cannot depend on feature at index {idx} (forward reference not allowed)"
+        if idx in rejected:
+            return f"Feature at index {i} depends on feature at index {idx}, which was not created"
+    return None
+
+
+def ingest_features(
+    session: Session,
+    features: list[dict],
+    start_priority: int | None = None,
+    chunk_size: int = INGEST_CHUNK_SIZE,
+) -> IngestResult:
+    """Validate and create features in chunked transactions.
+
+    Each feature needs category, name, description and steps. Dependencies
+    can be given as `dependencies` (IDs of features that already exist) and/or
+    `depends_on_indices` (0-based indices of earlier features in this batch,
+    since their IDs aren't known until they are created).
+
+    Created features get sequential priorities starting at start_priority
+    (default: allocated from the priority sequence, after every existing
+    feature). Each chunk is committed on its
+    own; if one fails, its rows are reported as errors and ingestion goes on.
+
+    Args:
+        session: Database session (committed per chunk)
+        features: Feature dicts, in priority order
+        start_priority: First priority to assign, or None to append
+        chunk_size: Rows per transaction
+
+    Returns:
+        IngestResult with created IDs, per-row errors and the dependency count
+    """
+    result = IngestResult()
+
+    # Single validation pass. Indices only point backwards, so a rejected
+    # dependency is always known by the time its dependents are checked.
+    existing = _existing_ids(session, features)
+    rejected: set[int] = set()
+    accepted: list[int] = []
+    for i, data in enumerate(features):
+        error = _validate_row(i, data, rejected, existing)
+        if error is None:
+            accepted.append(i)
+        else:
+            rejected.add(i)
+            result.errors.append({"index": i, "error": error})
+
+    if not accepted:
+        return result
+
+    # batch index -> new feature ID, filled in chunk by chunk
+    ids: dict[int, int] = {}
+    priority = start_priority or 0
+    for offset in range(0, len(accepted), chunk_size):
+        chunk = []
+        for i in accepted[offset:offset + chunk_size]:
+            # An earlier chunk failed, taking this row's dependency with it
+            if any(idx in rejected for idx in features[i].get("depends_on_indices") or []):
+                rejected.add(i)
+                result.errors.append({"index": i, "error": f"Feature at index {i} depends on a feature that was not created"})
+            else:
+                chunk.append(i)
+        if not chunk:
+            continue
+
+        rows = []
+        deferred: list[int] = []  # rows depending on rows in this same chunk
+        for i in chunk:
+            data = features[i]
+            indices = data.get("depends_on_indices") or []
+            dependencies = list(data.get("dependencies") or [])
+            if all(idx in ids for idx in indices):
+                dependencies += [ids[idx] for idx in indices]
+            else:
+                deferred.append(i)
+            rows.append({
+                "priority": priority,
+                "category": data["category"],
+                "name": data["name"],
+                "passes": False,
+                "in_progress": False,
+                "dependencies": sorted(dependencies) or None,
+            })
+            priority += 1
+
+        try:
+            if start_priority is None:
+                # Reserved in this chunk's transaction, so concurrent creators
+                # (other agents' MCP servers, the UI) never get the same priorities
+                first = allocate_priorities(session, len(rows))
+                for n, row in enumerate(rows):
+                    row["priority"] = first + n
+            chunk_ids = session.scalars(
+                insert(_features).returning(_features.c.id, sort_by_parameter_order=True),
+                rows,
+            ).all()
+            chunk_id_map = dict(zip(chunk, chunk_ids))
+            session.execute(
+                insert(_content),
+                [
+                    {
+                        "feature_id": chunk_id_map[i],
+                        "description": features[i]["description"],
+                        "steps": features[i]["steps"],
+                    }
+                    for i in chunk
+                ],
+            )
+            if deferred:
+                # Same-chunk dependencies only have IDs now
+                session.execute(
+                    update(_features)
+                    .where(_features.c.id == bindparam("fid"))
+                    .values(dependencies=bindparam("deps")),
+                    [
+                        {
+                            "fid": chunk_id_map[i],
+                            "deps": sorted(
+                                list(features[i].get("dependencies") or [])
+                                + [ids.get(idx) or chunk_id_map[idx] for idx in features[i]["depends_on_indices"]]
+                            ),
+                        }
+                        for i in deferred
+                    ],
+                )
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            for i in chunk:
+                rejected.add(i)
+                result.errors.append({"index": i, "error": f"Feature at index {i} was not created: {e}"})
+            continue
+
+        ids.update(chunk_id_map)
+        for i, row in zip(chunk, rows):
+            result.created.append((i, chunk_id_map[i]))
+            if row["dependencies"] or i in deferred:
+                result.with_dependencies += 1
+
+    result.errors.sort(key=lambda e: e["index"])
+    return result
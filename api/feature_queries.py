@@ -0,0 +1,553 @@
+"""
+Feature Queries
+===============
+
+Dependency-graph queries answered in SQL over the feature_dependencies edge
+table, instead of loading and deserializing every feature row and walking
+the JSON dependency lists in Python.
+
+The edge table is indexed in both directions: (feature_id, depends_on_id)
+answers "what does X depend on?" and (depends_on_id, feature_id) answers
+"what depends on X?". A dependency is met when a feature with that ID exists
+and passes; a missing dependency never passes.
+
+Ready features are returned in scheduling order from the persisted
+scheduling_score column. Scores depend on the whole graph, so the first
+reader after a change brings them up to date (refresh_scheduling_scores)
+rather than every read; an unchanged graph costs one primary-key lookup.
+
+Both scores and cycle checks for dependency edits come from indexes held in
+memory per engine, for as long as the engine lives: a SchedulingIndex and a
+ReachabilityIndex. They catch up with committed changes through the data
+version and change tracking (updated_version, tombstones), whichever process
+made them, so a change costs work for the features it touched.
+"""
+
+import threading
+import weakref
+from dataclasses import dataclass, field
+
+from sqlalchemy import and_, bindparam, exists, func, literal, or_, select, tuple_, union, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, aliased
+
+from api.database import Feature, FeatureDependency, FeatureTombstone, SchedulingState, get_data_version
+from api.dependency_resolver import ReachabilityIndex, SchedulingIndex, find_dependency_cycles
+
+_Dependency = aliased(Feature, name="dependency")
+
+# Column selects go through the tables, whose columns type-check as SQL
+# expressions (see _features in api/feature_graph.py)
+_features = Feature.__table__
+_edges = FeatureDependency.__table__
+_tombstones = FeatureTombstone.__table__
+_scheduling_state = SchedulingState.__table__
+
+# A catch-up touching more features than this rebuilds an in-memory index
+# from the tables instead of applying the features one at a time
+_REBUILD_THRESHOLD = 256
+
+
+@dataclass
+class _SyncedReachability:
+    """A database's ReachabilityIndex and the data version it reflects."""
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    index: ReachabilityIndex = field(default_factory=ReachabilityIndex)
+    epoch: str | None = None
+    version: int = 0
+
+
+# Engine -> its database's reachability index, shared by every session on the
+# engine. Weak keys: an engine that is disposed and dropped takes its index along
+_reachability: weakref.WeakKeyDictionary[Engine, _SyncedReachability] = weakref.WeakKeyDictionary()
+_reachability_lock = threading.Lock()
+
+
+@dataclass
+class _SyncedScheduling:
+    """A database's SchedulingIndex, the data version it reflects, and the scores written from it."""
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    index: SchedulingIndex | None = None
+    epoch: str | None = None
+    version: int = 0
+    # The scheduling_score column as of the scored_version this state stamped;
+    # only trusted while the database still carries that stamp
+    written: dict[int, float] = field(default_factory=dict)
+    scored_version: int | None = None
+
+
+# Engine -> its database's scheduling index, like _reachability
+_scheduling: weakref.WeakKeyDictionary[Engine, _SyncedScheduling] = weakref.WeakKeyDictionary()
+_scheduling_lock = threading.Lock()
+
+
+def has_unmet_dependency(feature_id=Feature.id):
+    """EXISTS clause: the feature has a dependency that is missing or not passing."""
+    return exists().where(
+        FeatureDependency.feature_id == feature_id,
+        ~exists().where(_Dependency.id == FeatureDependency.depends_on_id, _Dependency.passes == True),
+    )
+
+
+def is_ready():
+    """Filter clause for ready features: not passing, not in progress, all dependencies passing."""
+    return and_(Feature.passes == False, Feature.in_progress == False, ~has_unmet_dependency())
+
+
+def scheduling_order():
+    """ORDER BY for scheduling: score (higher first), then priority, then id.
+
+    Matches the ix_feature_ready_order index.
+    """
+    return (Feature.scheduling_score.desc(), Feature.priority, Feature.id)
+
+
+def _scoring_state(session: Session):
+    return session.execute(
+        select(SchedulingState.graph_version, SchedulingState.scored_version).where(SchedulingState.id == 1)
+    ).first()
+
+
+def scheduling_scores_stale(session: Session) -> bool:
+    """Whether the graph changed since the persisted scores were computed (read-only)."""
+    state = _scoring_state(session)
+    return state is not None and state.graph_version != state.scored_version
+
+
+def refresh_scheduling_scores(session: Session) -> bool:
+    """Bring persisted scheduling scores up to date if the graph changed since they were written.
+
+    The engine's SchedulingIndex catches up with the committed changes, and
+    only the features they touched are compared and rewritten. A rebuilt
+    index, or scores another process wrote meanwhile, compare every feature
+    against the column instead. The caller commits.
+
+    Returns:
+        True if scores were refreshed, False if they were already current.
+    """
+    while True:
+        state = _scoring_state(session)
+        if state is None or state.graph_version == state.scored_version:
+            return False
+        # A no-op stamp that takes the write lock, so the graph can't change
+        # until the caller commits. Fails if someone re-scored since the read;
+        # the next read is then under the lock.
+        locked = session.execute(
+            update(_scheduling_state)
+            .where(_scheduling_state.c.id == 1, _scheduling_state.c.scored_version == state.scored_version)
+            .values(scored_version=state.scored_version)
+            .returning(_scheduling_state.c.id)
+        ).first()
+        if locked is not None:
+            break
+
+    engine = session.get_bind().engine
+    with _scheduling_lock:
+        synced = _scheduling.setdefault(engine, _SyncedScheduling())
+    with synced.lock:
+        # Committed data only: a caller that rolls back leaves nothing behind in the index
+        with Session(engine) as reader:
+            graph_version = reader.execute(
+                select(_scheduling_state.c.graph_version).where(_scheduling_state.c.id == 1)
+            ).scalar_one()
+            index, reread = _sync_scheduling(reader, synced)
+            candidates = index.take_changed_scores()
+            candidates.update((fid, index.score(fid)) for fid in reread if fid in index)
+            if synced.scored_version != state.scored_version:
+                synced.written = {
+                    fid: score
+                    for fid, score in reader.execute(select(_features.c.id, _features.c.scheduling_score))
+                }
+                candidates = index.scores()
+
+        changed = {fid: score for fid, score in candidates.items() if synced.written.get(fid) != score}
+        if changed:
+            session.execute(
+                update(_features)
+                .where(_features.c.id == bindparam("fid"))
+                .values(scheduling_score=bindparam("score")),
+                [{"fid": fid, "score": score} for fid, score in changed.items()],
+            )
+        session.execute(
+            update(_scheduling_state)
+            .where(_scheduling_state.c.id == 1, _scheduling_state.c.scored_version < graph_version)
+            .values(scored_version=graph_version)
+        )
+        synced.written.update(changed)
+        synced.scored_version = graph_version
+    return True
+
+
+def get_ready_features(session: Session, limit: int) -> list[Feature]:
+    """Top-`limit` ready features in scheduling order.
+
+    Call refresh_scheduling_scores() first for current scores.
+    """
+    return list(session.scalars(
+        select(Feature).where(is_ready()).order_by(*scheduling_order()).limit(limit)
+    ))
+
+
+def count_ready_features(session: Session) -> int:
+    """Number of ready features."""
+    return session.scalar(select(func.count()).select_from(Feature).where(is_ready())) or 0
+
+
+def get_blocked_features(session: Session, limit: int) -> tuple[list[Feature], dict[int, list[int]], int]:
+    """First `limit` pending features (by id) with an unmet dependency.
+
+    Returns:
+        (features, blocking dependencies of those features, total blocked count)
+    """
+    blocked = and_(Feature.passes == False, has_unmet_dependency())
+    features = list(session.scalars(select(Feature).where(blocked).order_by(Feature.id).limit(limit)))
+    total = session.scalar(select(func.count()).select_from(Feature).where(blocked)) or 0
+    blocking = get_blocking_dependencies(session, feature_ids=[f.id for f in features]) if features else {}  # type: ignore[misc]
+    return features, blocking, total
+
+
+# Kanban columns: status name -> filter
+FEATURE_STATUSES = {
+    "pending": and_(Feature.passes == False, Feature.in_progress == False),
+    "in_progress": and_(Feature.passes == False, Feature.in_progress == True),
+    "done": Feature.passes == True,
+}
+
+
+def get_features_page(
+    session: Session,
+    status: str,
+    columns: list,
+    category: str | None = None,
+    after: tuple[int, int] | None = None,
+    limit: int | None = None,
+) -> tuple[list, bool]:
+    """One keyset page of a status column, ordered by (priority, id).
+
+    Served by the ix_feature_status_order index, so a page costs O(limit)
+    however deep it is.
+
+    Args:
+        session: Database session
+        status: Key of FEATURE_STATUSES
+        columns: Columns to select; include Feature.priority and Feature.id for cursors
+        category: Only features in this category
+        after: (priority, id) of the last row of the previous page
+        limit: Page size, or None for the whole column
+
+    Returns:
+        (rows, has_more)
+    """
+    stmt = select(*columns).where(FEATURE_STATUSES[status]).order_by(Feature.priority, Feature.id)
+    if category is not None:
+        stmt = stmt.where(Feature.category == category)
+    if after is not None:
+        stmt = stmt.where(tuple_(Feature.priority, Feature.id) > tuple_(*map(literal, after)))
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+
+    rows = list(session.execute(stmt))
+    if limit is not None and len(rows) > limit:
+        return rows[:limit], True
+    return rows, False
+
+
+def changed_since(since: int):
+    """Filter clause for features to re-send to a client synced at data version `since`.
+
+    Features changed after `since`, plus direct dependents of changed or
+    deleted features, whose blocked status follows their dependencies.
+    """
+    touched = union(
+        select(_features.c.id).where(_features.c.updated_version > since),
+        select(_tombstones.c.feature_id).where(_tombstones.c.deleted_version > since),
+    )
+    return or_(
+        _features.c.updated_version > since,
+        Feature.id.in_(select(_edges.c.feature_id).where(_edges.c.depends_on_id.in_(touched))),
+    )
+
+
+def get_deleted_since(session: Session, since: int) -> list[int]:
+    """IDs of features deleted after data version `since`."""
+    return list(session.scalars(
+        select(_tombstones.c.feature_id)
+        .where(_tombstones.c.deleted_version > since)
+        .order_by(_tombstones.c.feature_id)
+    ))
+
+
+def get_dependency_map(session: Session) -> dict[int, list[int]]:
+    """Map of feature_id -> dependency IDs (sorted), for features that have any."""
+    dependencies: dict[int, list[int]] = {}
+    rows = session.execute(
+        select(_edges.c.feature_id, _edges.c.depends_on_id).order_by(_edges.c.feature_id, _edges.c.depends_on_id)
+    )
+    for feature_id, dep_id in rows:
+        dependencies.setdefault(feature_id, []).append(dep_id)
+    return dependencies
+
+
+def get_blocking_dependencies(
+    session: Session,
+    pending_only: bool = False,
+    feature_ids: list[int] | None = None,
+) -> dict[int, list[int]]:
+    """Map of feature_id -> dependencies that are missing or not passing.
+
+    Args:
+        session: Database session
+        pending_only: Only include features that are not passing themselves
+        feature_ids: Only include these features (default: all)
+
+    Returns:
+        Blocked feature IDs (ascending) mapped to their blocking dependency IDs
+    """
+    stmt = (
+        select(_edges.c.feature_id, _edges.c.depends_on_id)
+        .outerjoin(_Dependency, _Dependency.id == _edges.c.depends_on_id)
+        .where(or_(_Dependency.id.is_(None), _Dependency.passes == False))
+        .order_by(_edges.c.feature_id, _edges.c.depends_on_id)
+    )
+    if pending_only:
+        stmt = stmt.join(_features, _features.c.id == _edges.c.feature_id).where(_features.c.passes == False)
+    if feature_ids is not None:
+        stmt = stmt.where(_edges.c.feature_id.in_(feature_ids))
+
+    blocking: dict[int, list[int]] = {}
+    for feature_id, dep_id in session.execute(stmt):
+        blocking.setdefault(feature_id, []).append(dep_id)
+    return blocking
+
+
+def get_dependents(session: Session, feature_id: int) -> list[int]:
+    """IDs of features that depend directly on feature_id (reverse index lookup)."""
+    return list(session.scalars(
+        select(FeatureDependency.feature_id)
+        .where(FeatureDependency.depends_on_id == feature_id)
+        .order_by(FeatureDependency.feature_id)
+    ))
+
+
+def get_unblocked_by(session: Session, feature_id: int) -> list[int]:
+    """IDs of pending features that feature_id passing would unblock.
+
+    These are its direct dependents whose every other dependency already passes.
+    """
+    other = aliased(FeatureDependency, name="other")
+    other_unmet = exists().where(
+        other.feature_id == Feature.id,
+        other.depends_on_id != feature_id,
+        ~exists().where(_Dependency.id == other.depends_on_id, _Dependency.passes == True),
+    )
+    return list(session.scalars(
+        select(Feature.id)
+        .join(FeatureDependency, FeatureDependency.feature_id == Feature.id)
+        .where(FeatureDependency.depends_on_id == feature_id, Feature.passes == False, ~other_unmet)
+        .order_by(Feature.id)
+    ))
+
+
+def _changed_feature_ids(reader: Session, version: int) -> list[int]:
+    """IDs of features changed or deleted after a data version (at most _REBUILD_THRESHOLD + 1)."""
+    return list(reader.scalars(
+        union(
+            select(_features.c.id).where(_features.c.updated_version > version),
+            select(_tombstones.c.feature_id).where(_tombstones.c.deleted_version > version),
+        ).limit(_REBUILD_THRESHOLD + 1)
+    ))
+
+
+def _sync_reachability(reader: Session, state: _SyncedReachability) -> None:
+    """Bring a reachability index up to date with the committed edge table.
+
+    Unchanged data costs one primary-key lookup. Otherwise the features
+    changed or deleted since the index's data version get their dependency
+    sets replaced; a new epoch or a large change rebuilds the index.
+    """
+    # Read the version first: changes committed after it are re-applied next time
+    current = get_data_version(reader)
+    if current is not None and current == (state.epoch, state.version):
+        return
+
+    changed = None
+    if current is not None and current[0] == state.epoch:
+        changed = _changed_feature_ids(reader, state.version)
+
+    if changed is None or len(changed) > _REBUILD_THRESHOLD:
+        state.index = ReachabilityIndex(get_dependency_map(reader))
+    elif changed:
+        dependencies: dict[int, list[int]] = {fid: [] for fid in changed}
+        rows = reader.execute(
+            select(_edges.c.feature_id, _edges.c.depends_on_id).where(_edges.c.feature_id.in_(changed))
+        )
+        for feature_id, dep_id in rows:
+            dependencies[feature_id].append(dep_id)
+        for feature_id, dep_ids in dependencies.items():
+            state.index.set_dependencies(feature_id, dep_ids)
+
+    state.epoch, state.version = current if current is not None else (None, 0)
+
+
+def _apply_scheduling_changes(reader: Session, synced: _SyncedScheduling, changed: list[int]) -> bool:
+    """Re-apply changed and deleted features to a scheduling index.
+
+    The written scores of changed rows are re-read from the column, so the
+    caller compares those rows whether or not the index touched them.
+
+    Returns:
+        False if a new dependency cycle stopped the update (the index must
+        then be rebuilt), else True.
+    """
+    index = synced.index
+    assert index is not None
+    rows: dict[int, tuple[int, bool]] = {}
+    for fid, priority, passes, score in reader.execute(
+        select(_features.c.id, _features.c.priority, _features.c.passes, _features.c.scheduling_score)
+        .where(_features.c.id.in_(changed))
+    ):
+        rows[fid] = (priority if priority is not None else 999, bool(passes))
+        # The row may have been deleted and re-created with the column default
+        synced.written[fid] = score
+    dependencies: dict[int, list[int]] = {fid: [] for fid in rows}
+    for feature_id, dep_id in reader.execute(
+        select(_edges.c.feature_id, _edges.c.depends_on_id).where(_edges.c.feature_id.in_(rows))
+    ):
+        dependencies[feature_id].append(dep_id)
+
+    try:
+        for fid in changed:
+            if fid not in rows:
+                index.remove_feature(fid)
+                synced.written.pop(fid, None)
+        for fid, (priority, passes) in rows.items():
+            if fid in index:
+                index.set_priority(fid, priority)
+                index.mark_passing(fid, passes)
+            else:
+                index.add_feature(fid, priority, passes=passes)
+        for fid, dep_ids in dependencies.items():
+            index.set_dependencies(fid, dep_ids)
+    except ValueError:
+        return False
+    return True
+
+
+def _sync_scheduling(reader: Session, synced: _SyncedScheduling) -> tuple[SchedulingIndex, list[int]]:
+    """Bring a scheduling index up to date with the committed features and edges.
+
+    Like _sync_reachability. A rebuild also drops the written scores, so the
+    caller compares every feature against the column.
+
+    Returns:
+        The index, and the IDs of the features changed since its last sync
+        (none after a rebuild)
+    """
+    current = get_data_version(reader)
+    index = synced.index
+    if index is not None and current is not None and current == (synced.epoch, synced.version):
+        return index, []
+
+    changed = None
+    if index is not None and current is not None and current[0] == synced.epoch:
+        changed = _changed_feature_ids(reader, synced.version)
+
+    if (
+        index is None
+        or changed is None
+        or len(changed) > _REBUILD_THRESHOLD
+        or not _apply_scheduling_changes(reader, synced, changed)
+    ):
+        index = synced.index = SchedulingIndex(get_scheduling_features(reader))
+        synced.scored_version = None
+        changed = []
+
+    synced.epoch, synced.version = current if current is not None else (None, 0)
+    return index, changed
+
+
+def would_create_cycle(session: Session, feature_id: int, dependency_ids: list[int]) -> bool:
+    """Check whether making feature_id depend on dependency_ids would create a cycle.
+
+    True if feature_id is among dependency_ids or is reachable from any of
+    them through committed dependency edges. Answered by the engine's
+    ReachabilityIndex (one bit test per dependency, exact at any depth) after
+    it has caught up on its own connection, so uncommitted changes in
+    `session` are never cached.
+    """
+    if not dependency_ids:
+        return False
+    if feature_id in dependency_ids:
+        return True
+
+    engine = session.get_bind().engine
+    with _reachability_lock:
+        state = _reachability.setdefault(engine, _SyncedReachability())
+    with state.lock:
+        with Session(engine) as reader:
+            _sync_reachability(reader, state)
+        return state.index.would_create_cycle(feature_id, dependency_ids)
+
+
+def get_scheduling_features(session: Session) -> list[dict]:
+    """Narrow feature dicts (id, priority, passes, in_progress, dependencies) for scheduling.
+
+    Loads only the scheduling columns plus the edge table - no description or steps.
+    """
+    dependencies = get_dependency_map(session)
+    rows = session.execute(select(_features.c.id, _features.c.priority, _features.c.passes, _features.c.in_progress))
+    return [
+        {
+            "id": fid,
+            "priority": priority if priority is not None else 999,
+            "passes": bool(passes),
+            "in_progress": bool(in_progress),
+            "dependencies": dependencies.get(fid, []),
+        }
+        for fid, priority, passes, in_progress in rows
+    ]
+
+
+def build_dependency_graph(session: Session) -> dict:
+    """Build graph data for visualization from narrow columns and the edge table.
+
+    Returns:
+        Dict with 'nodes' (id, name, category, status, priority, dependencies),
+        'edges' (source = dependency, target = dependent) and 'cycles'
+        (every cycle group as sorted feature IDs)
+    """
+    dependencies = get_dependency_map(session)
+    blocked_ids = set(get_blocking_dependencies(session))
+    rows = session.execute(
+        select(
+            _features.c.id, _features.c.name, _features.c.category,
+            _features.c.priority, _features.c.passes, _features.c.in_progress,
+        )
+        .order_by(_features.c.id)
+    )
+
+    nodes = []
+    edges = []
+    for fid, name, category, priority, passes, in_progress in rows:
+        if passes:
+            status = "done"
+        elif fid in blocked_ids:
+            status = "blocked"
+        elif in_progress:
+            status = "in_progress"
+        else:
+            status = "pending"
+
+        deps = dependencies.get(fid, [])
+        nodes.append({
+            "id": fid,
+            "name": name,
+            "category": category,
+            "status": status,
+            "priority": priority if priority is not None else 999,
+            "dependencies": deps,
+        })
+        for dep_id in deps:
+            edges.append({"source": dep_id, "target": fid})
+
+    return {"nodes": nodes, "edges": edges, "cycles": find_dependency_cycles(dependencies)}
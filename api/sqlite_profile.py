@@ -0,0 +1,329 @@
+"""
+SQLite Connection Profile
+=========================
+
+Pragmas, lock-wait accounting and WAL checkpointing for features.db.
+
+Every agent's MCP server, the orchestrator, the scheduler and the UI share
+one features.db. Connection-level pragmas don't persist in the file, so they
+are applied to every new connection from an engine connect hook:
+
+- synchronous=NORMAL under WAL: commits don't fsync, checkpoints do. A power
+  loss can drop the last transactions but never corrupts the database.
+  Rollback-journal databases (network filesystems) keep FULL.
+- cache_size, mmap_size and temp_store keep status scans out of the
+  filesystem; mmap is only used under WAL (never on network filesystems).
+- wal_autocheckpoint and journal_size_limit bound the -wal file. Commits
+  still checkpoint past the threshold; the idle checkpointer below usually
+  gets there first, so agents don't pay for it on their write path.
+
+Lock waits: SQLite waits for the write lock inside the busy handler, which
+Python can't observe directly. Under pysqlite a write transaction begins
+implicitly with its first INSERT/UPDATE/DELETE, so the duration of that
+statement is the time spent acquiring the lock (plus a few microseconds of
+work). It is recorded per pooled connection, together with "database is
+locked" errors, and reported by get_lock_wait_stats().
+
+WalCheckpointer runs PASSIVE checkpoints in a background thread once the
+-wal file has stopped changing (idle across all processes), and a TRUNCATE
+checkpoint when the file is large and every frame has been copied back.
+
+Configuration (environment variables, typically set in .env):
+- AUTOCODER_SQLITE_SYNCHRONOUS: synchronous mode under WAL (default NORMAL)
+- AUTOCODER_SQLITE_CACHE_MB: page cache per connection (default 16)
+- AUTOCODER_SQLITE_MMAP_MB: memory-mapped I/O size (default 128, 0 disables)
+- AUTOCODER_SQLITE_WAL_AUTOCHECKPOINT: pages before a commit checkpoints (default 4000)
+- AUTOCODER_SQLITE_BUSY_TIMEOUT_MS: lock wait before "database is locked" (default 30000)
+- AUTOCODER_SQLITE_CHECKPOINT_INTERVAL: seconds between idle checks, 0 disables (default 10)
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+# Statements pysqlite opens a write transaction for
+_WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+# Lock waits above this are counted as contended and logged
+SLOW_LOCK_WAIT_SECONDS = 1.0
+
+# -wal files above this are truncated once fully checkpointed
+WAL_TRUNCATE_BYTES = 64 * 1024 * 1024
+
+# The -wal file must be unchanged this long before an idle checkpoint
+CHECKPOINT_IDLE_SECONDS = 5.0
+
+# Busy timeout for TRUNCATE checkpoints, which must never hold up agents
+CHECKPOINT_BUSY_TIMEOUT_MS = 100
+
+
+def _get_int_env(name: str, default: int, minimum: int, maximum: int) -> int:
+    """Read an integer environment variable, clamped to [minimum, maximum]."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        parsed = int(value)
+    except ValueError:
+        logger.warning("Invalid %s=%r, defaulting to %s", name, value, default)
+        return default
+    return max(minimum, min(parsed, maximum))
+
+
+@dataclass(frozen=True)
+class PragmaProfile:
+    """Per-connection pragmas for features.db."""
+    synchronous: str = "NORMAL"  # Under WAL; rollback journals always use FULL
+    cache_mb: int = 16
+    mmap_mb: int = 128  # Under WAL only
+    temp_store: str = "MEMORY"
+    wal_autocheckpoint: int = 4000  # Pages
+    journal_size_limit_mb: int = 64
+    busy_timeout_ms: int = 30000
+
+
+def get_pragma_profile() -> PragmaProfile:
+    """Build the pragma profile from AUTOCODER_SQLITE_* environment variables."""
+    synchronous = os.getenv("AUTOCODER_SQLITE_SYNCHRONOUS", "NORMAL").strip().upper()
+    if synchronous not in _SYNCHRONOUS_MODES:
+        logger.warning("Invalid AUTOCODER_SQLITE_SYNCHRONOUS=%r, defaulting to NORMAL", synchronous)
+        synchronous = "NORMAL"
+    return PragmaProfile(
+        synchronous=synchronous,
+        cache_mb=_get_int_env("AUTOCODER_SQLITE_CACHE_MB", 16, 1, 1024),
+        mmap_mb=_get_int_env("AUTOCODER_SQLITE_MMAP_MB", 128, 0, 16384),
+        wal_autocheckpoint=_get_int_env("AUTOCODER_SQLITE_WAL_AUTOCHECKPOINT", 4000, 100, 1_000_000),
+        busy_timeout_ms=_get_int_env("AUTOCODER_SQLITE_BUSY_TIMEOUT_MS", 30000, 0, 600_000),
+    )
+
+
+def get_checkpoint_interval() -> float:
+    """Seconds between idle checkpoint checks (AUTOCODER_SQLITE_CHECKPOINT_INTERVAL), 0 = disabled."""
+    return float(_get_int_env("AUTOCODER_SQLITE_CHECKPOINT_INTERVAL", 10, 0, 3600))
+
+
+def apply_pragma_profile(dbapi_connection, profile: PragmaProfile) -> str:
+    """Apply the profile to a raw sqlite3 connection.
+
+    Returns:
+        The connection's journal mode (lowercase)
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        journal_mode: str = cursor.execute("PRAGMA journal_mode").fetchone()[0].lower()
+        wal = journal_mode == "wal"
+        cursor.execute(f"PRAGMA busy_timeout={profile.busy_timeout_ms}")
+        cursor.execute(f"PRAGMA synchronous={profile.synchronous if wal else 'FULL'}")
+        cursor.execute(f"PRAGMA cache_size={-profile.cache_mb * 1024}")  # Negative = KiB
+        cursor.execute(f"PRAGMA temp_store={profile.temp_store}")
+        cursor.execute(f"PRAGMA mmap_size={profile.mmap_mb * 1024 * 1024 if wal else 0}")
+        if wal:
+            cursor.execute(f"PRAGMA wal_autocheckpoint={profile.wal_autocheckpoint}")
+            cursor.execute(f"PRAGMA journal_size_limit={profile.journal_size_limit_mb * 1024 * 1024}")
+    finally:
+        cursor.close()
+    return journal_mode
+
+
+@dataclass
+class LockWaitStats:
+    """Write-lock waits of one pooled connection."""
+    connection_id: int
+    write_transactions: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    slow_waits: int = 0  # Waits above SLOW_LOCK_WAIT_SECONDS
+    busy_errors: int = 0  # "database is locked" after the busy timeout
+
+    def record(self, seconds: float) -> None:
+        self.write_transactions += 1
+        self.total_wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+        if seconds > SLOW_LOCK_WAIT_SECONDS:
+            self.slow_waits += 1
+
+
+# Engine -> stats of every connection it opened (including closed ones). Weak, so
+# an engine that is dropped without forget_engine() doesn't leak its entry or
+# hand it to a later engine that reuses its id()
+_lock_stats: weakref.WeakKeyDictionary[Engine, list[LockWaitStats]] = weakref.WeakKeyDictionary()
+_lock_stats_lock = threading.Lock()
+
+
+def _connection_stats(conn) -> LockWaitStats:
+    # Connection.info lives as long as the pooled DBAPI connection
+    stats: LockWaitStats = conn.info["lock_wait_stats"]
+    return stats
+
+
+def install_profile(engine: Engine, profile: PragmaProfile | None = None) -> PragmaProfile:
+    """Apply the pragma profile to every connection of engine and track its lock waits.
+
+    Returns:
+        The profile in use
+    """
+    profile = profile or get_pragma_profile()
+    with _lock_stats_lock:
+        engine_stats = _lock_stats.setdefault(engine, [])
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_pragma_profile(dbapi_connection, profile)
+        stats = LockWaitStats(connection_id=id(dbapi_connection))
+        connection_record.info["lock_wait_stats"] = stats
+        with _lock_stats_lock:
+            engine_stats.append(stats)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        # Only the statement that opens the write transaction waits for the lock
+        if not conn.connection.dbapi_connection.in_transaction and statement.lstrip()[:7].upper().startswith(
+            _WRITE_PREFIXES
+        ):
+            conn.info["lock_wait_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("lock_wait_started", None)
+        if started is not None:
+            waited = time.perf_counter() - started
+            _connection_stats(conn).record(waited)
+            if waited > SLOW_LOCK_WAIT_SECONDS:
+                logger.warning("Waited %.2fs for the features.db write lock", waited)
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context):
+        conn = context.connection
+        if conn is None:
+            return
+        conn.info.pop("lock_wait_started", None)
+        error = context.original_exception
+        if isinstance(error, sqlite3.OperationalError) and "locked" in str(error):
+            _connection_stats(conn).busy_errors += 1
+
+    return profile
+
+
+def get_lock_wait_stats(engine: Engine) -> dict:
+    """Lock-wait statistics of engine, per connection and in total."""
+    with _lock_stats_lock:
+        connections = [asdict(stats) for stats in _lock_stats.get(engine, [])]
+    total = {
+        "write_transactions": sum(c["write_transactions"] for c in connections),
+        "total_wait_seconds": sum(c["total_wait_seconds"] for c in connections),
+        "max_wait_seconds": max((c["max_wait_seconds"] for c in connections), default=0.0),
+        "slow_waits": sum(c["slow_waits"] for c in connections),
+        "busy_errors": sum(c["busy_errors"] for c in connections),
+    }
+    return {"connections": connections, "total": total}
+
+
+def forget_engine(engine: Engine) -> None:
+    """Drop the lock-wait statistics of a disposed engine."""
+    with _lock_stats_lock:
+        _lock_stats.pop(engine, None)
+
+
+class WalCheckpointer:
+    """Background thread checkpointing a WAL database while it is idle.
+
+    Idle means the -wal file's size and mtime haven't changed for
+    CHECKPOINT_IDLE_SECONDS, which covers writers in every process. An idle
+    WAL is checkpointed PASSIVE (never waits for anyone); once every frame
+    is back in the database and the file is over WAL_TRUNCATE_BYTES, a
+    TRUNCATE checkpoint with a short busy timeout resets it to zero bytes.
+    """
+
+    def __init__(self, engine: Engine, db_path: Path, interval: float):
+        self._engine = engine
+        self._wal_path = Path(f"{db_path}-wal")
+        self._interval = interval
+        self._stop = threading.Event()
+        self._last_stat: tuple[int, int] | None = None
+        self._unchanged_since = time.monotonic()
+        self._checkpointed_stat: tuple[int, int] | None = None
+        self.checkpoints = 0
+        self.truncations = 0
+        self._thread = threading.Thread(target=self._run, name=f"wal-checkpointer:{db_path}", daemon=True)
+
+    def start(self) -> "WalCheckpointer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("WAL checkpoint failed for %s", self._wal_path)
+
+    def check(self) -> None:
+        """Checkpoint if the WAL has been idle long enough (one tick of the thread)."""
+        try:
+            st = self._wal_path.stat()
+        except FileNotFoundError:
+            return
+        stat = (st.st_size, st.st_mtime_ns)
+        now = time.monotonic()
+        if stat != self._last_stat:
+            self._last_stat = stat
+            self._unchanged_since = now
+            return
+        if st.st_size == 0 or stat == self._checkpointed_stat or now - self._unchanged_since < CHECKPOINT_IDLE_SECONDS:
+            return
+
+        connection = self._engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            busy, log_frames, checkpointed = cursor.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+            self.checkpoints += 1
+            if not busy and log_frames == checkpointed and st.st_size > WAL_TRUNCATE_BYTES:
+                timeout = cursor.execute("PRAGMA busy_timeout").fetchone()[0]
+                cursor.execute(f"PRAGMA busy_timeout={CHECKPOINT_BUSY_TIMEOUT_MS}")
+                try:
+                    if cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()[0] == 0:
+                        self.truncations += 1
+                finally:
+                    cursor.execute(f"PRAGMA busy_timeout={timeout}")
+            cursor.close()
+        finally:
+            connection.close()
+
+        # Don't checkpoint the same idle WAL again; the file changes once written to
+        try:
+            st = self._wal_path.stat()
+            self._checkpointed_stat = self._last_stat = (st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            self._checkpointed_stat = None
+
+
+def start_wal_checkpointer(engine: Engine, db_path: Path) -> WalCheckpointer | None:
+    """Start an idle checkpointer for a WAL database, unless disabled or not in WAL mode."""
+    interval = get_checkpoint_interval()
+    if interval <= 0:
+        return None
+    connection = engine.raw_connection()
+    try:
+        journal_mode = connection.cursor().execute("PRAGMA journal_mode").fetchone()[0].lower()
+    finally:
+        connection.close()
+    if journal_mode != "wal":
+        return None
+    return WalCheckpointer(engine, db_path, interval).start()
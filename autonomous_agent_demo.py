@@ -32,6 +32,9 @@ Example Usage:
     python autonomous_agent_demo.py --project-dir my-app --agent-type initializer
     python autonomous_agent_demo.py --project-dir my-app --agent-type coding --feature-id 42
     python autonomous_agent_demo.py --project-dir my-app --agent-type testing
+
+    # Run as a pooled worker that reads assignments from stdin (used by orchestrator)
+    python autonomous_agent_demo.py --project-dir my-app --worker
 """
 
 import argparse
@@ -44,7 +47,7 @@ from dotenv import load_dotenv
 # IMPORTANT: Must be called BEFORE importing other modules that read env vars at load time
 load_dotenv()
 
-from agent import run_autonomous_agent
+from agent import run_agent_worker, run_autonomous_agent
 from registry import DEFAULT_MODEL, get_project_path
 
 
@@ -112,7 +115,7 @@ Authentication:
         "--concurrency", "-c",
         type=int,
         default=1,
-        help="Number of concurrent coding agents (default: 1, max: 5)",
+        help="Number of concurrent coding agents (default: 1, max: AUTOCODER_MAX_CONCURRENCY, default 5)",
     )
 
     # Backward compatibility: --parallel is deprecated alias for --concurrency
@@ -141,6 +144,13 @@ Authentication:
         help="Agent type (used by orchestrator to spawn specialized subprocesses)",
     )
 
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        default=False,
+        help="Run as a pooled worker reading JSON assignments from stdin (used by orchestrator)",
+    )
+
     parser.add_argument(
         "--testing-feature-id",
         type=int,
@@ -194,7 +204,10 @@ def main() -> None:
             return
 
     try:
-        if args.agent_type:
+        if args.worker:
+            # Pooled worker mode - warm process reused across assignments
+            asyncio.run(run_agent_worker(project_dir=project_dir, model=args.model, yolo_mode=args.yolo))
+        elif args.agent_type:
             # Subprocess mode - spawned by orchestrator for a specific role
             asyncio.run(
                 run_autonomous_agent(
@@ -209,10 +222,10 @@ def main() -> None:
             )
         else:
             # Entry point mode - always use unified orchestrator
-            from parallel_orchestrator import run_parallel_orchestrator
+            from parallel_orchestrator import MAX_PARALLEL_AGENTS, run_parallel_orchestrator
 
-            # Clamp concurrency to valid range (1-5)
-            concurrency = max(1, min(args.concurrency, 5))
+            # Clamp concurrency to valid range (1-MAX_PARALLEL_AGENTS)
+            concurrency = max(1, min(args.concurrency, MAX_PARALLEL_AGENTS))
             if concurrency != args.concurrency:
                 print(f"Clamping concurrency to valid range: {concurrency}", flush=True)
 
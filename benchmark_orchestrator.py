@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Orchestrator Benchmark
+======================
+
+End-to-end throughput of ParallelOrchestrator.run_loop() with the LLM taken
+out: agent workers are replaced by stub_agent.py, which claims its feature,
+prints a few lines, sleeps and marks the feature passing through the shared
+feature MCP server. Everything else - the worker pool, the MCP server, the
+scheduling loop, claims, leases and attempt recording - is the real code.
+
+Each concurrency level runs on a fresh synthetic features.db of the given
+size and dependency shape:
+
+- independent: no dependencies
+- chain: every feature depends on the previous one
+- layered: layers of --width features, each depending on --fan-in features
+  of the layer before
+- random: each feature depends on up to --fan-in earlier features
+
+Reported per concurrency level:
+- features/min: passing features per minute of run_loop wall time
+- spawn latency: coding assignment handed to a worker -> first output line
+- CPU: orchestrator process CPU, and the share spent in scheduling queries
+  (ready/resumable/complete checks, lease maintenance) per feature
+- lock waits: features.db write-lock waits of the orchestrator's engine
+- peak threads and open file descriptors of the orchestrator and of all its
+  child processes (workers and MCP server)
+
+Pool sizes still follow host load (see admission.py), so run it on an
+otherwise idle machine; admission decisions below the configured ceiling
+are counted and reported under the table.
+
+Usage:
+    python benchmark_orchestrator.py --features 200 --shape layered --concurrency 1,2,4,8 --work-seconds 0.5
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import psutil
+
+from admission import CONCURRENCY_HARD_LIMIT
+
+# Let the sweep go past the default coding ceiling (an explicit setting still wins)
+os.environ.setdefault("AUTOCODER_MAX_CONCURRENCY", str(CONCURRENCY_HARD_LIMIT))
+
+from api.database import Feature, create_database
+from api.feature_ingest import ingest_features
+from api.sqlite_profile import forget_engine, get_lock_wait_stats
+from parallel_orchestrator import AUTOCODER_ROOT, ParallelOrchestrator
+
+SHAPES = ("independent", "chain", "layered", "random")
+
+# How often thread and FD counts are sampled while the orchestrator runs
+SAMPLE_INTERVAL = 0.2
+
+
+def create_synthetic_project(
+    project_dir: Path,
+    size: int,
+    shape: str = "layered",
+    width: int = 10,
+    fan_in: int = 2,
+    seed: int = 0,
+) -> None:
+    """Create a features.db with `size` pending features in the given dependency shape."""
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown shape: {shape}")
+    rng = random.Random(seed)
+    features = []
+    for i in range(size):
+        if shape == "chain":
+            deps = [i - 1] if i else []
+        elif shape == "layered":
+            layer_start = i - i % width
+            previous = range(max(layer_start - width, 0), layer_start)
+            deps = rng.sample(previous, min(fan_in, len(previous)))
+        elif shape == "random":
+            deps = rng.sample(range(i), min(rng.randint(0, fan_in), i))
+        else:
+            deps = []
+        features.append({
+            "category": f"category-{i % 5}",
+            "name": f"Synthetic feature {i}",
+            "description": f"Synthetic benchmark feature {i}",
+            "steps": [f"Step {n + 1}" for n in range(1 + i % 4)],
+            "depends_on_indices": sorted(deps),
+        })
+
+    project_dir.mkdir(parents=True, exist_ok=True)
+    engine, session_maker = create_database(project_dir)
+    session = session_maker()
+    try:
+        result = ingest_features(session, features)
+    finally:
+        session.close()
+        engine.dispose()
+        forget_engine(engine)
+    if result.errors:
+        raise RuntimeError(f"Could not create synthetic features: {result.errors[:3]}")
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of one run_loop() on a synthetic project."""
+    concurrency: int
+    features: int
+    passed: int = 0
+    wall_seconds: float = 0.0
+    spawn_latencies: list[float] = field(default_factory=list)
+    orchestrator_cpu_seconds: float = 0.0
+    scheduling_cpu_seconds: float = 0.0
+    lock_waits: dict = field(default_factory=dict)
+    peak_threads: int = 0
+    peak_fds: int = 0
+    peak_child_processes: int = 0
+    peak_child_threads: int = 0
+    peak_child_fds: int = 0
+    # Admission decisions by reason (see AdmissionController)
+    admission_reasons: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def features_per_minute(self) -> float:
+        return 60 * self.passed / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def latency_percentile(self, q: float) -> float:
+        """Spawn-to-first-output latency percentile in seconds (0 if none)."""
+        if not self.spawn_latencies:
+            return 0.0
+        ordered = sorted(self.spawn_latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data.pop("spawn_latencies")
+        return {
+            **data,
+            "features_per_minute": self.features_per_minute,
+            "spawn_latency_p50": self.latency_percentile(0.5),
+            "spawn_latency_p95": self.latency_percentile(0.95),
+            "spawn_latency_max": self.latency_percentile(1.0),
+        }
+
+
+class BenchmarkOrchestrator(ParallelOrchestrator):
+    """ParallelOrchestrator running stub_agent.py workers, with instrumentation."""
+
+    def __init__(self, project_dir: Path, stub_args: list[str], **kwargs):
+        super().__init__(project_dir, on_output=self._on_agent_output, **kwargs)
+        self._stub_args = stub_args
+        # Coding features handed to a worker that haven't printed yet -> monotonic start
+        self._assigned_at: dict[int, float] = {}
+        self.spawn_latencies: list[float] = []
+        self.scheduling_cpu_seconds = 0.0
+        self.admission_reasons: dict[str, int] = {}
+
+    async def _spawn_worker(self):
+        cmd = [
+            sys.executable, "-u",
+            str(AUTOCODER_ROOT / "stub_agent.py"),
+            "--project-dir", str(self.project_dir),
+            *self._stub_args,
+        ]
+        return await self._spawn_agent_process(cmd, stdin=asyncio.subprocess.PIPE)
+
+    def _admission_limits(self):
+        limits = super()._admission_limits()
+        self.admission_reasons[limits.reason] = self.admission_reasons.get(limits.reason, 0) + 1
+        return limits
+
+    async def _assign_worker(self, assignment: dict):
+        if assignment["agent_type"] == "coding":
+            self._assigned_at[assignment["feature_id"]] = time.monotonic()
+        return await super()._assign_worker(assignment)
+
+    def _on_agent_output(self, feature_id: int, line: str) -> None:
+        started = self._assigned_at.pop(feature_id, None)
+        if started is not None:
+            self.spawn_latencies.append(time.monotonic() - started)
+
+    @contextlib.contextmanager
+    def _scheduling_cpu(self):
+        started = time.thread_time()
+        try:
+            yield
+        finally:
+            self.scheduling_cpu_seconds += time.thread_time() - started
+
+    def get_ready_features(self) -> list[dict]:
+        with self._scheduling_cpu():
+            return super().get_ready_features()
+
+    def get_resumable_features(self) -> list[dict]:
+        with self._scheduling_cpu():
+            return super().get_resumable_features()
+
+    def get_all_complete(self) -> bool:
+        with self._scheduling_cpu():
+            return super().get_all_complete()
+
+    def get_passing_count(self) -> int:
+        with self._scheduling_cpu():
+            return super().get_passing_count()
+
+    def _maintain_leases(self) -> None:
+        with self._scheduling_cpu():
+            super()._maintain_leases()
+
+
+async def _sample_processes(result: BenchmarkResult, stop: asyncio.Event) -> None:
+    """Record peak thread, FD and child process counts until stopped."""
+    me = psutil.Process()
+
+    def fds(proc: psutil.Process) -> int:
+        return int(proc.num_fds() if hasattr(proc, "num_fds") else proc.num_handles())
+
+    while not stop.is_set():
+        result.peak_threads = max(result.peak_threads, me.num_threads())
+        result.peak_fds = max(result.peak_fds, fds(me))
+        children = me.children(recursive=True)
+        threads = open_fds = 0
+        for child in children:
+            try:
+                threads += child.num_threads()
+                open_fds += fds(child)
+            except psutil.Error:
+                continue  # Exited while sampling
+        result.peak_child_processes = max(result.peak_child_processes, len(children))
+        result.peak_child_threads = max(result.peak_child_threads, threads)
+        result.peak_child_fds = max(result.peak_child_fds, open_fds)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=SAMPLE_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_benchmark(
+    project_dir: Path,
+    concurrency: int,
+    features: int,
+    stub_args: list[str],
+    testing_agent_ratio: int = 0,
+) -> BenchmarkResult:
+    """Run the orchestrator on a prepared project until every feature is done."""
+    result = BenchmarkResult(concurrency=concurrency, features=features)
+    orchestrator = BenchmarkOrchestrator(
+        project_dir,
+        stub_args,
+        max_concurrency=concurrency,
+        yolo_mode=testing_agent_ratio == 0,
+        testing_agent_ratio=testing_agent_ratio,
+    )
+
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample_processes(result, stop))
+    cpu_before = psutil.Process().cpu_times()
+    started = time.monotonic()
+    try:
+        # The orchestrator narrates every spawn and completion; keep it out of the report
+        with open(project_dir / "orchestrator.log", "w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+            await orchestrator.run_loop()
+    finally:
+        result.wall_seconds = time.monotonic() - started
+        cpu_after = psutil.Process().cpu_times()
+        stop.set()
+        await sampler
+
+    result.orchestrator_cpu_seconds = (cpu_after.user - cpu_before.user) + (cpu_after.system - cpu_before.system)
+    result.scheduling_cpu_seconds = orchestrator.scheduling_cpu_seconds
+    result.spawn_latencies = orchestrator.spawn_latencies
+    result.lock_waits = get_lock_wait_stats(orchestrator._engine)["total"]
+    result.admission_reasons = orchestrator.admission_reasons
+
+    session = orchestrator.get_session()
+    try:
+        result.passed = session.query(Feature).filter(Feature.passes == True).count()
+    finally:
+        session.close()
+    orchestrator._feature_graph.close()
+    orchestrator._engine.dispose()
+    forget_engine(orchestrator._engine)
+    return result
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main():
+    """Run the benchmark for each concurrency level and print a table."""
+    parser = argparse.ArgumentParser(description="Benchmark orchestrator overhead with stub agents")
+    parser.add_argument("--features", type=int, default=100, help="Synthetic features per run (default: 100)")
+    parser.add_argument("--shape", choices=SHAPES, default="layered", help="Dependency shape (default: layered)")
+    parser.add_argument("--width", type=int, default=10, help="Features per layer for --shape layered (default: 10)")
+    parser.add_argument("--fan-in", type=int, default=2, help="Dependencies per feature (default: 2)")
+    parser.add_argument("--concurrency", "-p", type=_int_list, default=[1, 2, 4, 8],
+                        help="Comma-separated coding agent counts (default: 1,2,4,8)")
+    parser.add_argument("--testing-agent-ratio", type=int, default=0,
+                        help="Testing agents to maintain (default: 0, YOLO mode)")
+    parser.add_argument("--work-seconds", type=float, default=0.5, help="Stub agent time per feature (default: 0.5)")
+    parser.add_argument("--output-lines", type=int, default=3, help="Stub agent output lines per feature (default: 3)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Probability a stub coding attempt fails")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic dependency graph")
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic projects (and orchestrator logs)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    stub_args = [
+        "--work-seconds", str(args.work_seconds),
+        "--output-lines", str(args.output_lines),
+        "--fail-rate", str(args.fail_rate),
+    ]
+    root = Path(tempfile.mkdtemp(prefix="autocoder-bench-"))
+    results = []
+    for concurrency in args.concurrency:
+        project_dir = root / f"concurrency-{concurrency}"
+        create_synthetic_project(project_dir, args.features, args.shape, args.width, args.fan_in, args.seed)
+        results.append(asyncio.run(run_benchmark(
+            project_dir, concurrency, args.features, stub_args, args.testing_agent_ratio
+        )))
+        if not args.json:
+            print(f"concurrency {concurrency}: {results[-1].passed}/{args.features} passed "
+                  f"in {results[-1].wall_seconds:.1f}s", file=sys.stderr, flush=True)
+
+    if args.keep:
+        print(f"Synthetic projects kept in {root}", file=sys.stderr)
+    else:
+        import shutil
+        shutil.rmtree(root, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps([r.to_dict() for r in results], indent=2))
+        return
+
+    print(f"{args.features} features ({args.shape}), {args.work_seconds}s stub work, "
+          f"testing agents: {args.testing_agent_ratio}")
+    header = ("conc", "feat/min", "spawn p50", "p95", "cpu s", "sched ms/f",
+              "lock wait", "busy", "threads", "fds", "children", "child thr", "child fds")
+    print("{:>4} {:>8} {:>9} {:>7} {:>6} {:>10} {:>9} {:>4} {:>7} {:>5} {:>8} {:>9} {:>9}".format(*header))
+    for r in results:
+        print("{:>4} {:>8.1f} {:>8.0f}ms {:>5.0f}ms {:>6.1f} {:>10.2f} {:>8.2f}s {:>4} {:>7} {:>5} {:>8} {:>9} {:>9}".format(
+            r.concurrency,
+            r.features_per_minute,
+            r.latency_percentile(0.5) * 1000,
+            r.latency_percentile(0.95) * 1000,
+            r.orchestrator_cpu_seconds,
+            1000 * r.scheduling_cpu_seconds / max(r.passed, 1),
+            r.lock_waits.get("total_wait_seconds", 0.0),
+            r.lock_waits.get("busy_errors", 0),
+            r.peak_threads,
+            r.peak_fds,
+            r.peak_child_processes,
+            r.peak_child_threads,
+            r.peak_child_fds,
+        ))
+    for r in results:
+        capped = {reason: n for reason, n in r.admission_reasons.items() if reason != "configured ceiling"}
+        if capped:
+            total = sum(r.admission_reasons.values())
+            details = ", ".join(f"{reason} {n}/{total}" for reason, n in sorted(capped.items()))
+            print(f"concurrency {r.concurrency}: admission held pools below the ceiling ({details})")
+
+
+if __name__ == "__main__":
+    main()
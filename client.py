@@ -15,6 +15,7 @@ from claude_agent_sdk import ClaudeAgentOptions, ClaudeSDKClient
 from claude_agent_sdk.types import HookContext, HookInput, HookMatcher, SyncHookJSONOutput
 from dotenv import load_dotenv
 
+from api.feature_claims import AGENT_ID_ENV, AGENT_ID_HEADER
 from security import bash_security_hook
 
 # Load environment variables from .env file if present
@@ -80,6 +81,45 @@ def get_playwright_browser() -> str:
     return value
 
 
+# Shared feature MCP server started by the orchestrator (see mcp_server/feature_mcp.py).
+# When set, agents connect to it over HTTP instead of spawning their own server.
+FEATURE_MCP_URL_ENV = "AUTOCODER_FEATURE_MCP_URL"
+FEATURE_MCP_TOKEN_ENV = "AUTOCODER_FEATURE_MCP_TOKEN"
+
+
+def get_feature_mcp_config(project_dir: Path) -> dict:
+    """
+    Get the MCP server config for the features server.
+
+    Uses the orchestrator's shared HTTP server when AUTOCODER_FEATURE_MCP_URL
+    is set, otherwise a stdio server process for this session. Either way the
+    server learns this process's ID, which owns the features the agent claims
+    (the orchestrator releases them when a worker process exits).
+    """
+    agent_id = str(os.getpid())
+    url = os.getenv(FEATURE_MCP_URL_ENV)
+    if url:
+        return {
+            "type": "http",
+            "url": url,
+            "headers": {
+                "Authorization": f"Bearer {os.getenv(FEATURE_MCP_TOKEN_ENV, '')}",
+                AGENT_ID_HEADER: agent_id,
+            },
+        }
+    return {
+        "command": sys.executable,  # Use the same Python that's running this script
+        "args": ["-m", "mcp_server.feature_mcp"],
+        "env": {
+            # Only specify variables the MCP server needs
+            # (subprocess inherits parent environment automatically)
+            "PROJECT_DIR": str(project_dir.resolve()),
+            "PYTHONPATH": str(Path(__file__).parent.resolve()),
+            AGENT_ID_ENV: agent_id,
+        },
+    }
+
+
 # Feature MCP tools for feature/test management
 FEATURE_MCP_TOOLS = [
     # Core feature operations
@@ -88,6 +128,7 @@ FEATURE_MCP_TOOLS = [
     "mcp__features__feature_get_summary",  # Lightweight: id, name, status, deps only
     "mcp__features__feature_mark_in_progress",
     "mcp__features__feature_claim_and_get",  # Atomic claim + get details
+    "mcp__features__feature_claim_next",  # Atomic pick + claim of best ready feature
     "mcp__features__feature_mark_passing",
     "mcp__features__feature_mark_failing",  # Mark regression detected
     "mcp__features__feature_skip",
@@ -220,12 +261,20 @@ def create_client(
     # Ensure project directory exists before creating settings file
     project_dir.mkdir(parents=True, exist_ok=True)
 
-    # Write settings to a file in the project directory
+    # Write settings to a file in the project directory. Skip the write when the
+    # file is already up to date - pooled workers call this once per session and
+    # concurrent agents would otherwise keep rewriting the same file.
     settings_file = project_dir / ".claude_settings.json"
-    with open(settings_file, "w") as f:
-        json.dump(security_settings, f, indent=2)
-
-    print(f"Created security settings at {settings_file}")
+    settings_json = json.dumps(security_settings, indent=2)
+    try:
+        up_to_date = settings_file.read_text() == settings_json
+    except OSError:
+        up_to_date = False
+    if not up_to_date:
+        settings_file.write_text(settings_json)
+        print(f"Created security settings at {settings_file}")
+    else:
+        print(f"Using security settings at {settings_file}")
     print("   - Sandbox enabled (OS-level bash isolation)")
     print(f"   - Filesystem restricted to: {project_dir.resolve()}")
     print("   - Bash commands restricted to allowlist (see security.py)")
@@ -245,17 +294,10 @@ def create_client(
 
     # Build MCP servers config - features is always included, playwright only in standard mode
     mcp_servers = {
-        "features": {
-            "command": sys.executable,  # Use the same Python that's running this script
-            "args": ["-m", "mcp_server.feature_mcp"],
-            "env": {
-                # Only specify variables the MCP server needs
-                # (subprocess inherits parent environment automatically)
-                "PROJECT_DIR": str(project_dir.resolve()),
-                "PYTHONPATH": str(Path(__file__).parent.resolve()),
-            },
-        },
+        "features": get_feature_mcp_config(project_dir),
     }
+    if "url" in mcp_servers["features"]:
+        print(f"   - Features MCP: shared server at {mcp_servers['features']['url']}")
     if not yolo_mode:
         # Include Playwright MCP server for browser automation (standard mode only)
         # Browser and headless mode configurable via environment variables
@@ -14,6 +14,7 @@ Tools:
 - feature_skip: Skip a feature (move to end of queue)
 - feature_mark_in_progress: Mark a feature as in-progress
 - feature_claim_and_get: Atomically claim and get feature details
+- feature_claim_next: Atomically pick and claim the best ready feature
 - feature_clear_in_progress: Clear in-progress status
 - feature_create_bulk: Create multiple features at once
 - feature_create: Create a single feature
@@ -25,29 +26,60 @@ Tools:
 
 Note: Feature selection (which feature to work on) is handled by the
 orchestrator, not by agents. Agents receive pre-assigned feature IDs.
+
+Transports:
+- stdio (default): one server process per agent session.
+- streamable HTTP (--http): one long-lived server per project shared by all
+  agents, started by the orchestrator on localhost. Requests must carry the
+  bearer token from FEATURE_MCP_TOKEN.
+
+Claims are owned by the calling agent (the X-Agent-Id header, or
+AUTOCODER_AGENT_ID for stdio) and renewed only while one of that agent's
+sessions is connected.
 """
 
+import argparse
+import asyncio
+import functools
+import hmac
 import json
+import logging
 import os
 import sys
 import threading
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Annotated
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 from pydantic import BaseModel, Field
 
 # Add parent directory to path so we can import from api module
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from api.database import Feature, create_database
-from api.dependency_resolver import (
-    MAX_DEPENDENCIES_PER_FEATURE,
-    compute_scheduling_scores,
-    would_create_circular_dependency,
+from api.database import Feature, allocate_priorities, create_database
+from api.dependency_resolver import MAX_DEPENDENCIES_PER_FEATURE
+from api.feature_claims import (
+    AGENT_ID_HEADER,
+    LEASE_RENEW_INTERVAL,
+    agent_claim_owner,
+    claim_feature,
+    claim_next_feature,
+    renew_owner_leases,
+)
+from api.feature_ingest import ingest_features
+from api.feature_queries import (
+    build_dependency_graph,
+    count_ready_features,
+    get_blocked_features,
+    get_ready_features,
+    refresh_scheduling_scores,
+    scheduling_scores_stale,
+    would_create_cycle,
 )
 from api.migration import migrate_json_to_sqlite
+from api.sqlite_profile import forget_engine
 
 # Configuration from environment
 PROJECT_DIR = Path(os.environ.get("PROJECT_DIR", ".")).resolve()
@@ -96,14 +128,46 @@ class BulkCreateInput(BaseModel):
 _session_maker = None
 _engine = None
 
-# Lock for priority assignment to prevent race conditions
-_priority_lock = threading.Lock()
 
+@dataclass(eq=False)
+class _SessionClaims:
+    """Lease owners that claimed through one connected MCP session."""
+    owners: set[str] = field(default_factory=set)
 
-@asynccontextmanager
-async def server_lifespan(server: FastMCP):
-    """Initialize database on startup, cleanup on shutdown."""
+
+# Sessions currently connected. The heartbeat renews the claims of their
+# owners only (see _renew_leases_forever), so an agent that disconnects or
+# crashes lets its leases expire even while the shared server keeps running.
+_live_sessions: set[_SessionClaims] = set()
+_live_sessions_lock = threading.Lock()
+_stop_lease_heartbeat = threading.Event()
+
+# Serializes write tools. A shared HTTP server handles every agent's session
+# in one process, so writes queue here instead of contending for SQLite's
+# write lock across processes.
+_write_lock = threading.Lock()
+
+
+def _write_tool(fn):
+    """Run a write tool in a worker thread, one write at a time.
+
+    Keeps the event loop (and every other session's reads) responsive while
+    a write waits for the database.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        def run():
+            with _write_lock:
+                return fn(*args, **kwargs)
+        return await asyncio.to_thread(run)
+    return wrapper
+
+
+def _init_database() -> None:
+    """Open the project database and migrate legacy JSON (once per process)."""
     global _session_maker, _engine
+    if _session_maker is not None:
+        return
 
     # Create project directory if it doesn't exist
     PROJECT_DIR.mkdir(parents=True, exist_ok=True)
@@ -114,17 +178,75 @@ async def server_lifespan(server: FastMCP):
     # Run migration if needed (converts legacy JSON to SQLite)
     migrate_json_to_sqlite(PROJECT_DIR, _session_maker)
 
-    yield
+    threading.Thread(target=_renew_leases_forever, name="feature-lease-heartbeat", daemon=True).start()
+
+
+def _renew_leases_forever() -> None:
+    """Keep the claims of connected agents alive until this process exits.
+
+    An agent's claims expire (and return to the ready pool) only once none of
+    its sessions is connected, however long it works between tool calls.
+    """
+    while not _stop_lease_heartbeat.wait(LEASE_RENEW_INTERVAL):
+        with _live_sessions_lock:
+            owners = {owner for claims in _live_sessions for owner in claims.owners}
+        if not owners:
+            continue
+        session = get_session()
+        try:
+            with _write_lock:
+                for owner in sorted(owners):
+                    renew_owner_leases(session, owner)
+                session.commit()
+        except Exception as e:
+            session.rollback()
+            print(f"Lease renewal failed: {e}", file=sys.stderr)
+        finally:
+            session.close()
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    """Initialize database on startup, cleanup on shutdown.
+
+    Runs once per session. The shared HTTP server initializes the database
+    before serving, so its sessions leave the engine alone. The session's
+    claim owners (see _claim_owner) are renewed while it is connected.
+    """
+    owns_database = _session_maker is None
+    _init_database()
+
+    claims = _SessionClaims()
+    with _live_sessions_lock:
+        _live_sessions.add(claims)
+    try:
+        yield claims
+    finally:
+        with _live_sessions_lock:
+            _live_sessions.discard(claims)
 
     # Cleanup
-    if _engine:
+    if owns_database and _engine:
+        _stop_lease_heartbeat.set()
         _engine.dispose()
+        forget_engine(_engine)
 
 
 # Initialize the MCP server
 mcp = FastMCP("features", lifespan=server_lifespan)
 
 
+def _claim_owner(ctx: Context) -> str:
+    """Lease owner for the calling agent, renewed while its session is connected."""
+    request = ctx.request_context.request
+    agent_id = request.headers.get(AGENT_ID_HEADER) if request is not None else None
+    owner = agent_claim_owner(agent_id)
+    claims: _SessionClaims = ctx.request_context.lifespan_context
+    with _live_sessions_lock:
+        claims.owners.add(owner)
+    return owner
+
+
 def get_session():
     """Get a new database session."""
     if _session_maker is None:
@@ -227,6 +349,7 @@ def feature_get_summary(
 
 
 @mcp.tool()
+@_write_tool
 def feature_mark_passing(
     feature_id: Annotated[int, Field(description="The ID of the feature to mark as passing", ge=1)]
 ) -> str:
@@ -249,7 +372,7 @@ def feature_mark_passing(
             return json.dumps({"error": f"Feature with ID {feature_id} not found"})
 
         feature.passes = True
-        feature.in_progress = False
+        feature.clear_claim()
         session.commit()
 
         return json.dumps({"success": True, "feature_id": feature_id, "name": feature.name})
@@ -261,6 +384,7 @@ def feature_mark_passing(
 
 
 @mcp.tool()
+@_write_tool
 def feature_mark_failing(
     feature_id: Annotated[int, Field(description="The ID of the feature to mark as failing", ge=1)]
 ) -> str:
@@ -290,7 +414,7 @@ def feature_mark_failing(
             return json.dumps({"error": f"Feature with ID {feature_id} not found"})
 
         feature.passes = False
-        feature.in_progress = False
+        feature.clear_claim()
         session.commit()
         session.refresh(feature)
 
@@ -306,6 +430,7 @@ def feature_mark_failing(
 
 
 @mcp.tool()
+@_write_tool
 def feature_skip(
     feature_id: Annotated[int, Field(description="The ID of the feature to skip", ge=1)]
 ) -> str:
@@ -316,7 +441,7 @@ def feature_skip(
     - External blockers (missing assets, unclear requirements)
     - Technical prerequisites that need to be addressed first
 
-    The feature's priority is set to max_priority + 1, so it will be
+    The feature gets the next priority from the priority sequence, so it will be
     worked on after all other pending features. Also clears the in_progress
     flag so the feature returns to "pending" status.
 
@@ -338,15 +463,11 @@ def feature_skip(
 
         old_priority = feature.priority
 
-        # Use lock to prevent race condition in priority assignment
-        with _priority_lock:
-            # Get max priority and set this feature to max + 1
-            max_priority_result = session.query(Feature.priority).order_by(Feature.priority.desc()).first()
-            new_priority = (max_priority_result[0] + 1) if max_priority_result else 1
-
-            feature.priority = new_priority
-            feature.in_progress = False
-            session.commit()
+        # Allocated in this transaction - unique across every process writing the DB
+        new_priority = allocate_priorities(session)
+        feature.priority = new_priority
+        feature.clear_claim()
+        session.commit()
 
         session.refresh(feature)
 
@@ -365,8 +486,10 @@ def feature_skip(
 
 
 @mcp.tool()
+@_write_tool
 def feature_mark_in_progress(
-    feature_id: Annotated[int, Field(description="The ID of the feature to mark as in-progress", ge=1)]
+    feature_id: Annotated[int, Field(description="The ID of the feature to mark as in-progress", ge=1)],
+    ctx: Context,
 ) -> str:
     """Mark a feature as in-progress.
 
@@ -381,21 +504,18 @@ def feature_mark_in_progress(
     """
     session = get_session()
     try:
-        feature = session.query(Feature).filter(Feature.id == feature_id).first()
+        # Conditional UPDATE: only one concurrent caller can win the claim
+        feature = claim_feature(session, feature_id, _claim_owner(ctx))
+        session.commit()
 
         if feature is None:
-            return json.dumps({"error": f"Feature with ID {feature_id} not found"})
-
-        if feature.passes:
-            return json.dumps({"error": f"Feature with ID {feature_id} is already passing"})
-
-        if feature.in_progress:
+            feature = session.query(Feature).filter(Feature.id == feature_id).first()
+            if feature is None:
+                return json.dumps({"error": f"Feature with ID {feature_id} not found"})
+            if feature.passes:
+                return json.dumps({"error": f"Feature with ID {feature_id} is already passing"})
             return json.dumps({"error": f"Feature with ID {feature_id} is already in-progress"})
 
-        feature.in_progress = True
-        session.commit()
-        session.refresh(feature)
-
         return json.dumps(feature.to_dict())
     except Exception as e:
         session.rollback()
@@ -405,8 +525,10 @@ def feature_mark_in_progress(
 
 
 @mcp.tool()
+@_write_tool
 def feature_claim_and_get(
-    feature_id: Annotated[int, Field(description="The ID of the feature to claim", ge=1)]
+    feature_id: Annotated[int, Field(description="The ID of the feature to claim", ge=1)],
+    ctx: Context,
 ) -> str:
     """Atomically claim a feature (mark in-progress) and return its full details.
 
@@ -421,20 +543,18 @@ def feature_claim_and_get(
     """
     session = get_session()
     try:
-        feature = session.query(Feature).filter(Feature.id == feature_id).first()
+        # Conditional UPDATE: only one concurrent caller can win the claim
+        feature = claim_feature(session, feature_id, _claim_owner(ctx))
+        session.commit()
+        already_claimed = feature is None
 
         if feature is None:
-            return json.dumps({"error": f"Feature with ID {feature_id} not found"})
-
-        if feature.passes:
-            return json.dumps({"error": f"Feature with ID {feature_id} is already passing"})
-
-        # Idempotent: if already in-progress, just return details
-        already_claimed = feature.in_progress
-        if not already_claimed:
-            feature.in_progress = True
-            session.commit()
-            session.refresh(feature)
+            feature = session.query(Feature).filter(Feature.id == feature_id).first()
+            if feature is None:
+                return json.dumps({"error": f"Feature with ID {feature_id} not found"})
+            if feature.passes:
+                return json.dumps({"error": f"Feature with ID {feature_id} is already passing"})
+            # Idempotent: if already in-progress, just return details
 
         result = feature.to_dict()
         result["already_claimed"] = already_claimed
@@ -447,6 +567,36 @@ def feature_claim_and_get(
 
 
 @mcp.tool()
+@_write_tool
+def feature_claim_next(ctx: Context) -> str:
+    """Atomically pick the best ready feature, claim it, and return its details.
+
+    A ready feature is not passing, not in progress, and has all dependencies
+    passing. Claims left behind by crashed sessions (expired leases) are
+    released first. Two agents calling this at the same time never receive
+    the same feature.
+
+    Returns:
+        JSON with the claimed feature's details, or an error if nothing is ready.
+    """
+    session = get_session()
+    try:
+        feature = claim_next_feature(session, _claim_owner(ctx))
+        session.commit()
+
+        if feature is None:
+            return json.dumps({"error": "No ready features to claim"})
+
+        return json.dumps(feature.to_dict())
+    except Exception as e:
+        session.rollback()
+        return json.dumps({"error": f"Failed to claim next feature: {str(e)}"})
+    finally:
+        session.close()
+
+
+@mcp.tool()
+@_write_tool
 def feature_clear_in_progress(
     feature_id: Annotated[int, Field(description="The ID of the feature to clear in-progress status", ge=1)]
 ) -> str:
@@ -468,7 +618,7 @@ def feature_clear_in_progress(
         if feature is None:
             return json.dumps({"error": f"Feature with ID {feature_id} not found"})
 
-        feature.in_progress = False
+        feature.clear_claim()
         session.commit()
         session.refresh(feature)
 
@@ -481,6 +631,7 @@ def feature_clear_in_progress(
 
 
 @mcp.tool()
+@_write_tool
 def feature_create_bulk(
     features: Annotated[list[dict], Field(description="List of features to create, each with category, name, description, and steps")]
 ) -> str:
@@ -504,82 +655,25 @@ def feature_create_bulk(
               Example: [0, 2] means this feature depends on features at index 0 and 2.
 
     Returns:
-        JSON with: created (int) - number of features created, with_dependencies (int)
+        JSON with: created (int) - number of features created, with_dependencies (int),
+        and errors (list of {index, error}) for any features that were rejected.
+        Valid features are created even when others in the batch are rejected.
     """
     session = get_session()
     try:
-        # Use lock to prevent race condition in priority assignment
-        with _priority_lock:
-            # Get the starting priority
-            max_priority_result = session.query(Feature.priority).order_by(Feature.priority.desc()).first()
-            start_priority = (max_priority_result[0] + 1) if max_priority_result else 1
-
-            # First pass: validate all features and their index-based dependencies
-            for i, feature_data in enumerate(features):
-                # Validate required fields
-                if not all(key in feature_data for key in ["category", "name", "description", "steps"]):
-                    return json.dumps({
-                        "error": f"Feature at index {i} missing required fields (category, name, description, steps)"
-                    })
-
-                # Validate depends_on_indices
-                indices = feature_data.get("depends_on_indices", [])
-                if indices:
-                    # Check max dependencies
-                    if len(indices) > MAX_DEPENDENCIES_PER_FEATURE:
-                        return json.dumps({
-                            "error": f"Feature at index {i} has {len(indices)} dependencies, max is {MAX_DEPENDENCIES_PER_FEATURE}"
-                        })
-                    # Check for duplicates
-                    if len(indices) != len(set(indices)):
-                        return json.dumps({
-                            "error": f"Feature at index {i} has duplicate dependencies"
-                        })
-                    # Check for forward references (can only depend on earlier features)
-                    for idx in indices:
-                        if not isinstance(idx, int) or idx < 0:
-                            return json.dumps({
-                                "error": f"Feature at index {i} has invalid dependency index: {idx}"
-                            })
-                        if idx >= i:
-                            return json.dumps({
-                                "error": f"Feature at index {i} cannot depend on feature at index {idx} (forward reference not allowed)"
-                            })
-
-            # Second pass: create all features
-            created_features: list[Feature] = []
-            for i, feature_data in enumerate(features):
-                db_feature = Feature(
-                    priority=start_priority + i,
-                    category=feature_data["category"],
-                    name=feature_data["name"],
-                    description=feature_data["description"],
-                    steps=feature_data["steps"],
-                    passes=False,
-                    in_progress=False,
-                )
-                session.add(db_feature)
-                created_features.append(db_feature)
-
-            # Flush to get IDs assigned
-            session.flush()
-
-            # Third pass: resolve index-based dependencies to actual IDs
-            deps_count = 0
-            for i, feature_data in enumerate(features):
-                indices = feature_data.get("depends_on_indices", [])
-                if indices:
-                    # Convert indices to actual feature IDs
-                    dep_ids = [created_features[idx].id for idx in indices]
-                    created_features[i].dependencies = sorted(dep_ids)
-                    deps_count += 1
-
-            session.commit()
-
-        return json.dumps({
-            "created": len(created_features),
-            "with_dependencies": deps_count
-        })
+        # Only depends_on_indices is accepted here - IDs in 'dependencies' are ignored
+        result = ingest_features(
+            session,
+            [{**f, "dependencies": None} if isinstance(f, dict) else f for f in features],
+        )
+
+        response: dict = {
+            "created": len(result.created),
+            "with_dependencies": result.with_dependencies
+        }
+        if result.errors:
+            response["errors"] = result.errors
+        return json.dumps(response)
     except Exception as e:
         session.rollback()
         return json.dumps({"error": str(e)})
@@ -588,6 +682,7 @@ def feature_create_bulk(
 
 
 @mcp.tool()
+@_write_tool
 def feature_create(
     category: Annotated[str, Field(min_length=1, max_length=100, description="Feature category (e.g., 'Authentication', 'API', 'UI')")],
     name: Annotated[str, Field(min_length=1, max_length=255, description="Feature name")],
@@ -610,23 +705,18 @@ def feature_create(
     """
     session = get_session()
     try:
-        # Use lock to prevent race condition in priority assignment
-        with _priority_lock:
-            # Get the next priority
-            max_priority_result = session.query(Feature.priority).order_by(Feature.priority.desc()).first()
-            next_priority = (max_priority_result[0] + 1) if max_priority_result else 1
-
-            db_feature = Feature(
-                priority=next_priority,
-                category=category,
-                name=name,
-                description=description,
-                steps=steps,
-                passes=False,
-                in_progress=False,
-            )
-            session.add(db_feature)
-            session.commit()
+        # Allocated in this transaction - unique across every process writing the DB
+        db_feature = Feature(
+            priority=allocate_priorities(session),
+            category=category,
+            name=name,
+            description=description,
+            steps=steps,
+            passes=False,
+            in_progress=False,
+        )
+        session.add(db_feature)
+        session.commit()
 
         session.refresh(db_feature)
 
@@ -643,6 +733,7 @@ def feature_create(
 
 
 @mcp.tool()
+@_write_tool
 def feature_add_dependency(
     feature_id: Annotated[int, Field(ge=1, description="Feature to add dependency to")],
     dependency_id: Annotated[int, Field(ge=1, description="ID of the dependency feature")]
@@ -683,11 +774,8 @@ def feature_add_dependency(
         if dependency_id in current_deps:
             return json.dumps({"error": "Dependency already exists"})
 
-        # Security: Circular dependency check
-        # would_create_circular_dependency(features, source_id, target_id)
-        # source_id = feature gaining the dependency, target_id = feature being depended upon
-        all_features = [f.to_dict() for f in session.query(Feature).all()]
-        if would_create_circular_dependency(all_features, feature_id, dependency_id):
+        # Security: Circular dependency check (can dependency_id already reach feature_id?)
+        if would_create_cycle(session, feature_id, [dependency_id]):
             return json.dumps({"error": "Cannot add: would create circular dependency"})
 
         # Add dependency
@@ -708,6 +796,7 @@ def feature_add_dependency(
 
 
 @mcp.tool()
+@_write_tool
 def feature_remove_dependency(
     feature_id: Annotated[int, Field(ge=1, description="Feature to remove dependency from")],
     dependency_id: Annotated[int, Field(ge=1, description="ID of dependency to remove")]
@@ -747,8 +836,22 @@ def feature_remove_dependency(
         session.close()
 
 
+@_write_tool
+def _refresh_scheduling_scores() -> None:
+    """Re-score the graph, queued behind the other writes."""
+    session = get_session()
+    try:
+        if refresh_scheduling_scores(session):
+            session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
 @mcp.tool()
-def feature_get_ready(
+async def feature_get_ready(
     limit: Annotated[int, Field(default=10, ge=1, le=50, description="Max features to return")] = 10
 ) -> str:
     """Get all features ready to start (dependencies satisfied, not in progress).
@@ -764,26 +867,20 @@ def feature_get_ready(
     """
     session = get_session()
     try:
-        all_features = session.query(Feature).all()
-        passing_ids = {f.id for f in all_features if f.passes}
-
-        ready = []
-        all_dicts = [f.to_dict() for f in all_features]
-        for f in all_features:
-            if f.passes or f.in_progress:
-                continue
-            deps = f.dependencies or []
-            if all(dep_id in passing_ids for dep_id in deps):
-                ready.append(f.to_dict())
-
-        # Sort by scheduling score (higher = first), then priority, then id
-        scores = compute_scheduling_scores(all_dicts)
-        ready.sort(key=lambda f: (-scores.get(f["id"], 0), f["priority"], f["id"]))
+        # Scores are only recomputed if the graph changed since they were
+        # last computed. That is a write, so it goes through the write lock
+        # in a worker thread; current scores are a plain read.
+        if scheduling_scores_stale(session):
+            session.rollback()  # End the read transaction before the write
+            await _refresh_scheduling_scores()
+
+        # Top-N straight off the ready-order index (score, then priority, then id)
+        features = [f.to_dict() for f in get_ready_features(session, limit)]
 
         return json.dumps({
-            "features": ready[:limit],
-            "count": len(ready[:limit]),
-            "total_ready": len(ready)
+            "features": features,
+            "count": len(features),
+            "total_ready": count_ready_features(session)
         })
     finally:
         session.close()
@@ -806,25 +903,13 @@ def feature_get_blocked(
     """
     session = get_session()
     try:
-        all_features = session.query(Feature).all()
-        passing_ids = {f.id for f in all_features if f.passes}
-
-        blocked = []
-        for f in all_features:
-            if f.passes:
-                continue
-            deps = f.dependencies or []
-            blocking = [d for d in deps if d not in passing_ids]
-            if blocking:
-                blocked.append({
-                    **f.to_dict(),
-                    "blocked_by": blocking
-                })
+        features, blocking, total = get_blocked_features(session, limit)
+        blocked = [{**data, "blocked_by": blocking.get(data["id"], [])} for data in map(Feature.to_dict, features)]
 
         return json.dumps({
-            "features": blocked[:limit],
-            "count": len(blocked[:limit]),
-            "total_blocked": len(blocked)
+            "features": blocked,
+            "count": len(blocked),
+            "total_blocked": total
         })
     finally:
         session.close()
@@ -838,50 +923,18 @@ def feature_get_graph() -> str:
     Each node includes status: 'pending', 'in_progress', 'done', or 'blocked'.
 
     Returns:
-        JSON with: nodes (list), edges (list of {source, target})
+        JSON with: nodes (list), edges (list of {source, target}),
+        cycles (list of feature ID groups that depend on each other)
     """
     session = get_session()
     try:
-        all_features = session.query(Feature).all()
-        passing_ids = {f.id for f in all_features if f.passes}
-
-        nodes = []
-        edges = []
-
-        for f in all_features:
-            deps = f.dependencies or []
-            blocking = [d for d in deps if d not in passing_ids]
-
-            if f.passes:
-                status = "done"
-            elif blocking:
-                status = "blocked"
-            elif f.in_progress:
-                status = "in_progress"
-            else:
-                status = "pending"
-
-            nodes.append({
-                "id": f.id,
-                "name": f.name,
-                "category": f.category,
-                "status": status,
-                "priority": f.priority,
-                "dependencies": deps
-            })
-
-            for dep_id in deps:
-                edges.append({"source": dep_id, "target": f.id})
-
-        return json.dumps({
-            "nodes": nodes,
-            "edges": edges
-        })
+        return json.dumps(build_dependency_graph(session))
     finally:
         session.close()
 
 
 @mcp.tool()
+@_write_tool
 def feature_set_dependencies(
     feature_id: Annotated[int, Field(ge=1, description="Feature to set dependencies for")],
     dependency_ids: Annotated[list[int], Field(description="List of dependency feature IDs")]
@@ -916,24 +969,14 @@ def feature_set_dependencies(
             return json.dumps({"error": f"Feature {feature_id} not found"})
 
         # Validate all dependencies exist
-        all_feature_ids = {f.id for f in session.query(Feature).all()}
-        missing = [d for d in dependency_ids if d not in all_feature_ids]
+        existing_ids = {fid for (fid,) in session.query(Feature.id).filter(Feature.id.in_(dependency_ids))}
+        missing = [d for d in dependency_ids if d not in existing_ids]
         if missing:
             return json.dumps({"error": f"Dependencies not found: {missing}"})
 
-        # Check for circular dependencies
-        all_features = [f.to_dict() for f in session.query(Feature).all()]
-        # Temporarily update the feature's dependencies for cycle check
-        test_features = []
-        for f in all_features:
-            if f["id"] == feature_id:
-                test_features.append({**f, "dependencies": dependency_ids})
-            else:
-                test_features.append(f)
-
+        # Check for circular dependencies (can any new dependency already reach feature_id?)
         for dep_id in dependency_ids:
-            # source_id = feature_id (gaining dep), target_id = dep_id (being depended upon)
-            if would_create_circular_dependency(test_features, feature_id, dep_id):
+            if would_create_cycle(session, feature_id, [dep_id]):
                 return json.dumps({"error": f"Cannot add dependency {dep_id}: would create circular dependency"})
 
         # Set dependencies
@@ -952,5 +995,51 @@ def feature_set_dependencies(
         session.close()
 
 
+def _require_token(app, token: str):
+    """Wrap an ASGI app so HTTP requests must carry `Authorization: Bearer <token>`."""
+    expected = f"Bearer {token}".encode()
+
+    async def guarded(scope, receive, send):
+        if scope["type"] == "http":
+            headers = dict(scope.get("headers") or [])
+            if not hmac.compare_digest(headers.get(b"authorization", b""), expected):
+                await send({"type": "http.response.start", "status": 401,
+                            "headers": [(b"content-type", b"text/plain")]})
+                await send({"type": "http.response.body", "body": b"Unauthorized"})
+                return
+        await app(scope, receive, send)
+
+    return guarded
+
+
+def run_http_server(host: str, port: int) -> None:
+    """Serve the feature tools over streamable HTTP for all agents of a project."""
+    import uvicorn
+
+    token = os.environ.get("FEATURE_MCP_TOKEN")
+    if not token:
+        sys.exit("FEATURE_MCP_TOKEN must be set when serving over HTTP")
+
+    _init_database()
+    # Per-request INFO logs from every agent's session would flood the orchestrator output
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+    try:
+        uvicorn.run(_require_token(mcp.streamable_http_app(), token), host=host, port=port, log_level="warning")
+    finally:
+        _stop_lease_heartbeat.set()
+        if _engine:
+            _engine.dispose()
+            forget_engine(_engine)
+
+
 if __name__ == "__main__":
-    mcp.run()
+    parser = argparse.ArgumentParser(description="Feature management MCP server")
+    parser.add_argument("--http", action="store_true", help="Serve over streamable HTTP instead of stdio")
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="HTTP port (default: 8765)")
+    args = parser.parse_args()
+
+    if args.http:
+        run_http_server(args.host, args.port)
+    else:
+        mcp.run()
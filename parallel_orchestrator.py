@@ -8,7 +8,8 @@ Unified orchestrator that handles all agent lifecycle:
 - Testing agents: Regression test passing features (optional)
 
 Uses dependency-aware scheduling to ensure features are only started when their
-dependencies are satisfied.
+dependencies are satisfied. Among ready features, the one heading the longest
+remaining chain of work (estimated from recorded attempt durations) starts first.
 
 Usage:
     # Entry point (always uses orchestrator)
@@ -20,17 +21,36 @@ Usage:
 
 import asyncio
 import os
-import subprocess
+import secrets
+import socket
 import sys
 import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Callable, Literal
 
-from api.database import Feature, create_database
-from api.dependency_resolver import are_dependencies_satisfied, compute_scheduling_scores
+from sqlalchemy.orm import lazyload
+
+from admission import AdmissionController, AdmissionLimits, get_max_concurrency, get_max_total_agents
+from api.database import Feature, create_database, get_database_path
+from api.feature_claims import (
+    LEASE_RENEW_INTERVAL,
+    ORCHESTRATOR_CLAIM_OWNER,
+    agent_claim_owner,
+    claim_feature,
+    release_claim,
+    release_expired_leases,
+    release_owner_claims,
+    renew_leases,
+    take_over_claim,
+)
+from api.feature_durations import estimate_remaining_durations, record_attempt
+from api.feature_graph import FeatureGraph
+from api.sqlite_profile import forget_engine, get_lock_wait_stats, start_wal_checkpointer
 from progress import has_features
-from server.utils.process_utils import kill_process_tree
+from server.utils.process_utils import kill_process_tree_async
+from worker_pool import WORKER_MARKER_PREFIX, AgentWorker, WorkerPool, parse_done_marker
 
 # Root directory of autocoder (where this script and autonomous_agent_demo.py live)
 AUTOCODER_ROOT = Path(__file__).parent.resolve()
@@ -82,7 +102,8 @@ debug_log = DebugLogger()
 def _dump_database_state(session, label: str = ""):
     """Helper to dump full database state to debug log."""
     from api.database import Feature
-    all_features = session.query(Feature).all()
+    # Status columns only; description/steps (feature_content) stay unloaded
+    all_features = session.query(Feature).options(lazyload(Feature.content)).all()
 
     passing = [f for f in all_features if f.passes]
     in_progress = [f for f in all_features if f.in_progress and not f.passes]
@@ -100,11 +121,16 @@ def _dump_database_state(session, label: str = ""):
 # =============================================================================
 # Process Limits
 # =============================================================================
-# These constants bound the number of concurrent agent processes to prevent
-# resource exhaustion (memory, CPU, API rate limits).
+# These ceilings bound the number of concurrent agent processes to prevent
+# resource exhaustion (memory, CPU, API rate limits). They are configurable
+# (see admission.py) so large build hosts can run more agents.
 #
-# MAX_PARALLEL_AGENTS: Max concurrent coding agents (each is a Claude session)
-# MAX_TOTAL_AGENTS: Hard limit on total child processes (coding + testing)
+# MAX_PARALLEL_AGENTS: Max concurrent coding agents (AUTOCODER_MAX_CONCURRENCY, default 5)
+# MAX_TOTAL_AGENTS: Max total child processes (AUTOCODER_MAX_TOTAL_AGENTS, default 2x)
+#
+# Within these ceilings an AdmissionController sizes the coding and testing
+# pools from live host signals before each spawn, and backs off (testing pool
+# first) when memory or CPU is under pressure.
 #
 # Expected process count during normal operation:
 #   - 1 orchestrator process (this script)
@@ -118,21 +144,63 @@ def _dump_database_state(session, label: str = ""):
 #   3. During run: count should never exceed baseline + 11 (1 orchestrator + 10 agents)
 #   4. After stop: should return to baseline
 # =============================================================================
-MAX_PARALLEL_AGENTS = 5
-MAX_TOTAL_AGENTS = 10
+MAX_PARALLEL_AGENTS = get_max_concurrency()
+MAX_TOTAL_AGENTS = get_max_total_agents()
 DEFAULT_CONCURRENCY = 3
 POLL_INTERVAL = 5  # seconds between checking for ready features
 MAX_FEATURE_RETRIES = 3  # Maximum times to retry a failed feature
 INITIALIZER_TIMEOUT = 1800  # 30 minutes timeout for initializer
+# Max bytes buffered for a single line of agent output (asyncio's default is 64 KiB,
+# which a large tool result printed on one line can exceed)
+OUTPUT_LINE_LIMIT = 1024 * 1024
+# How long the shared feature MCP server gets to start accepting connections
+FEATURE_SERVER_STARTUP_TIMEOUT = 15.0
+# Pause after starting agents before the next loop iteration
+SPAWN_PAUSE = 2
+
+
+# Scheduling policy, shared with the offline simulator (simulate_orchestrator.py)
+
+def rank_features(
+    features: list[dict],
+    critical_paths: dict[int, float],
+    score: Callable[[int], float],
+) -> list[dict]:
+    """Order features for starting.
+
+    Longest critical path first, so the chains that bound the project's
+    completion time start early; then scheduling score (higher first),
+    priority and id.
+    """
+    return sorted(
+        features,
+        key=lambda f: (-critical_paths.get(f["id"], 0.0), -score(f["id"]), f["priority"], f["id"]),
+    )
+
+
+def coding_capacity(limits: AdmissionLimits, coding: int, testing: int) -> int:
+    """Coding agents allowed to run, given the running coding and testing agents.
+
+    Bounded by the coding pool and by what the total agent limit leaves over.
+    """
+    return min(limits.coding, coding + max(0, limits.total - coding - testing))
+
+
+def _find_free_port() -> int:
+    """Ask the OS for an unused localhost port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
 
 
 class ParallelOrchestrator:
     """Orchestrates parallel execution of independent features.
 
     Process bounds:
-    - Up to MAX_PARALLEL_AGENTS (5) coding agents concurrently
+    - Up to MAX_PARALLEL_AGENTS coding agents concurrently
     - Up to max_concurrency testing agents concurrently
-    - Hard limit of MAX_TOTAL_AGENTS (10) total child processes
+    - Hard limit of MAX_TOTAL_AGENTS total child processes
+    - Within those, pool sizes follow host load (see AdmissionController)
     """
 
     def __init__(
@@ -149,8 +217,8 @@ class ParallelOrchestrator:
 
         Args:
             project_dir: Path to the project directory
-            max_concurrency: Maximum number of concurrent coding agents (1-5).
-                Also caps testing agents at the same limit.
+            max_concurrency: Maximum number of concurrent coding agents
+                (1-MAX_PARALLEL_AGENTS). Also caps testing agents at the same limit.
             model: Claude model to use (or None for default)
             yolo_mode: Whether to run in YOLO mode (skip testing agents entirely)
             testing_agent_ratio: Number of regression testing agents to maintain (0-3).
@@ -169,9 +237,9 @@ class ParallelOrchestrator:
         # Thread-safe state
         self._lock = threading.Lock()
         # Coding agents: feature_id -> process
-        self.running_coding_agents: dict[int, subprocess.Popen] = {}
+        self.running_coding_agents: dict[int, asyncio.subprocess.Process] = {}
         # Testing agents: feature_id -> process (feature being tested)
-        self.running_testing_agents: dict[int, subprocess.Popen] = {}
+        self.running_testing_agents: dict[int, asyncio.subprocess.Process] = {}
         # Legacy alias for backward compatibility
         self.running_agents = self.running_coding_agents
         self.abort_events: dict[int, threading.Event] = {}
@@ -180,6 +248,24 @@ class ParallelOrchestrator:
         # Track feature failures to prevent infinite retry loops
         self._failure_counts: dict[int, int] = {}
 
+        # Running coding agents: feature_id -> (wall-clock, monotonic) start,
+        # recorded as an attempt when the agent exits
+        self._attempt_starts: dict[int, tuple[datetime, float]] = {}
+        self._attempts_recorded = 0
+        # Critical path per feature, cached under (graph generation, attempts recorded)
+        self._critical_paths: dict[int, float] = {}
+        self._critical_paths_key: tuple[int, int] | None = None
+
+        # Monotonic time of the last lease renewal (see _maintain_leases)
+        self._leases_renewed_at = 0.0
+
+        # Sizes the coding/testing pools from host signals within the ceilings
+        self._admission = AdmissionController(
+            max_coding=self.max_concurrency,
+            max_testing=self.max_concurrency,
+            max_total=MAX_TOTAL_AGENTS,
+        )
+
         # Session tracking for logging/debugging
         self.session_start_time: datetime = None
 
@@ -187,10 +273,45 @@ class ParallelOrchestrator:
         # immediately instead of waiting for the full POLL_INTERVAL timeout.
         # This reduces latency when spawning the next feature after completion.
         self._agent_completed_event: asyncio.Event = None  # Created in run_loop
-        self._event_loop: asyncio.AbstractEventLoop = None  # Stored for thread-safe signaling
+
+        # Warm agent worker processes, reused across feature assignments so the
+        # per-agent interpreter start and imports are paid once per worker
+        self._worker_pool = WorkerPool(
+            self._spawn_worker,
+            max_idle=self.max_concurrency + (0 if yolo_mode else self.testing_agent_ratio),
+            on_exit=self._on_worker_exit,
+        )
+
+        self._prewarm_task: asyncio.Task | None = None
+
+        # Shared feature MCP server for all agents of this project, and the
+        # environment that points agents at it (empty = per-session servers)
+        self._feature_server: asyncio.subprocess.Process | None = None
+        self._feature_server_reader: asyncio.Task | None = None
+        self._agent_env: dict[str, str] = {}
+
+        # Output reader tasks (one per agent, all multiplexed on the event loop).
+        # Held here so they aren't garbage collected while running.
+        self._reader_tasks: set[asyncio.Task] = set()
 
         # Database session for this orchestrator
         self._engine, self._session_maker = create_database(project_dir)
+        # Checkpoint the shared WAL while agents are idle, off their write path
+        self._checkpointer = start_wal_checkpointer(self._engine, get_database_path(project_dir))
+
+        # In-memory feature graph: loaded once, then refreshed with row-level deltas
+        # so scheduling queries don't re-read and re-score the whole backlog.
+        self._feature_graph = FeatureGraph(self._engine)
+
+    def _admission_limits(self) -> AdmissionLimits:
+        """Current pool sizes from the admission controller.
+
+        Must be called without holding self._lock (it samples the host).
+        """
+        with self._lock:
+            coding_pids = [proc.pid for proc in self.running_coding_agents.values()]
+            testing_pids = [proc.pid for proc in self.running_testing_agents.values()]
+        return self._admission.limits(coding_pids, testing_pids)
 
     def get_session(self):
         """Get a new database session."""
@@ -212,6 +333,7 @@ class ParallelOrchestrator:
             # Multiple testing agents can test the same feature - that's fine
             feature = (
                 session.query(Feature)
+                .options(lazyload(Feature.content))
                 .filter(Feature.passes == True)
                 .filter(Feature.in_progress == False)  # Don't test while coding
                 .order_by(func.random())
@@ -221,6 +343,24 @@ class ParallelOrchestrator:
         finally:
             session.close()
 
+    def _get_critical_paths(self) -> dict[int, float]:
+        """Longest remaining path (estimated agent seconds) from each feature.
+
+        Recomputed only when the graph changed or an attempt was recorded
+        since the last call; call after refreshing the feature graph.
+        """
+        graph = self._feature_graph
+        key = (graph.generation, self._attempts_recorded)
+        if key != self._critical_paths_key:
+            session = self.get_session()
+            try:
+                durations = estimate_remaining_durations(session)
+            finally:
+                session.close()
+            self._critical_paths = graph.critical_paths(durations)
+            self._critical_paths_key = key
+        return self._critical_paths
+
     def get_resumable_features(self) -> list[dict]:
         """Get features that were left in_progress from a previous session.
 
@@ -228,156 +368,163 @@ class ParallelOrchestrator:
         not currently being worked on by this orchestrator. This handles the case
         where a previous session was interrupted before completing the feature.
         """
-        session = self.get_session()
-        try:
-            # Force fresh read from database to avoid stale cached data
-            # This is critical when agent subprocesses have committed changes
-            session.expire_all()
+        # Pick up any commits from agent subprocesses before deciding
+        graph = self._feature_graph
+        graph.refresh()
 
-            # Find features that are in_progress but not complete
-            stale = session.query(Feature).filter(
-                Feature.in_progress == True,
-                Feature.passes == False
-            ).all()
-
-            resumable = []
-            for f in stale:
-                # Skip if already running in this orchestrator instance
-                with self._lock:
-                    if f.id in self.running_coding_agents:
-                        continue
-                # Skip if feature has failed too many times
-                if self._failure_counts.get(f.id, 0) >= MAX_FEATURE_RETRIES:
-                    continue
-                resumable.append(f.to_dict())
+        with self._lock:
+            running_ids = set(self.running_coding_agents)
 
-            # Sort by scheduling score (higher = first), then priority, then id
-            all_dicts = [f.to_dict() for f in session.query(Feature).all()]
-            scores = compute_scheduling_scores(all_dicts)
-            resumable.sort(key=lambda f: (-scores.get(f["id"], 0), f["priority"], f["id"]))
-            return resumable
+        # Features under a live lease held by someone else (e.g. an agent that
+        # claimed via feature_claim_next) are not ours to resume. Such a lease
+        # is only renewed while the agent's session is connected, and our own
+        # workers' agent claims are released when the worker exits.
+        session = self.get_session()
+        try:
+            foreign_ids = {
+                fid for (fid,) in session.query(Feature.id).filter(
+                    Feature.in_progress == True,
+                    Feature.lease_expires_at > datetime.now(timezone.utc),
+                    Feature.claimed_by != ORCHESTRATOR_CLAIM_OWNER,
+                )
+            }
         finally:
             session.close()
 
-    def get_ready_features(self) -> list[dict]:
-        """Get features with satisfied dependencies, not already running."""
-        session = self.get_session()
-        try:
-            # Force fresh read from database to avoid stale cached data
-            # This is critical when agent subprocesses have committed changes
-            session.expire_all()
+        resumable: list[dict] = []
+        for fid in graph.in_progress_ids():
+            # Skip if already running in this orchestrator instance
+            if fid in running_ids or fid in foreign_ids:
+                continue
+            # Skip if feature has failed too many times
+            if self._failure_counts.get(fid, 0) >= MAX_FEATURE_RETRIES:
+                continue
+            feature = graph.get(fid)
+            if feature is not None:
+                resumable.append(feature)
 
-            all_features = session.query(Feature).all()
-            all_dicts = [f.to_dict() for f in all_features]
+        return rank_features(resumable, self._get_critical_paths(), graph.score)
 
-            # Pre-compute passing_ids once to avoid O(n^2) in the loop
-            passing_ids = {f.id for f in all_features if f.passes}
+    def get_ready_features(self) -> list[dict]:
+        """Get features with satisfied dependencies, not already running."""
+        # Pick up any commits from agent subprocesses before deciding
+        graph = self._feature_graph
+        graph.refresh()
 
-            ready = []
-            skipped_reasons = {"passes": 0, "in_progress": 0, "running": 0, "failed": 0, "deps": 0}
-            for f in all_features:
-                if f.passes:
-                    skipped_reasons["passes"] += 1
-                    continue
-                if f.in_progress:
-                    skipped_reasons["in_progress"] += 1
-                    continue
-                # Skip if already running in this orchestrator
-                with self._lock:
-                    if f.id in self.running_coding_agents:
-                        skipped_reasons["running"] += 1
-                        continue
-                # Skip if feature has failed too many times
-                if self._failure_counts.get(f.id, 0) >= MAX_FEATURE_RETRIES:
-                    skipped_reasons["failed"] += 1
-                    continue
-                # Check dependencies (pass pre-computed passing_ids)
-                if are_dependencies_satisfied(f.to_dict(), all_dicts, passing_ids):
-                    ready.append(f.to_dict())
-                else:
-                    skipped_reasons["deps"] += 1
-
-            # Sort by scheduling score (higher = first), then priority, then id
-            scores = compute_scheduling_scores(all_dicts)
-            ready.sort(key=lambda f: (-scores.get(f["id"], 0), f["priority"], f["id"]))
-
-            # Debug logging
-            passing = sum(1 for f in all_features if f.passes)
-            in_progress = sum(1 for f in all_features if f.in_progress and not f.passes)
-            print(
-                f"[DEBUG] get_ready_features: {len(ready)} ready, "
-                f"{passing} passing, {in_progress} in_progress, {len(all_features)} total",
-                flush=True
-            )
-            print(
-                f"[DEBUG]   Skipped: {skipped_reasons['passes']} passing, {skipped_reasons['in_progress']} in_progress, "
-                f"{skipped_reasons['running']} running, {skipped_reasons['failed']} failed, {skipped_reasons['deps']} blocked by deps",
-                flush=True
-            )
+        with self._lock:
+            running_ids = set(self.running_coding_agents)
+
+        ready: list[dict] = []
+        skipped_reasons = {"running": 0, "failed": 0}
+        for fid in graph.ready_ids():
+            # Skip if already running in this orchestrator
+            if fid in running_ids:
+                skipped_reasons["running"] += 1
+                continue
+            # Skip if feature has failed too many times
+            if self._failure_counts.get(fid, 0) >= MAX_FEATURE_RETRIES:
+                skipped_reasons["failed"] += 1
+                continue
+            feature = graph.get(fid)
+            if feature is not None:
+                ready.append(feature)
+
+        ready = rank_features(ready, self._get_critical_paths(), graph.score)
+
+        # Debug logging
+        passing = len(graph.passing_ids())
+        in_progress = len(graph.in_progress_ids())
+        total = graph.count()
+        skipped_reasons["passes"] = passing
+        skipped_reasons["in_progress"] = in_progress
+        skipped_reasons["deps"] = len(graph.blocked_ids())
+        print(
+            f"[DEBUG] get_ready_features: {len(ready)} ready, "
+            f"{passing} passing, {in_progress} in_progress, {total} total",
+            flush=True
+        )
+        print(
+            f"[DEBUG]   Skipped: {skipped_reasons['passes']} passing, {skipped_reasons['in_progress']} in_progress, "
+            f"{skipped_reasons['running']} running, {skipped_reasons['failed']} failed, {skipped_reasons['deps']} blocked by deps",
+            flush=True
+        )
 
-            # Log to debug file (but not every call to avoid spam)
-            debug_log.log("READY", "get_ready_features() called",
-                ready_count=len(ready),
-                ready_ids=[f['id'] for f in ready[:5]],  # First 5 only
-                passing=passing,
-                in_progress=in_progress,
-                total=len(all_features),
-                skipped=skipped_reasons)
+        # Log to debug file (but not every call to avoid spam)
+        debug_log.log("READY", "get_ready_features() called",
+            ready_count=len(ready),
+            ready_ids=[f['id'] for f in ready[:5]],  # First 5 only
+            passing=passing,
+            in_progress=in_progress,
+            total=total,
+            skipped=skipped_reasons)
 
-            return ready
-        finally:
-            session.close()
+        return ready
 
     def get_all_complete(self) -> bool:
         """Check if all features are complete or permanently failed.
 
         Returns False if there are no features (initialization needed).
         """
-        session = self.get_session()
-        try:
-            # Force fresh read from database to avoid stale cached data
-            # This is critical when agent subprocesses have committed changes
-            session.expire_all()
+        graph = self._feature_graph
+        graph.refresh()
 
-            all_features = session.query(Feature).all()
-
-            # No features = NOT complete, need initialization
-            if len(all_features) == 0:
-                return False
-
-            passing_count = 0
-            failed_count = 0
-            pending_count = 0
-            for f in all_features:
-                if f.passes:
-                    passing_count += 1
-                    continue  # Completed successfully
-                if self._failure_counts.get(f.id, 0) >= MAX_FEATURE_RETRIES:
-                    failed_count += 1
-                    continue  # Permanently failed, count as "done"
-                pending_count += 1
-
-            total = len(all_features)
-            is_complete = pending_count == 0
-            print(
-                f"[DEBUG] get_all_complete: {passing_count}/{total} passing, "
-                f"{failed_count} failed, {pending_count} pending -> {is_complete}",
-                flush=True
-            )
-            return is_complete
-        finally:
-            session.close()
+        total = graph.count()
+
+        # No features = NOT complete, need initialization
+        if total == 0:
+            return False
+
+        pending = graph.pending_ids()
+        failed_count = sum(
+            1 for fid in pending if self._failure_counts.get(fid, 0) >= MAX_FEATURE_RETRIES
+        )
+        passing_count = total - len(pending)
+        pending_count = len(pending) - failed_count
+
+        is_complete = pending_count == 0
+        print(
+            f"[DEBUG] get_all_complete: {passing_count}/{total} passing, "
+            f"{failed_count} failed, {pending_count} pending -> {is_complete}",
+            flush=True
+        )
+        return is_complete
 
     def get_passing_count(self) -> int:
         """Get the number of passing features."""
+        self._feature_graph.refresh()
+        return len(self._feature_graph.passing_ids())
+
+    def _maintain_leases(self) -> None:
+        """Release expired feature leases and renew those of running coding agents.
+
+        Renewal is throttled to LEASE_RENEW_INTERVAL; the expiry sweep is an
+        index range scan on lease_expires_at, so it runs every iteration.
+        """
+        now = time.monotonic()
+        with self._lock:
+            running_ids = list(self.running_coding_agents)
+        renew = bool(running_ids) and now - self._leases_renewed_at >= LEASE_RENEW_INTERVAL
+
         session = self.get_session()
         try:
-            session.expire_all()
-            return session.query(Feature).filter(Feature.passes == True).count()
+            if renew:
+                renew_leases(session, running_ids)
+                self._leases_renewed_at = now
+            released = release_expired_leases(session)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            debug_log.log("LEASE", f"Lease maintenance failed: {e}")
+            return
         finally:
             session.close()
 
-    def _maintain_testing_agents(self) -> None:
+        if released:
+            self._feature_graph.refresh()
+            print(f"Released expired claims on features {released}", flush=True)
+            debug_log.log("LEASE", "Released expired leases", feature_ids=released)
+
+    async def _maintain_testing_agents(self) -> None:
         """Maintain the desired count of testing agents independently.
 
         This runs every loop iteration and spawns testing agents as needed to maintain
@@ -408,6 +555,8 @@ class ParallelOrchestrator:
         # Spawn testing agents one at a time, re-checking limits each time
         # This avoids TOCTOU race by holding lock during the decision
         while True:
+            limits = self._admission_limits()
+
             # Check limits and decide whether to spawn (atomically)
             with self._lock:
                 current_testing = len(self.running_testing_agents)
@@ -418,8 +567,12 @@ class ParallelOrchestrator:
                 if current_testing >= desired:
                     return  # Already at desired count
 
-                # Check hard limit on total agents
-                if total_agents >= MAX_TOTAL_AGENTS:
+                # Testing pool shrinks first under host pressure
+                if current_testing >= limits.testing:
+                    return
+
+                # Check limit on total agents
+                if total_agents >= limits.total:
                     return  # At max total agents
 
                 # We're going to spawn - log while still holding lock
@@ -429,9 +582,9 @@ class ParallelOrchestrator:
 
             # Spawn outside lock (I/O bound operation)
             print(f"[DEBUG] Spawning testing agent ({spawn_index}/{desired})", flush=True)
-            self._spawn_testing_agent()
+            await self._spawn_testing_agent()
 
-    def start_feature(self, feature_id: int, resume: bool = False) -> tuple[bool, str]:
+    async def start_feature(self, feature_id: int, resume: bool = False) -> tuple[bool, str]:
         """Start a single coding agent for a feature.
 
         Args:
@@ -441,40 +594,41 @@ class ParallelOrchestrator:
         Returns:
             Tuple of (success, message)
         """
+        limits = self._admission_limits()
         with self._lock:
             if feature_id in self.running_coding_agents:
                 return False, "Feature already running"
-            if len(self.running_coding_agents) >= self.max_concurrency:
-                return False, "At max concurrency"
-            # Enforce hard limit on total agents (coding + testing)
+            if len(self.running_coding_agents) >= limits.coding:
+                return False, f"At max concurrency ({limits.coding}, {limits.reason})"
+            # Enforce limit on total agents (coding + testing)
             total_agents = len(self.running_coding_agents) + len(self.running_testing_agents)
-            if total_agents >= MAX_TOTAL_AGENTS:
-                return False, f"At max total agents ({total_agents}/{MAX_TOTAL_AGENTS})"
+            if total_agents >= limits.total:
+                return False, f"At max total agents ({total_agents}/{limits.total}, {limits.reason})"
 
-        # Mark as in_progress in database (or verify it's resumable)
+        # Claim the feature in the database (or take over its stale claim when
+        # resuming). The conditional UPDATE means a concurrent claim can't also win.
         session = self.get_session()
         try:
-            feature = session.query(Feature).filter(Feature.id == feature_id).first()
-            if not feature:
-                return False, "Feature not found"
-            if feature.passes:
-                return False, "Feature already complete"
-
             if resume:
-                # Resuming: feature should already be in_progress
-                if not feature.in_progress:
-                    return False, "Feature not in progress, cannot resume"
+                claimed = take_over_claim(session, feature_id, ORCHESTRATOR_CLAIM_OWNER)
             else:
-                # Starting fresh: feature should not be in_progress
-                if feature.in_progress:
-                    return False, "Feature already in progress"
-                feature.in_progress = True
-                session.commit()
+                claimed = claim_feature(session, feature_id, ORCHESTRATOR_CLAIM_OWNER)
+            if claimed is None:
+                session.rollback()
+                feature = session.query(Feature).filter(Feature.id == feature_id).first()
+                if not feature:
+                    return False, "Feature not found"
+                if feature.passes:
+                    return False, "Feature already complete"
+                if resume and not feature.in_progress:
+                    return False, "Feature not in progress, cannot resume"
+                return False, "Feature already in progress"
+            session.commit()
         finally:
             session.close()
 
         # Start coding agent subprocess
-        success, message = self._spawn_coding_agent(feature_id)
+        success, message = await self._spawn_coding_agent(feature_id)
         if not success:
             return False, message
 
@@ -483,43 +637,177 @@ class ParallelOrchestrator:
 
         return True, f"Started feature {feature_id}"
 
-    def _spawn_coding_agent(self, feature_id: int) -> tuple[bool, str]:
-        """Spawn a coding agent subprocess for a specific feature."""
-        # Create abort event
-        abort_event = threading.Event()
+    async def _spawn_agent_process(self, cmd: list[str], stdin=None) -> asyncio.subprocess.Process:
+        """Start an agent subprocess with stdout+stderr piped to a stream reader."""
+        return await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=stdin,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=str(AUTOCODER_ROOT),
+            env={**os.environ, **self._agent_env, "PYTHONUNBUFFERED": "1"},
+            limit=OUTPUT_LINE_LIMIT,
+        )
+
+    async def _start_feature_server(self) -> None:
+        """Start one feature MCP server for all agents of this project.
+
+        Agents then connect over localhost HTTP instead of each spawning its
+        own server process with its own database connections. If the server
+        does not come up, agents fall back to per-session stdio servers.
+        """
+        port = _find_free_port()
+        token = secrets.token_urlsafe(32)
+        cmd = [sys.executable, "-u", "-m", "mcp_server.feature_mcp", "--http", "--port", str(port)]
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                cwd=str(AUTOCODER_ROOT),
+                env={
+                    **os.environ,
+                    "PROJECT_DIR": str(self.project_dir.resolve()),
+                    "FEATURE_MCP_TOKEN": token,
+                    "PYTHONUNBUFFERED": "1",
+                },
+                limit=OUTPUT_LINE_LIMIT,
+            )
+        except Exception as e:
+            print(f"Could not start shared feature MCP server: {e}", flush=True)
+            return
+
+        async def forward_output():
+            async for line in self._iter_lines(proc):
+                print(f"[Features MCP] {line}", flush=True)
+
+        self._feature_server = proc
+        self._feature_server_reader = asyncio.create_task(forward_output())
+
+        deadline = asyncio.get_running_loop().time() + FEATURE_SERVER_STARTUP_TIMEOUT
+        while proc.returncode is None and asyncio.get_running_loop().time() < deadline:
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+            except OSError:
+                await asyncio.sleep(0.1)
+                continue
+            writer.close()
+            # Read by client.get_feature_mcp_config() in every agent
+            self._agent_env = {
+                "AUTOCODER_FEATURE_MCP_URL": f"http://127.0.0.1:{port}/mcp",
+                "AUTOCODER_FEATURE_MCP_TOKEN": token,
+            }
+            print(f"Shared feature MCP server listening on port {port} (PID {proc.pid})", flush=True)
+            debug_log.log("MCP", "Shared feature MCP server started", pid=proc.pid, port=port)
+            return
+
+        print("Shared feature MCP server did not start - agents will use their own", flush=True)
+        debug_log.log("MCP", "Shared feature MCP server failed to start", returncode=proc.returncode)
+        await self._stop_feature_server()
+
+    async def _check_feature_server(self) -> None:
+        """Restart the shared feature MCP server if it exited.
 
-        # Start subprocess for this feature
+        Workers pinned the server's URL in their environment when they were
+        started, so they are recycled too; otherwise every later session
+        would run without feature tools.
+        """
+        proc = self._feature_server
+        if proc is None or proc.returncode is None:
+            return
+        print(f"Shared feature MCP server exited (code {proc.returncode}) - restarting", flush=True)
+        debug_log.log("MCP", "Shared feature MCP server exited", pid=proc.pid, returncode=proc.returncode)
+        await self._stop_feature_server()
+        await self._worker_pool.recycle()
+        await self._start_feature_server()
+
+    async def _stop_feature_server(self) -> None:
+        """Stop the shared feature MCP server, if running."""
+        proc, self._feature_server = self._feature_server, None
+        self._agent_env = {}
+        if proc is not None and proc.returncode is None:
+            await kill_process_tree_async(proc, timeout=5.0)
+
+    async def _spawn_worker(self) -> asyncio.subprocess.Process:
+        """Start a warm agent worker that takes assignments on stdin."""
         cmd = [
             sys.executable,
             "-u",  # Force unbuffered stdout/stderr
             str(AUTOCODER_ROOT / "autonomous_agent_demo.py"),
             "--project-dir", str(self.project_dir),
-            "--max-iterations", "1",
-            "--agent-type", "coding",
-            "--feature-id", str(feature_id),
+            "--worker",
         ]
         if self.model:
             cmd.extend(["--model", self.model])
         if self.yolo_mode:
             cmd.append("--yolo")
+        proc = await self._spawn_agent_process(cmd, stdin=asyncio.subprocess.PIPE)
+        debug_log.log("POOL", "Started agent worker", pid=proc.pid)
+        return proc
 
+    def _on_worker_exit(self, worker: AgentWorker) -> None:
+        """Release the claims the worker's agents took through the feature tools.
+
+        Their sessions ended with the process, so nothing renews the leases;
+        releasing them now returns the features to the ready pool without
+        waiting for the leases to expire.
+        """
+        session = self.get_session()
         try:
-            proc = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                cwd=str(AUTOCODER_ROOT),
-                env={**os.environ, "PYTHONUNBUFFERED": "1"},
-            )
+            released = release_owner_claims(session, agent_claim_owner(str(worker.pid)))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            debug_log.log("LEASE", f"Releasing claims of worker {worker.pid} failed: {e}")
+            return
+        finally:
+            session.close()
+
+        if released:
+            self._feature_graph.refresh()
+            print(f"Released claims of exited agent worker {worker.pid} on features {released}", flush=True)
+            debug_log.log("LEASE", "Released exited worker's claims", pid=worker.pid, feature_ids=released)
+
+    async def _assign_worker(self, assignment: dict) -> AgentWorker:
+        """Hand an assignment to a warm worker (starting one if none is idle)."""
+        worker = await self._worker_pool.acquire()
+        try:
+            await worker.assign(assignment)
+        except (ConnectionError, OSError):
+            # Worker died while idle - discard it and use a fresh one
+            await self._worker_pool.release(worker)
+            worker = await self._worker_pool.start_worker()
+            await worker.assign(assignment)
+        return worker
+
+    def _start_reader(
+        self,
+        feature_id: int,
+        proc: asyncio.subprocess.Process,
+        abort: threading.Event,
+        agent_type: Literal["coding", "testing"],
+        worker: AgentWorker | None = None,
+    ) -> None:
+        """Start the output reader task for an agent process."""
+        task = asyncio.create_task(self._read_output(feature_id, proc, abort, agent_type, worker))
+        self._reader_tasks.add(task)
+        task.add_done_callback(self._reader_tasks.discard)
+
+    async def _spawn_coding_agent(self, feature_id: int) -> tuple[bool, str]:
+        """Spawn a coding agent subprocess for a specific feature."""
+        # Create abort event
+        abort_event = threading.Event()
+
+        # Hand the feature to a warm worker process
+        try:
+            worker = await self._assign_worker({"agent_type": "coding", "feature_id": feature_id})
+            proc = worker.proc
         except Exception as e:
-            # Reset in_progress on failure
+            # Release the claim on failure
             session = self.get_session()
             try:
-                feature = session.query(Feature).filter(Feature.id == feature_id).first()
-                if feature:
-                    feature.in_progress = False
-                    session.commit()
+                release_claim(session, feature_id, ORCHESTRATOR_CLAIM_OWNER)
+                session.commit()
             finally:
                 session.close()
             return False, f"Failed to start agent: {e}"
@@ -527,13 +815,10 @@ class ParallelOrchestrator:
         with self._lock:
             self.running_coding_agents[feature_id] = proc
             self.abort_events[feature_id] = abort_event
+            self._attempt_starts[feature_id] = (datetime.now(timezone.utc), time.monotonic())
 
-        # Start output reader thread
-        threading.Thread(
-            target=self._read_output,
-            args=(feature_id, proc, abort_event, "coding"),
-            daemon=True
-        ).start()
+        # Start output reader task
+        self._start_reader(feature_id, proc, abort_event, "coding", worker)
 
         if self.on_status:
             self.on_status(feature_id, "running")
@@ -541,7 +826,7 @@ class ParallelOrchestrator:
         print(f"Started coding agent for feature #{feature_id}", flush=True)
         return True, f"Started feature {feature_id}"
 
-    def _spawn_testing_agent(self) -> tuple[bool, str]:
+    async def _spawn_testing_agent(self) -> tuple[bool, str]:
         """Spawn a testing agent subprocess for regression testing.
 
         Picks a random passing feature to test. Multiple testing agents can test
@@ -549,14 +834,17 @@ class ParallelOrchestrator:
         architecture by removing claim coordination.
         """
         # Check limits first (under lock)
+        limits = self._admission_limits()
         with self._lock:
             current_testing_count = len(self.running_testing_agents)
-            if current_testing_count >= self.max_concurrency:
-                debug_log.log("TESTING", f"Skipped spawn - at max testing agents ({current_testing_count}/{self.max_concurrency})")
+            if current_testing_count >= limits.testing:
+                debug_log.log("TESTING", f"Skipped spawn - at max testing agents ({current_testing_count}/{limits.testing})",
+                    reason=limits.reason)
                 return False, f"At max testing agents ({current_testing_count})"
             total_agents = len(self.running_coding_agents) + len(self.running_testing_agents)
-            if total_agents >= MAX_TOTAL_AGENTS:
-                debug_log.log("TESTING", f"Skipped spawn - at max total agents ({total_agents}/{MAX_TOTAL_AGENTS})")
+            if total_agents >= limits.total:
+                debug_log.log("TESTING", f"Skipped spawn - at max total agents ({total_agents}/{limits.total})",
+                    reason=limits.reason)
                 return False, f"At max total agents ({total_agents})"
 
         # Pick a random passing feature (no claim needed - concurrent testing is fine)
@@ -569,46 +857,28 @@ class ParallelOrchestrator:
 
         # Spawn the testing agent
         with self._lock:
-            # Re-check limits in case another thread spawned while we were selecting
+            # Re-check limits in case another agent was registered while we were selecting
             current_testing_count = len(self.running_testing_agents)
-            if current_testing_count >= self.max_concurrency:
+            if current_testing_count >= limits.testing:
                 return False, f"At max testing agents ({current_testing_count})"
 
-            cmd = [
-                sys.executable,
-                "-u",
-                str(AUTOCODER_ROOT / "autonomous_agent_demo.py"),
-                "--project-dir", str(self.project_dir),
-                "--max-iterations", "1",
-                "--agent-type", "testing",
-                "--testing-feature-id", str(feature_id),
-            ]
-            if self.model:
-                cmd.extend(["--model", self.model])
-
-            try:
-                proc = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    cwd=str(AUTOCODER_ROOT),
-                    env={**os.environ, "PYTHONUNBUFFERED": "1"},
-                )
-            except Exception as e:
-                debug_log.log("TESTING", f"FAILED to spawn testing agent: {e}")
-                return False, f"Failed to start testing agent: {e}"
+        # Spawning is awaited outside the lock: a threading.Lock held across an
+        # await would block the event loop for anyone else trying to take it.
+        # All spawns run on the orchestrator loop, so they cannot interleave.
+        try:
+            worker = await self._assign_worker({"agent_type": "testing", "testing_feature_id": feature_id})
+            proc = worker.proc
+        except Exception as e:
+            debug_log.log("TESTING", f"FAILED to spawn testing agent: {e}")
+            return False, f"Failed to start testing agent: {e}"
 
+        with self._lock:
             # Register process with feature ID (same pattern as coding agents)
             self.running_testing_agents[feature_id] = proc
             testing_count = len(self.running_testing_agents)
 
-        # Start output reader thread with feature ID (same as coding agents)
-        threading.Thread(
-            target=self._read_output,
-            args=(feature_id, proc, threading.Event(), "testing"),
-            daemon=True
-        ).start()
+        # Start output reader task with feature ID (same as coding agents)
+        self._start_reader(feature_id, proc, threading.Event(), "testing", worker)
 
         print(f"Started testing agent for feature #{feature_id} (PID {proc.pid})", flush=True)
         debug_log.log("TESTING", f"Successfully spawned testing agent for feature #{feature_id}",
@@ -638,29 +908,18 @@ class ParallelOrchestrator:
 
         print("Running initializer agent...", flush=True)
 
-        proc = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            cwd=str(AUTOCODER_ROOT),
-            env={**os.environ, "PYTHONUNBUFFERED": "1"},
-        )
+        proc = await self._spawn_agent_process(cmd)
 
         debug_log.log("INIT", "Initializer subprocess started", pid=proc.pid)
 
         # Stream output with timeout
-        loop = asyncio.get_running_loop()
         try:
             async def stream_output():
-                while True:
-                    line = await loop.run_in_executor(None, proc.stdout.readline)
-                    if not line:
-                        break
-                    print(line.rstrip(), flush=True)
+                async for line in self._iter_lines(proc):
+                    print(line, flush=True)
                     if self.on_output:
-                        self.on_output(0, line.rstrip())  # Use 0 as feature_id for initializer
-                proc.wait()
+                        self.on_output(0, line)  # Use 0 as feature_id for initializer
+                await proc.wait()
 
             await asyncio.wait_for(stream_output(), timeout=INITIALIZER_TIMEOUT)
 
@@ -668,7 +927,7 @@ class ParallelOrchestrator:
             print(f"ERROR: Initializer timed out after {INITIALIZER_TIMEOUT // 60} minutes", flush=True)
             debug_log.log("INIT", "TIMEOUT - Initializer exceeded time limit",
                 timeout_minutes=INITIALIZER_TIMEOUT // 60)
-            result = kill_process_tree(proc)
+            result = await kill_process_tree_async(proc)
             debug_log.log("INIT", "Killed timed-out initializer process tree",
                 status=result.status, children_found=result.children_found)
             return False
@@ -683,48 +942,83 @@ class ParallelOrchestrator:
 
         return True
 
-    def _read_output(
+    @staticmethod
+    async def _iter_lines(proc: asyncio.subprocess.Process):
+        """Yield decoded output lines from a subprocess until EOF.
+
+        Lines longer than OUTPUT_LINE_LIMIT are truncated to the limit and
+        the remainder of the line is discarded.
+        """
+        stream = proc.stdout
+        assert stream is not None  # Agents are always spawned with stdout=PIPE
+        while True:
+            truncated = False
+            try:
+                raw = await stream.readuntil(b"\n")
+            except asyncio.IncompleteReadError as e:
+                raw = e.partial  # EOF (last line may lack a newline)
+                if not raw:
+                    break
+            except asyncio.LimitOverrunError as e:
+                raw = await stream.read(e.consumed)
+                truncated = True
+                while True:
+                    try:
+                        await stream.readuntil(b"\n")
+                        break
+                    except asyncio.LimitOverrunError as overrun:
+                        await stream.read(overrun.consumed)
+                    except asyncio.IncompleteReadError:
+                        break
+            line = raw.decode("utf-8", errors="replace").rstrip()
+            yield line + " [truncated]" if truncated else line
+
+    async def _read_output(
         self,
         feature_id: int | None,
-        proc: subprocess.Popen,
+        proc: asyncio.subprocess.Process,
         abort: threading.Event,
         agent_type: Literal["coding", "testing"] = "coding",
+        worker: AgentWorker | None = None,
     ):
-        """Read output from subprocess and emit events."""
+        """Read output from subprocess and emit events.
+
+        For a pooled worker the assignment ends at the worker's done marker
+        (the process keeps running and goes back to the pool); otherwise it
+        ends when the process exits.
+        """
+        return_code: int | None = None
         try:
-            for line in proc.stdout:
+            async for line in self._iter_lines(proc):
                 if abort.is_set():
                     break
-                line = line.rstrip()
+                if worker is not None and line.startswith(WORKER_MARKER_PREFIX):
+                    return_code = parse_done_marker(line)
+                    if return_code is not None:
+                        break
+                    continue  # Ready marker from a freshly started worker
                 if self.on_output:
                     self.on_output(feature_id or 0, line)
                 else:
                     # Both coding and testing agents now use [Feature #X] format
                     print(f"[Feature #{feature_id}] {line}", flush=True)
-            proc.wait()
+            if return_code is None:
+                await proc.wait()
         finally:
-            self._on_agent_complete(feature_id, proc.returncode, agent_type, proc)
+            if return_code is None:
+                return_code = proc.returncode
+            self._on_agent_complete(feature_id, return_code, agent_type, proc)
+            if worker is not None:
+                await self._worker_pool.release(worker)
 
     def _signal_agent_completed(self):
         """Signal that an agent has completed, waking the main loop.
 
-        This method is safe to call from any thread. It schedules the event.set()
-        call to run on the event loop thread to avoid cross-thread issues with
-        asyncio.Event.
+        Reader tasks run on the orchestrator's event loop, so the event is
+        set directly - no cross-thread scheduling needed.
         """
-        if self._agent_completed_event is not None and self._event_loop is not None:
-            try:
-                # Use the stored event loop reference to schedule the set() call
-                # This is necessary because asyncio.Event is not thread-safe and
-                # asyncio.get_event_loop() fails in threads without an event loop
-                if self._event_loop.is_running():
-                    self._event_loop.call_soon_threadsafe(self._agent_completed_event.set)
-                else:
-                    # Fallback: set directly if loop isn't running (shouldn't happen during normal operation)
-                    self._agent_completed_event.set()
-            except RuntimeError:
-                # Event loop closed, ignore (orchestrator may be shutting down)
-                pass
+        if self._agent_completed_event is not None:
+            self._agent_completed_event.set()
 
     async def _wait_for_agent_completion(self, timeout: float = POLL_INTERVAL):
         """Wait for an agent to complete or until timeout expires.
@@ -754,9 +1048,9 @@ class ParallelOrchestrator:
     def _on_agent_complete(
         self,
         feature_id: int | None,
-        return_code: int,
+        return_code: int | None,
         agent_type: Literal["coding", "testing"],
-        proc: subprocess.Popen,
+        proc: asyncio.subprocess.Process,
     ):
         """Handle agent completion.
 
@@ -788,13 +1082,15 @@ class ParallelOrchestrator:
             return
 
         # Coding agent completion
+        assert feature_id is not None  # Only testing agents run without a feature
         debug_log.log("COMPLETE", f"Coding agent for feature #{feature_id} finished",
             return_code=return_code,
             status="success" if return_code == 0 else "failed")
 
         with self._lock:
             self.running_coding_agents.pop(feature_id, None)
-            self.abort_events.pop(feature_id, None)
+            abort_event = self.abort_events.pop(feature_id, None)
+            attempt_start = self._attempt_starts.pop(feature_id, None)
 
         # Refresh session cache to see subprocess commits
         # The coding agent runs as a subprocess and commits changes (e.g., passes=True).
@@ -811,9 +1107,21 @@ class ParallelOrchestrator:
                 passes=feature_passes,
                 in_progress=feature_in_progress)
             if feature and feature.in_progress and not feature.passes:
-                feature.in_progress = False
+                feature.clear_claim()
                 session.commit()
                 debug_log.log("DB", f"Cleared in_progress for feature #{feature_id} (agent failed)")
+
+            # Attempt history for duration estimates (see api/feature_durations.py)
+            if attempt_start is not None:
+                if abort_event is not None and abort_event.is_set():
+                    outcome = "stopped"
+                else:
+                    outcome = "passed" if feature_passes else "failed"
+                started_at, started = attempt_start
+                if record_attempt(session, feature_id, started_at, time.monotonic() - started, outcome):
+                    session.commit()
+                    with self._lock:
+                        self._attempts_recorded += 1
         finally:
             session.close()
 
@@ -839,7 +1147,7 @@ class ParallelOrchestrator:
         # NOTE: Testing agents are now spawned in start_feature() when coding agents START,
         # not here when they complete. This ensures 1:1 ratio and proper termination.
 
-    def stop_feature(self, feature_id: int) -> tuple[bool, str]:
+    async def stop_feature(self, feature_id: int) -> tuple[bool, str]:
         """Stop a running coding agent and all its child processes."""
         with self._lock:
             if feature_id not in self.running_coding_agents:
@@ -852,14 +1160,14 @@ class ParallelOrchestrator:
             abort.set()
         if proc:
             # Kill entire process tree to avoid orphaned children (e.g., browser instances)
-            result = kill_process_tree(proc, timeout=5.0)
+            result = await kill_process_tree_async(proc, timeout=5.0)
             debug_log.log("STOP", f"Killed feature {feature_id} process tree",
                 status=result.status, children_found=result.children_found,
                 children_terminated=result.children_terminated, children_killed=result.children_killed)
 
         return True, f"Stopped feature {feature_id}"
 
-    def stop_all(self) -> None:
+    async def stop_all(self) -> None:
         """Stop all running agents (coding and testing)."""
         self.is_running = False
 
@@ -868,18 +1176,22 @@ class ParallelOrchestrator:
             feature_ids = list(self.running_coding_agents.keys())
 
         for fid in feature_ids:
-            self.stop_feature(fid)
+            await self.stop_feature(fid)
 
         # Stop testing agents (no claim to release - concurrent testing is allowed)
         with self._lock:
             testing_items = list(self.running_testing_agents.items())
 
         for feature_id, proc in testing_items:
-            result = kill_process_tree(proc, timeout=5.0)
+            result = await kill_process_tree_async(proc, timeout=5.0)
             debug_log.log("STOP", f"Killed testing agent for feature #{feature_id} (PID {proc.pid})",
                 status=result.status, children_found=result.children_found,
                 children_terminated=result.children_terminated, children_killed=result.children_killed)
 
+        # Shut down idle warm workers, then the server they were using
+        await self._worker_pool.close()
+        await self._stop_feature_server()
+
     async def run_loop(self):
         """Main orchestration loop."""
         self.is_running = True
@@ -887,8 +1199,6 @@ class ParallelOrchestrator:
         # Initialize the agent completion event for this run
         # Must be created in the async context where it will be used
         self._agent_completed_event = asyncio.Event()
-        # Store the event loop reference for thread-safe signaling from output reader threads
-        self._event_loop = asyncio.get_running_loop()
 
         # Track session start for regression testing (UTC for consistency with last_tested_at)
         self.session_start_time = datetime.now(timezone.utc)
@@ -916,6 +1226,10 @@ class ParallelOrchestrator:
         print("=" * 70, flush=True)
         print(flush=True)
 
+        # Start the shared feature MCP server before any agent (including the
+        # initializer, which creates the features through it)
+        await self._start_feature_server()
+
         # Phase 1: Check if initialization needed
         if not has_features(self.project_dir):
             print("=" * 70, flush=True)
@@ -945,9 +1259,15 @@ class ParallelOrchestrator:
             debug_log.section("INITIALIZATION COMPLETE")
             debug_log.log("INIT", "Disposing old database engine and creating fresh connection")
             print("[DEBUG] Recreating database connection after initialization...", flush=True)
+            self._feature_graph.close()
+            if self._checkpointer is not None:
+                self._checkpointer.stop()
             if self._engine is not None:
                 self._engine.dispose()
+                forget_engine(self._engine)
             self._engine, self._session_maker = create_database(self.project_dir)
+            self._checkpointer = start_wal_checkpointer(self._engine, get_database_path(self.project_dir))
+            self._feature_graph = FeatureGraph(self._engine)
 
             # Debug: Show state immediately after initialization
             print("[DEBUG] Post-initialization state check:", flush=True)
@@ -959,7 +1279,7 @@ class ParallelOrchestrator:
             session = self.get_session()
             try:
                 feature_count = session.query(Feature).count()
-                all_features = session.query(Feature).all()
+                all_features = session.query(Feature).options(lazyload(Feature.content)).all()
                 feature_names = [f"{f.id}: {f.name}" for f in all_features[:10]]
                 print(f"[DEBUG]   features in database={feature_count}", flush=True)
                 debug_log.log("INIT", "Post-initialization database state",
@@ -972,6 +1292,10 @@ class ParallelOrchestrator:
                 session.close()
 
         # Phase 2: Feature loop
+        # Warm up workers in the background so the first agents start without
+        # paying for interpreter start and imports
+        self._prewarm_task = asyncio.create_task(self._worker_pool.prewarm(self.max_concurrency))
+
         # Check for features to resume from previous session
         resumable = self.get_resumable_features()
         if resumable:
@@ -1011,23 +1335,35 @@ class ParallelOrchestrator:
                     print("\nAll features complete!", flush=True)
                     break
 
+                # Agents need the shared feature server; bring it back if it died
+                await self._check_feature_server()
+
+                # Return abandoned claims to the pool and keep ours alive
+                self._maintain_leases()
+
                 # Maintain testing agents independently (runs every iteration)
-                self._maintain_testing_agents()
+                await self._maintain_testing_agents()
 
                 # Check capacity
+                limits = self._admission_limits()
                 with self._lock:
                     current = len(self.running_coding_agents)
                     current_testing = len(self.running_testing_agents)
                     running_ids = list(self.running_coding_agents.keys())
+                capacity = coding_capacity(limits, current, current_testing)
 
                 debug_log.log("CAPACITY", "Checking capacity",
                     current_coding=current,
                     current_testing=current_testing,
                     running_coding_ids=running_ids,
                     max_concurrency=self.max_concurrency,
-                    at_capacity=(current >= self.max_concurrency))
+                    admitted_coding=limits.coding,
+                    admitted_testing=limits.testing,
+                    admitted_total=limits.total,
+                    admission_reason=limits.reason,
+                    at_capacity=(current >= capacity))
 
-                if current >= self.max_concurrency:
+                if current >= capacity:
                     debug_log.log("CAPACITY", "At max capacity, waiting for agent completion...")
                     await self._wait_for_agent_completion()
                     continue
@@ -1035,11 +1371,11 @@ class ParallelOrchestrator:
                 # Priority 1: Resume features from previous session
                 resumable = self.get_resumable_features()
                 if resumable:
-                    slots = self.max_concurrency - current
+                    slots = capacity - current
                     for feature in resumable[:slots]:
                         print(f"Resuming feature #{feature['id']}: {feature['name']}", flush=True)
-                        self.start_feature(feature["id"], resume=True)
-                    await asyncio.sleep(2)
+                        await self.start_feature(feature["id"], resume=True)
+                    await asyncio.sleep(SPAWN_PAUSE)
                     continue
 
                 # Priority 2: Start new ready features
@@ -1070,8 +1406,8 @@ class ParallelOrchestrator:
                         continue
 
                 # Start features up to capacity
-                slots = self.max_concurrency - current
-                print(f"[DEBUG] Spawning loop: {len(ready)} ready, {slots} slots available, max_concurrency={self.max_concurrency}", flush=True)
+                slots = capacity - current
+                print(f"[DEBUG] Spawning loop: {len(ready)} ready, {slots} slots available, max_concurrency={self.max_concurrency} (admitting {capacity}: {limits.reason})", flush=True)
                 print(f"[DEBUG] Will attempt to start {min(len(ready), slots)} features", flush=True)
                 features_to_start = ready[:slots]
                 print(f"[DEBUG] Features to start: {[f['id'] for f in features_to_start]}", flush=True)
@@ -1083,7 +1419,7 @@ class ParallelOrchestrator:
 
                 for i, feature in enumerate(features_to_start):
                     print(f"[DEBUG] Starting feature {i+1}/{len(features_to_start)}: #{feature['id']} - {feature['name']}", flush=True)
-                    success, msg = self.start_feature(feature["id"])
+                    success, msg = await self.start_feature(feature["id"])
                     if not success:
                         print(f"[DEBUG] Failed to start feature #{feature['id']}: {msg}", flush=True)
                         debug_log.log("SPAWN", f"FAILED to start feature #{feature['id']}",
@@ -1098,7 +1434,7 @@ class ParallelOrchestrator:
                             feature_name=feature['name'],
                             running_coding_agents=running_count)
 
-                await asyncio.sleep(2)  # Brief pause between starts
+                await asyncio.sleep(SPAWN_PAUSE)  # Brief pause between starts
 
             except Exception as e:
                 print(f"Orchestrator error: {e}", flush=True)
@@ -1115,6 +1451,11 @@ class ParallelOrchestrator:
             # Use short timeout since we're just waiting for final agents to finish
             await self._wait_for_agent_completion(timeout=1.0)
 
+        await self._worker_pool.close()
+        await self._stop_feature_server()
+        if self._checkpointer is not None:
+            self._checkpointer.stop()
+        debug_log.log("DB", "features.db write-lock waits", **get_lock_wait_stats(self._engine)["total"])
         print("Orchestrator finished.", flush=True)
 
     def get_status(self) -> dict:
@@ -1161,7 +1502,10 @@ async def run_parallel_orchestrator(
         await orchestrator.run_loop()
     except KeyboardInterrupt:
         print("\n\nInterrupted by user. Stopping agents...", flush=True)
-        orchestrator.stop_all()
+        await orchestrator.stop_all()
+    finally:
+        # Covers early exits from run_loop (e.g. initializer failure)
+        await orchestrator._stop_feature_server()
 
 
 def main():
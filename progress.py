@@ -55,6 +55,49 @@ def has_features(project_dir: Path) -> bool:
         return False
 
 
+def query_progress_counts(conn: sqlite3.Connection) -> tuple[int, int, int]:
+    """
+    Run the progress aggregate query on an existing connection.
+
+    Lets long-lived watchers (see server/services/progress_notifier.py) reuse
+    one connection instead of opening a new one per check.
+
+    Args:
+        conn: Open sqlite3 connection to a project's features.db
+
+    Returns:
+        (passing_count, in_progress_count, total_count)
+    """
+    cursor = conn.cursor()
+    # Single aggregate query instead of 3 separate COUNT queries
+    # Handle case where in_progress column doesn't exist yet (legacy DBs)
+    try:
+        cursor.execute("""
+            SELECT
+                COUNT(*) as total,
+                SUM(CASE WHEN passes = 1 THEN 1 ELSE 0 END) as passing,
+                SUM(CASE WHEN in_progress = 1 THEN 1 ELSE 0 END) as in_progress
+            FROM features
+        """)
+        row = cursor.fetchone()
+        total = row[0] or 0
+        passing = row[1] or 0
+        in_progress = row[2] or 0
+    except sqlite3.OperationalError:
+        # Fallback for databases without in_progress column
+        cursor.execute("""
+            SELECT
+                COUNT(*) as total,
+                SUM(CASE WHEN passes = 1 THEN 1 ELSE 0 END) as passing
+            FROM features
+        """)
+        row = cursor.fetchone()
+        total = row[0] or 0
+        passing = row[1] or 0
+        in_progress = 0
+    return passing, in_progress, total
+
+
 def count_passing_tests(project_dir: Path) -> tuple[int, int, int]:
     """
     Count passing, in_progress, and total tests via direct database access.
@@ -71,35 +114,10 @@ def count_passing_tests(project_dir: Path) -> tuple[int, int, int]:
 
     try:
         conn = sqlite3.connect(db_file)
-        cursor = conn.cursor()
-        # Single aggregate query instead of 3 separate COUNT queries
-        # Handle case where in_progress column doesn't exist yet (legacy DBs)
         try:
-            cursor.execute("""
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN passes = 1 THEN 1 ELSE 0 END) as passing,
-                    SUM(CASE WHEN in_progress = 1 THEN 1 ELSE 0 END) as in_progress
-                FROM features
-            """)
-            row = cursor.fetchone()
-            total = row[0] or 0
-            passing = row[1] or 0
-            in_progress = row[2] or 0
-        except sqlite3.OperationalError:
-            # Fallback for databases without in_progress column
-            cursor.execute("""
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN passes = 1 THEN 1 ELSE 0 END) as passing
-                FROM features
-            """)
-            row = cursor.fetchone()
-            total = row[0] or 0
-            passing = row[1] or 0
-            in_progress = 0
-        conn.close()
-        return passing, in_progress, total
+            return query_progress_counts(conn)
+        finally:
+            conn.close()
     except Exception as e:
         print(f"[Database error in count_passing_tests: {e}]")
         return 0, 0, 0
@@ -357,8 +357,13 @@ def update_project_path(name: str, new_path: Path) -> bool:
         if not project:
             return False
 
+        old_path = Path(project.path)
         project.path = new_path.as_posix()
 
+    # Drop any cached engine still pointing at the old location
+    from api.database import dispose_database
+    dispose_database(old_path)
+
     return True
 
 
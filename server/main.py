@@ -48,6 +48,7 @@ from .services.dev_server_manager import (
 )
 from .services.expand_chat_session import cleanup_all_expand_sessions
 from .services.process_manager import cleanup_all_managers, cleanup_orphaned_locks
+from .services.progress_notifier import cleanup_all_progress_notifiers
 from .services.scheduler_service import cleanup_scheduler, get_scheduler
 from .services.terminal_manager import cleanup_all_terminals
 from .websocket import project_websocket
@@ -78,6 +79,10 @@ async def lifespan(app: FastAPI):
     await cleanup_all_expand_sessions()
     await cleanup_all_terminals()
     await cleanup_all_devservers()
+    await cleanup_all_progress_notifiers()
+    # Finally release cached project database engines
+    from api.database import dispose_all_databases
+    dispose_all_databases()
 
 
 # Create FastAPI app
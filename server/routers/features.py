@@ -5,18 +5,25 @@ Features Router
 API endpoints for feature/test case management.
 """
 
+import base64
+import json
 import logging
 from contextlib import contextmanager
 from pathlib import Path
+from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import func, select
 
 from ..schemas import (
     DependencyGraphNode,
     DependencyGraphResponse,
     DependencyUpdate,
     FeatureBulkCreate,
+    FeatureBulkCreateError,
     FeatureBulkCreateResponse,
+    FeatureChangesResponse,
     FeatureCreate,
     FeatureListResponse,
     FeatureResponse,
@@ -25,7 +32,7 @@ from ..schemas import (
 from ..utils.validation import validate_project_name
 
 # Lazy imports to avoid circular dependencies
-_create_database = None
+_get_database = None
 _Feature = None
 
 logger = logging.getLogger(__name__)
@@ -44,30 +51,78 @@ def _get_project_path(project_name: str) -> Path:
 
 def _get_db_classes():
     """Lazy import of database classes."""
-    global _create_database, _Feature
-    if _create_database is None:
+    global _get_database, _Feature
+    if _get_database is None:
         import sys
         from pathlib import Path
         root = Path(__file__).parent.parent.parent
         if str(root) not in sys.path:
             sys.path.insert(0, str(root))
-        from api.database import Feature, create_database
-        _create_database = create_database
+        from api.database import Feature, get_database
+        _get_database = get_database
         _Feature = Feature
-    return _create_database, _Feature
+    return _get_database, _Feature
+
+
+def _get_feature_ingest():
+    """Lazy import of the shared bulk ingestion path."""
+    import sys
+    root = Path(__file__).parent.parent.parent
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+    from api.feature_ingest import ingest_features
+    return ingest_features
+
+
+def _get_feature_queries():
+    """Lazy import of the SQL dependency-graph queries."""
+    import sys
+    root = Path(__file__).parent.parent.parent
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+    from api import feature_queries
+    return feature_queries
 
 
 router = APIRouter(prefix="/api/projects/{project_name}/features", tags=["features"])
 
+# Clients must revalidate every poll; an unchanged project answers 304 cheaply
+_CACHE_HEADERS = {"Cache-Control": "no-cache"}
+
+
+def _get_etag(session) -> str | None:
+    """ETag for the project's current feature data, from the trigger-maintained data version."""
+    from api.database import get_data_version  # Importable once _get_db_classes() ran
+
+    data_version = get_data_version(session)
+    return f'"{data_version[0]}.{data_version[1]}"' if data_version else None
+
+
+def _cache_headers(etag: str | None) -> dict[str, str]:
+    return {**_CACHE_HEADERS, "ETag": etag} if etag else dict(_CACHE_HEADERS)
+
+
+def _etag_matches(request: Request, etag: str | None) -> bool:
+    """Whether the request's If-None-Match header matches etag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not etag or not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
 
 @contextmanager
 def get_db_session(project_dir: Path):
     """
     Context manager for database sessions.
     Ensures session is always closed, even on exceptions.
+
+    The engine is cached per project, so schema setup and migrations run
+    once per process instead of on every request.
     """
-    create_database, _ = _get_db_classes()
-    _, SessionLocal = create_database(project_dir)
+    get_database, _ = _get_db_classes()
+    _, SessionLocal = get_database(project_dir)
     session = SessionLocal()
     try:
         yield session
@@ -112,15 +167,138 @@ def feature_to_response(f, passing_ids: set[int] | None = None) -> FeatureRespon
     )
 
 
+# Fields a Kanban card needs: description is replaced by a short summary and
+# steps are left out (fetch GET /features/{id} for full details)
+CARD_FIELDS = (
+    "id", "priority", "category", "name", "summary", "passes", "in_progress",
+    "dependencies", "blocked", "blocking_dependencies",
+)
+LIST_FIELDS = (
+    "id", "priority", "category", "name", "description", "summary", "steps", "passes", "in_progress",
+    "dependencies", "blocked", "blocking_dependencies",
+)
+SUMMARY_LENGTH = 200
+MAX_PAGE_SIZE = 500
+
+
+def _encode_cursor(positions: dict) -> str:
+    """Opaque cursor: status -> [priority, id] after which to continue, or None when exhausted."""
+    return base64.urlsafe_b64encode(json.dumps(positions, separators=(",", ":")).encode()).decode()
+
+
+def _decode_cursor(cursor: str, statuses) -> dict:
+    try:
+        positions = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(positions, dict):
+            raise ValueError
+        for key, value in positions.items():
+            if key not in statuses:
+                raise ValueError
+            if value is not None and not (
+                isinstance(value, list) and len(value) == 2 and all(isinstance(v, int) for v in value)
+            ):
+                raise ValueError
+        return positions
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _parse_list_param(value: str | None, allowed, name: str) -> list[str] | None:
+    if value is None:
+        return None
+    items = [v.strip() for v in value.split(",") if v.strip()]
+    unknown = [v for v in items if v not in allowed]
+    if unknown or not items:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: {value}")
+    return items
+
+
+def _parse_fields(fields: str | None) -> tuple[tuple | list | None, set[str]]:
+    """(requested fields, or None for full FeatureResponses; fields to output)."""
+    selected = CARD_FIELDS if fields == "card" else _parse_list_param(fields, LIST_FIELDS, "fields")
+    wanted = set(LIST_FIELDS) - {"summary"} if selected is None else set(selected)
+    return selected, wanted
+
+
+def _select_columns(Feature, wanted: set[str]) -> tuple[list[str], list]:
+    """(keys, labeled columns) to select for the wanted fields."""
+    columns = {
+        "id": Feature.id,
+        "priority": Feature.priority,
+        "category": Feature.category,
+        "name": Feature.name,
+        "description": Feature.description,
+        "summary": func.substr(Feature.description, 1, SUMMARY_LENGTH),
+        "steps": Feature.steps,
+        "passes": Feature.passes,
+        "in_progress": Feature.in_progress,
+        "dependencies": Feature.dependencies,
+    }
+    # Always select the cursor keys; only requested columns are loaded otherwise
+    keys = ["id", "priority"] + [k for k in columns if k in wanted and k not in ("id", "priority")]
+    return keys, [columns[k].label(k) for k in keys]
+
+
+def _get_page_blocking(session, feature_queries, rows: list[dict], wanted: set[str]) -> dict[int, list[int]]:
+    """Blocking dependencies of the given rows only, if blocked status was requested."""
+    if not rows or not wanted & {"blocked", "blocking_dependencies"}:
+        return {}
+    blocking: dict[int, list[int]] = feature_queries.get_blocking_dependencies(
+        session, feature_ids=[row["id"] for row in rows]
+    )
+    return blocking
+
+
+def _feature_items(rows: list[dict], keys: list[str], wanted: set[str], blocking: dict) -> list[dict]:
+    """Shape selected rows into (possibly projected) feature dicts."""
+    items = []
+    for row in rows:
+        item = {k: row[k] for k in keys if k in wanted}
+        if "dependencies" in item:
+            item["dependencies"] = item["dependencies"] or []
+        if "steps" in item and not isinstance(item["steps"], list):
+            item["steps"] = []
+        # Handle legacy NULL values gracefully - treat as False
+        for flag in ("passes", "in_progress"):
+            if flag in item:
+                item[flag] = bool(item[flag])
+        if "blocking_dependencies" in wanted:
+            item["blocking_dependencies"] = blocking.get(row["id"], [])
+        if "blocked" in wanted:
+            item["blocked"] = row["id"] in blocking
+        items.append(item)
+    return items
+
+
 @router.get("", response_model=FeatureListResponse)
-async def list_features(project_name: str):
+async def list_features(
+    project_name: str,
+    request: Request,
+    response: Response,
+    status: str | None = None,
+    category: str | None = None,
+    fields: str | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+):
     """
-    List all features for a project organized by status.
+    List features for a project organized by status.
 
     Returns features in three lists:
     - pending: passes=False, not currently being worked on
     - in_progress: features currently being worked on (tracked via agent output)
     - done: passes=True
+
+    Optional query parameters (without them, every feature is returned in full):
+    - status: comma-separated subset of pending,in_progress,done to fill
+    - category: only features in this category
+    - fields: comma-separated fields to return, or "card" for card data only
+      (a description summary instead of description and steps)
+    - limit: page size per status column; the response's next_cursor, passed
+      back as cursor, continues every column where it left off (keyset pagination)
+
+    Responses carry an ETag derived from the project's data version; a
+    matching If-None-Match is answered with 304 before any feature is read.
     """
     project_name = validate_project_name(project_name)
     project_dir = _get_project_path(project_name)
@@ -131,37 +309,58 @@ async def list_features(project_name: str):
     if not project_dir.exists():
         raise HTTPException(status_code=404, detail="Project directory not found")
 
+    _, Feature = _get_db_classes()
+    feature_queries = _get_feature_queries()
+
+    statuses = _parse_list_param(status, feature_queries.FEATURE_STATUSES, "status") or list(
+        feature_queries.FEATURE_STATUSES
+    )
+    selected, wanted = _parse_fields(fields)
+    positions = _decode_cursor(cursor, feature_queries.FEATURE_STATUSES) if cursor else {}
+
     db_file = project_dir / "features.db"
     if not db_file.exists():
         return FeatureListResponse(pending=[], in_progress=[], done=[])
 
-    _, Feature = _get_db_classes()
+    keys, columns = _select_columns(Feature, wanted)
 
     try:
         with get_db_session(project_dir) as session:
-            all_features = session.query(Feature).order_by(Feature.priority).all()
-
-            # Compute passing IDs for blocked status calculation
-            passing_ids = {f.id for f in all_features if f.passes}
-
-            pending = []
-            in_progress = []
-            done = []
-
-            for f in all_features:
-                feature_response = feature_to_response(f, passing_ids)
-                if f.passes:
-                    done.append(feature_response)
-                elif f.in_progress:
-                    in_progress.append(feature_response)
-                else:
-                    pending.append(feature_response)
-
-            return FeatureListResponse(
-                pending=pending,
-                in_progress=in_progress,
-                done=done,
+            # Read before the data, so the tag is never newer than what it describes
+            etag = _get_etag(session)
+            headers = _cache_headers(etag)
+            if _etag_matches(request, etag):
+                return Response(status_code=304, headers=headers)
+
+            pages: dict[str, list] = {key: [] for key in feature_queries.FEATURE_STATUSES}
+            more = False
+            for key in statuses:
+                if key in positions and positions[key] is None:
+                    continue  # Column exhausted on an earlier page
+                rows, has_more = feature_queries.get_features_page(
+                    session,
+                    key,
+                    columns,
+                    category=category,
+                    after=tuple(positions[key]) if positions.get(key) else None,
+                    limit=limit,
+                )
+                pages[key] = [row._asdict() for row in rows]
+                if limit is not None:
+                    positions[key] = [rows[-1].priority, rows[-1].id] if has_more else None
+                    more = more or has_more
+
+            blocking = _get_page_blocking(
+                session, feature_queries, [row for rows in pages.values() for row in rows], wanted
             )
+            payload: dict[str, Any] = {key: _feature_items(rows, keys, wanted, blocking) for key, rows in pages.items()}
+            payload["next_cursor"] = _encode_cursor(positions) if more else None
+
+            if selected is None:
+                response.headers.update(headers)
+                return FeatureListResponse(**payload)
+            # Projections bypass FeatureResponse, whose fields are all required
+            return JSONResponse(payload, headers=headers)
     except HTTPException:
         raise
     except Exception:
@@ -182,13 +381,13 @@ async def create_feature(project_name: str, feature: FeatureCreate):
         raise HTTPException(status_code=404, detail="Project directory not found")
 
     _, Feature = _get_db_classes()
+    from api.database import allocate_priorities  # Importable once _get_db_classes() ran
 
     try:
         with get_db_session(project_dir) as session:
             # Get next priority if not specified
             if feature.priority is None:
-                max_priority = session.query(Feature).order_by(Feature.priority.desc()).first()
-                priority = (max_priority.priority + 1) if max_priority else 1
+                priority = allocate_priorities(session)
             else:
                 priority = feature.priority
 
@@ -235,8 +434,11 @@ async def create_features_bulk(project_name: str, bulk: FeatureBulkCreate):
     - Importing features from external sources
     - Batch operations
 
+    Invalid features are reported per row in "errors" and skipped; the
+    rest of the batch is still created.
+
     Returns:
-        {"created": N, "features": [...]}
+        {"created": N, "features": [...], "errors": [{"index": i, "error": "..."}]}
     """
     project_name = validate_project_name(project_name)
     project_dir = _get_project_path(project_name)
@@ -255,53 +457,30 @@ async def create_features_bulk(project_name: str, bulk: FeatureBulkCreate):
         raise HTTPException(status_code=400, detail="starting_priority must be >= 1")
 
     _, Feature = _get_db_classes()
+    ingest_features = _get_feature_ingest()
 
     try:
         with get_db_session(project_dir) as session:
-            # Determine starting priority
-            # Note: SQLite uses file-level locking, not row-level locking, so we rely on
-            # SQLite's transaction isolation. Concurrent bulk creates may get overlapping
-            # priorities, but this is acceptable since priorities can be reordered.
-            if bulk.starting_priority is not None:
-                current_priority = bulk.starting_priority
-            else:
-                max_priority_feature = (
-                    session.query(Feature)
-                    .order_by(Feature.priority.desc())
-                    .first()
-                )
-                current_priority = (max_priority_feature.priority + 1) if max_priority_feature else 1
-
-            created_ids = []
-
-            for feature_data in bulk.features:
-                db_feature = Feature(
-                    priority=current_priority,
-                    category=feature_data.category,
-                    name=feature_data.name,
-                    description=feature_data.description,
-                    steps=feature_data.steps,
-                    dependencies=feature_data.dependencies if feature_data.dependencies else None,
-                    passes=False,
-                    in_progress=False,
-                )
-                session.add(db_feature)
-                session.flush()  # Flush to get the ID immediately
-                created_ids.append(db_feature.id)
-                current_priority += 1
-
-            session.commit()
+            # Validated in one pass and inserted in chunked transactions; rejected
+            # rows are reported in `errors` while the rest are still created
+            result = ingest_features(
+                session,
+                [f.model_dump(include={"category", "name", "description", "steps", "dependencies"})
+                 for f in bulk.features],
+                start_priority=bulk.starting_priority,
+            )
 
-            # Query created features by their IDs (avoids relying on priority range)
-            created_features = []
-            for db_feature in session.query(Feature).filter(
-                Feature.id.in_(created_ids)
-            ).order_by(Feature.priority).all():
-                created_features.append(feature_to_response(db_feature))
+            created_features = [
+                feature_to_response(db_feature)
+                for db_feature in session.query(Feature).filter(
+                    Feature.id.in_(result.created_ids)
+                ).order_by(Feature.priority)
+            ]
 
             return FeatureBulkCreateResponse(
                 created=len(created_features),
-                features=created_features
+                features=created_features,
+                errors=[FeatureBulkCreateError(**error) for error in result.errors],
             )
     except HTTPException:
         raise
@@ -310,12 +489,87 @@ async def create_features_bulk(project_name: str, bulk: FeatureBulkCreate):
         raise HTTPException(status_code=500, detail="Failed to bulk create features")
 
 
+@router.get("/changes", response_model=FeatureChangesResponse)
+async def get_feature_changes(
+    project_name: str,
+    since: int = Query(0, ge=0),
+    epoch: str | None = None,
+    fields: str | None = None,
+):
+    """Return features inserted, updated or deleted since a data version.
+
+    Clients keep the returned epoch and version and pass them back as epoch
+    and since; since=0 returns every feature. Features whose blocked status
+    may have changed (dependents of changed features) are included too. If
+    the epoch doesn't match (database recreated) or since is ahead of the
+    database, a full snapshot is returned with reset=True.
+
+    fields works as for list_features.
+    """
+    project_name = validate_project_name(project_name)
+    project_dir = _get_project_path(project_name)
+
+    if not project_dir:
+        raise HTTPException(status_code=404, detail=f"Project '{project_name}' not found in registry")
+
+    if not project_dir.exists():
+        raise HTTPException(status_code=404, detail="Project directory not found")
+
+    db_file = project_dir / "features.db"
+    if not db_file.exists():
+        raise HTTPException(status_code=404, detail="No features database found")
+
+    _, Feature = _get_db_classes()
+    feature_queries = _get_feature_queries()
+    selected, wanted = _parse_fields(fields)
+    keys, columns = _select_columns(Feature, wanted)
+
+    try:
+        with get_db_session(project_dir) as session:
+            from api.database import get_data_version  # Importable once _get_db_classes() ran
+
+            # Read before the data: rows changed meanwhile are sent again next time
+            data_version = get_data_version(session)
+            if data_version is None:
+                raise HTTPException(status_code=500, detail="Features database has no data version")
+            current_epoch, version = data_version
+
+            reset = (epoch is not None and epoch != current_epoch) or since > version
+            if reset:
+                since = 0
+            rows = [
+                row._asdict()
+                for row in session.execute(
+                    select(*columns).where(feature_queries.changed_since(since)).order_by(Feature.priority, Feature.id)
+                )
+            ]
+            deleted = feature_queries.get_deleted_since(session, since) if since else []
+            blocking = _get_page_blocking(session, feature_queries, rows, wanted)
+
+            payload: dict[str, Any] = {
+                "epoch": current_epoch,
+                "version": version,
+                "reset": reset,
+                "features": _feature_items(rows, keys, wanted, blocking),
+                "deleted": deleted,
+            }
+            if selected is None:
+                return FeatureChangesResponse(**payload)
+            return JSONResponse(payload)
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Database error in get_feature_changes")
+        raise HTTPException(status_code=500, detail="Database error occurred")
+
+
 @router.get("/graph", response_model=DependencyGraphResponse)
-async def get_dependency_graph(project_name: str):
+async def get_dependency_graph(project_name: str, request: Request, response: Response):
     """Return dependency graph data for visualization.
 
     Returns nodes (features) and edges (dependencies) suitable for
-    rendering with React Flow or similar graph libraries.
+    rendering with React Flow or similar graph libraries. Conditional
+    requests are handled like list_features (ETag / 304).
     """
     project_name = validate_project_name(project_name)
     project_dir = _get_project_path(project_name)
@@ -330,42 +584,23 @@ async def get_dependency_graph(project_name: str):
     if not db_file.exists():
         return DependencyGraphResponse(nodes=[], edges=[])
 
-    _, Feature = _get_db_classes()
+    feature_queries = _get_feature_queries()
 
     try:
         with get_db_session(project_dir) as session:
-            all_features = session.query(Feature).all()
-            passing_ids = {f.id for f in all_features if f.passes}
-
-            nodes = []
-            edges = []
-
-            for f in all_features:
-                deps = f.dependencies or []
-                blocking = [d for d in deps if d not in passing_ids]
-
-                if f.passes:
-                    status = "done"
-                elif blocking:
-                    status = "blocked"
-                elif f.in_progress:
-                    status = "in_progress"
-                else:
-                    status = "pending"
-
-                nodes.append(DependencyGraphNode(
-                    id=f.id,
-                    name=f.name,
-                    category=f.category,
-                    status=status,
-                    priority=f.priority,
-                    dependencies=deps
-                ))
-
-                for dep_id in deps:
-                    edges.append({"source": dep_id, "target": f.id})
-
-            return DependencyGraphResponse(nodes=nodes, edges=edges)
+            etag = _get_etag(session)
+            headers = _cache_headers(etag)
+            if _etag_matches(request, etag):
+                return Response(status_code=304, headers=headers)
+
+            # Narrow columns + the dependency edge table; description/steps aren't loaded
+            graph = feature_queries.build_dependency_graph(session)
+            response.headers.update(headers)
+            return DependencyGraphResponse(
+                nodes=[DependencyGraphNode(**node) for node in graph["nodes"]],
+                edges=graph["edges"],
+                cycles=graph["cycles"],
+            )
     except HTTPException:
         raise
     except Exception:
@@ -403,7 +638,14 @@ async def get_feature(project_name: str, feature_id: int):
             if not feature:
                 raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
 
-            return feature_to_response(feature)
+            # Only this feature's dependencies are needed for its blocked status
+            passing_ids = {
+                dep_id
+                for (dep_id,) in session.query(Feature.id).filter(
+                    Feature.id.in_(feature.dependencies or []), Feature.passes == True
+                )
+            }
+            return feature_to_response(feature, passing_ids)
     except HTTPException:
         raise
     except Exception:
@@ -463,8 +705,7 @@ async def update_feature(project_name: str, feature_id: int, update: FeatureUpda
             session.refresh(feature)
 
             # Compute passing IDs for response
-            all_features = session.query(Feature).all()
-            passing_ids = {f.id for f in all_features if f.passes}
+            passing_ids = {fid for (fid,) in session.query(Feature.id).filter(Feature.passes == True)}
 
             return feature_to_response(feature, passing_ids)
     except HTTPException:
@@ -492,6 +733,7 @@ async def delete_feature(project_name: str, feature_id: int):
         raise HTTPException(status_code=404, detail="Project directory not found")
 
     _, Feature = _get_db_classes()
+    feature_queries = _get_feature_queries()
 
     try:
         with get_db_session(project_dir) as session:
@@ -503,7 +745,8 @@ async def delete_feature(project_name: str, feature_id: int):
             # Clean up dependency references in other features
             # This prevents orphaned dependencies that would block features forever
             affected_features = []
-            for f in session.query(Feature).all():
+            dependent_ids = feature_queries.get_dependents(session, feature_id)
+            for f in session.query(Feature).filter(Feature.id.in_(dependent_ids)):
                 if f.dependencies and feature_id in f.dependencies:
                     # Remove the deleted feature from this feature's dependencies
                     deps = [d for d in f.dependencies if d != feature_id]
@@ -543,6 +786,7 @@ async def skip_feature(project_name: str, feature_id: int):
         raise HTTPException(status_code=404, detail="Project directory not found")
 
     _, Feature = _get_db_classes()
+    from api.database import allocate_priorities  # Importable once _get_db_classes() ran
 
     try:
         with get_db_session(project_dir) as session:
@@ -551,9 +795,8 @@ async def skip_feature(project_name: str, feature_id: int):
             if not feature:
                 raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
 
-            # Set priority to max + 1 to push to end (consistent with MCP server)
-            max_priority = session.query(Feature).order_by(Feature.priority.desc()).first()
-            feature.priority = (max_priority.priority + 1) if max_priority else 1
+            # Take the next priority to push to end (consistent with MCP server)
+            feature.priority = allocate_priorities(session)
 
             session.commit()
 
@@ -571,13 +814,10 @@ async def skip_feature(project_name: str, feature_id: int):
 
 
 def _get_dependency_resolver():
-    """Lazy import of dependency resolver."""
-    import sys
-    root = Path(__file__).parent.parent.parent
-    if str(root) not in sys.path:
-        sys.path.insert(0, str(root))
-    from api.dependency_resolver import MAX_DEPENDENCIES_PER_FEATURE, would_create_circular_dependency
-    return would_create_circular_dependency, MAX_DEPENDENCIES_PER_FEATURE
+    """Lazy import of the cycle check and the dependency limit."""
+    feature_queries = _get_feature_queries()  # Also puts the repo root on sys.path
+    from api.dependency_resolver import MAX_DEPENDENCIES_PER_FEATURE
+    return feature_queries.would_create_cycle, MAX_DEPENDENCIES_PER_FEATURE
 
 
 @router.post("/{feature_id}/dependencies/{dep_id}")
@@ -601,7 +841,7 @@ async def add_dependency(project_name: str, feature_id: int, dep_id: int):
     if not project_dir.exists():
         raise HTTPException(status_code=404, detail="Project directory not found")
 
-    would_create_circular_dependency, MAX_DEPENDENCIES_PER_FEATURE = _get_dependency_resolver()
+    would_create_cycle, MAX_DEPENDENCIES_PER_FEATURE = _get_dependency_resolver()
     _, Feature = _get_db_classes()
 
     try:
@@ -623,10 +863,8 @@ async def add_dependency(project_name: str, feature_id: int, dep_id: int):
             if dep_id in current_deps:
                 raise HTTPException(status_code=400, detail="Dependency already exists")
 
-            # Security: Circular dependency check
-            # source_id = feature_id (gaining dep), target_id = dep_id (being depended upon)
-            all_features = [f.to_dict() for f in session.query(Feature).all()]
-            if would_create_circular_dependency(all_features, feature_id, dep_id):
+            # Security: Circular dependency check (can dep_id already reach feature_id?)
+            if would_create_cycle(session, feature_id, [dep_id]):
                 raise HTTPException(status_code=400, detail="Would create circular dependency")
 
             current_deps.append(dep_id)
@@ -702,7 +940,7 @@ async def set_dependencies(project_name: str, feature_id: int, update: Dependenc
     if len(dependency_ids) != len(set(dependency_ids)):
         raise HTTPException(status_code=400, detail="Duplicate dependencies not allowed")
 
-    would_create_circular_dependency, _ = _get_dependency_resolver()
+    would_create_cycle, _ = _get_dependency_resolver()
     _, Feature = _get_db_classes()
 
     try:
@@ -712,24 +950,14 @@ async def set_dependencies(project_name: str, feature_id: int, update: Dependenc
                 raise HTTPException(status_code=404, detail=f"Feature {feature_id} not found")
 
             # Validate all dependencies exist
-            all_feature_ids = {f.id for f in session.query(Feature).all()}
-            missing = [d for d in dependency_ids if d not in all_feature_ids]
+            existing_ids = {fid for (fid,) in session.query(Feature.id).filter(Feature.id.in_(dependency_ids))}
+            missing = [d for d in dependency_ids if d not in existing_ids]
             if missing:
                 raise HTTPException(status_code=400, detail=f"Dependencies not found: {missing}")
 
-            # Check for circular dependencies
-            all_features = [f.to_dict() for f in session.query(Feature).all()]
-            # Temporarily update the feature's dependencies for cycle check
-            test_features = []
-            for f in all_features:
-                if f["id"] == feature_id:
-                    test_features.append({**f, "dependencies": dependency_ids})
-                else:
-                    test_features.append(f)
-
+            # Check for circular dependencies (can any new dependency already reach feature_id?)
             for dep_id in dependency_ids:
-                # source_id = feature_id (gaining dep), target_id = dep_id (being depended upon)
-                if would_create_circular_dependency(test_features, feature_id, dep_id):
+                if would_create_cycle(session, feature_id, [dep_id]):
                     raise HTTPException(
                         status_code=400,
                         detail=f"Cannot add dependency {dep_id}: would create circular dependency"
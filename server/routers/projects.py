@@ -260,6 +260,10 @@ async def delete_project(name: str, delete_files: bool = False):
             detail="Cannot delete project while agent is running. Stop the agent first."
         )
 
+    # Release the cached engine first so no pooled connection keeps features.db open
+    from api.database import dispose_database  # Importable once _init_imports() ran
+    dispose_database(project_dir)
+
     # Optionally delete files
     if delete_files and project_dir.exists():
         try:
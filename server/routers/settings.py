@@ -13,7 +13,7 @@ from pathlib import Path
 
 from fastapi import APIRouter
 
-from ..schemas import ModelInfo, ModelsResponse, SettingsResponse, SettingsUpdate
+from ..schemas import MAX_CONCURRENCY, ModelInfo, ModelsResponse, SettingsResponse, SettingsUpdate
 
 # Mimetype fix for Windows - must run before StaticFiles is mounted
 mimetypes.add_type("text/javascript", ".js", True)
@@ -92,6 +92,7 @@ async def get_settings():
         glm_mode=_is_glm_mode(),
         ollama_mode=_is_ollama_mode(),
         testing_agent_ratio=_parse_int(all_settings.get("testing_agent_ratio"), 1),
+        max_concurrency_limit=MAX_CONCURRENCY,
     )
 
 
@@ -115,4 +116,5 @@ async def update_settings(update: SettingsUpdate):
         glm_mode=_is_glm_mode(),
         ollama_mode=_is_ollama_mode(),
         testing_agent_ratio=_parse_int(all_settings.get("testing_agent_ratio"), 1),
+        max_concurrency_limit=MAX_CONCURRENCY,
     )
@@ -18,8 +18,12 @@ _root = Path(__file__).parent.parent
 if str(_root) not in sys.path:
     sys.path.insert(0, str(_root))
 
+from admission import get_max_concurrency
 from registry import DEFAULT_MODEL, VALID_MODELS
 
+# Configured ceiling for max_concurrency (AUTOCODER_MAX_CONCURRENCY, default 5)
+MAX_CONCURRENCY = get_max_concurrency()
+
 # ============================================================================
 # Project Schemas
 # ============================================================================
@@ -116,6 +120,16 @@ class FeatureListResponse(BaseModel):
     pending: list[FeatureResponse]
     in_progress: list[FeatureResponse]
     done: list[FeatureResponse]
+    next_cursor: str | None = None  # Set when a paginated listing has more rows
+
+
+class FeatureChangesResponse(BaseModel):
+    """Features changed since a data version, for delta sync."""
+    epoch: str  # Identifies the database; pass it back with since
+    version: int  # Pass back as since on the next request
+    reset: bool = False  # since/epoch didn't match: features is a full snapshot, drop local state
+    features: list[FeatureResponse]  # Inserted or updated (upsert by id)
+    deleted: list[int]  # IDs to remove
 
 
 class FeatureBulkCreate(BaseModel):
@@ -124,10 +138,17 @@ class FeatureBulkCreate(BaseModel):
     starting_priority: int | None = None  # If None, appends after max priority
 
 
+class FeatureBulkCreateError(BaseModel):
+    """A feature rejected by a bulk create (the rest of the batch is still created)."""
+    index: int  # Position in the request's features list
+    error: str
+
+
 class FeatureBulkCreateResponse(BaseModel):
     """Response for bulk feature creation."""
     created: int
     features: list[FeatureResponse]
+    errors: list[FeatureBulkCreateError] = Field(default_factory=list)
 
 
 # ============================================================================
@@ -154,6 +175,7 @@ class DependencyGraphResponse(BaseModel):
     """Response for dependency graph visualization."""
     nodes: list[DependencyGraphNode]
     edges: list[DependencyGraphEdge]
+    cycles: list[list[int]] = []  # Groups of features that depend on each other
 
 
 class DependencyUpdate(BaseModel):
@@ -170,7 +192,7 @@ class AgentStartRequest(BaseModel):
     yolo_mode: bool | None = None  # None means use global settings
     model: str | None = None  # None means use global settings
     parallel_mode: bool | None = None  # DEPRECATED: Use max_concurrency instead
-    max_concurrency: int | None = None  # Max concurrent coding agents (1-5)
+    max_concurrency: int | None = None  # Max concurrent coding agents (1-MAX_CONCURRENCY)
     testing_agent_ratio: int | None = None  # Regression testing agents (0-3)
 
     @field_validator('model')
@@ -184,9 +206,9 @@ class AgentStartRequest(BaseModel):
     @field_validator('max_concurrency')
     @classmethod
     def validate_concurrency(cls, v: int | None) -> int | None:
-        """Validate max_concurrency is between 1 and 5."""
-        if v is not None and (v < 1 or v > 5):
-            raise ValueError("max_concurrency must be between 1 and 5")
+        """Validate max_concurrency is between 1 and the configured ceiling."""
+        if v is not None and (v < 1 or v > MAX_CONCURRENCY):
+            raise ValueError(f"max_concurrency must be between 1 and {MAX_CONCURRENCY}")
         return v
 
     @field_validator('testing_agent_ratio')
@@ -384,6 +406,7 @@ class SettingsResponse(BaseModel):
     glm_mode: bool = False  # True if GLM API is configured via .env
     ollama_mode: bool = False  # True if Ollama API is configured via .env
     testing_agent_ratio: int = 1  # Regression testing agents (0-3)
+    max_concurrency_limit: int = MAX_CONCURRENCY  # Configured ceiling for concurrent agents
 
 
 class ModelsResponse(BaseModel):
@@ -501,8 +524,8 @@ class ScheduleCreate(BaseModel):
     max_concurrency: int = Field(
         default=3,
         ge=1,
-        le=5,
-        description="Max concurrent agents (1-5)"
+        le=MAX_CONCURRENCY,
+        description=f"Max concurrent agents (1-{MAX_CONCURRENCY})"
     )
 
     @field_validator('model')
@@ -525,7 +548,7 @@ class ScheduleUpdate(BaseModel):
     enabled: bool | None = None
     yolo_mode: bool | None = None
     model: str | None = None
-    max_concurrency: int | None = Field(None, ge=1, le=5)
+    max_concurrency: int | None = Field(None, ge=1, le=MAX_CONCURRENCY)
 
     @field_validator('model')
     @classmethod
@@ -373,7 +373,8 @@ class ExpandChatSession:
             List of created feature dictionaries with IDs
 
         Note:
-            Uses flush() to get IDs immediately without re-querying by priority range,
+            Goes through the shared ingestion path (chunked INSERT ... RETURNING),
+            so IDs come back from the insert rather than a priority range query,
             which could pick up rows from concurrent writers.
         """
         # Import database classes
@@ -382,48 +383,35 @@ class ExpandChatSession:
         if str(root) not in sys.path:
             sys.path.insert(0, str(root))
 
-        from api.database import Feature, create_database
+        from api.database import get_database
+        from api.feature_ingest import ingest_features
 
         # Get database session
-        _, SessionLocal = create_database(self.project_dir)
+        _, SessionLocal = get_database(self.project_dir)
         session = SessionLocal()
 
         try:
-            # Determine starting priority
-            max_priority_feature = session.query(Feature).order_by(Feature.priority.desc()).first()
-            current_priority = (max_priority_feature.priority + 1) if max_priority_feature else 1
-
-            created_rows: list = []
-
-            for f in features:
-                db_feature = Feature(
-                    priority=current_priority,
-                    category=f.get("category", "functional"),
-                    name=f.get("name", "Unnamed feature"),
-                    description=f.get("description", ""),
-                    steps=f.get("steps", []),
-                    passes=False,
-                    in_progress=False,
-                )
-                session.add(db_feature)
-                created_rows.append(db_feature)
-                current_priority += 1
-
-            # Flush to get IDs without relying on priority range query
-            session.flush()
-
-            # Build result from the flushed objects (IDs are now populated)
-            created_features = [
+            rows = [
                 {
-                    "id": db_feature.id,
-                    "name": db_feature.name,
-                    "category": db_feature.category,
+                    "category": f.get("category", "functional"),
+                    "name": f.get("name", "Unnamed feature"),
+                    "description": f.get("description", ""),
+                    "steps": f.get("steps", []),
                 }
-                for db_feature in created_rows
+                for f in features
             ]
+            result = ingest_features(session, rows)
+            for error in result.errors:
+                logger.warning(f"Skipped feature for {self.project_name}: {error['error']}")
 
-            session.commit()
-            return created_features
+            return [
+                {
+                    "id": feature_id,
+                    "name": rows[i]["name"],
+                    "category": rows[i]["category"],
+                }
+                for i, feature_id in result.created
+            ]
 
         except Exception:
             session.rollback()
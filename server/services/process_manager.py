@@ -304,7 +304,7 @@ class AgentProcessManager:
             yolo_mode: If True, run in YOLO mode (skip testing agents)
             model: Model to use (e.g., claude-opus-4-5-20251101)
             parallel_mode: DEPRECATED - ignored, always uses unified orchestrator
-            max_concurrency: Max concurrent coding agents (1-5, default 1)
+            max_concurrency: Max concurrent coding agents (1-AUTOCODER_MAX_CONCURRENCY, default 1)
             testing_agent_ratio: Number of regression testing agents (0-3, default 1)
 
         Returns:
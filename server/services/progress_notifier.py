@@ -0,0 +1,231 @@
+"""
+Progress Notifier
+=================
+
+Per-project change notification hub for feature progress.
+
+Every WebSocket used to poll the database on its own, opening a fresh
+connection and running an aggregate COUNT every 2 seconds even when nothing
+had changed. A ProgressNotifier instead owns a single long-lived connection
+per project and checks SQLite's ``PRAGMA data_version``, which only changes
+when another connection (an agent's MCP server, the orchestrator, the REST
+API) commits. The COUNT query runs once per committed change, and the
+resulting progress message is pushed to every subscriber of that project -
+and only when the counts actually differ from the last message.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Awaitable, Callable, Set
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from progress import query_progress_counts  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# How often the data_version is checked. A check is a single PRAGMA on an
+# already-open connection, so this can be much tighter than the old 2s poll.
+CHECK_INTERVAL_SECONDS = 1.0
+
+ProgressCallback = Callable[[dict], Awaitable[None]]
+
+
+def build_progress_message(passing: int, in_progress: int, total: int) -> dict:
+    """Build the WebSocket progress message for a set of counts."""
+    percentage = (passing / total * 100) if total > 0 else 0
+    return {
+        "type": "progress",
+        "passing": passing,
+        "in_progress": in_progress,
+        "total": total,
+        "percentage": round(percentage, 1),
+    }
+
+
+class ProgressNotifier:
+    """
+    Watches one project's features.db and pushes progress to subscribers.
+
+    The watch task only runs while there is at least one subscriber.
+    """
+
+    def __init__(self, project_name: str, project_dir: Path):
+        self.project_name = project_name
+        self.project_dir = project_dir
+        self.db_file = project_dir / "features.db"
+
+        self._subscribers: Set[ProgressCallback] = set()
+        self._subscribers_lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+
+        # Guarded by _check_lock (used from worker threads)
+        self._conn: sqlite3.Connection | None = None
+        self._db_inode: int | None = None
+        self._data_version: int | None = None
+        # Serializes _check() between the watch task and subscribe()
+        self._check_lock = threading.Lock()
+
+        self._latest: dict | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._subscribers_lock:
+            return len(self._subscribers)
+
+    async def subscribe(self, callback: ProgressCallback) -> dict:
+        """
+        Register a callback for progress changes.
+
+        Returns:
+            The current progress message, to send as the initial state.
+        """
+        with self._subscribers_lock:
+            self._subscribers.add(callback)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._watch())
+
+        latest = self._latest
+        if latest is None:
+            latest = await asyncio.to_thread(self._check)
+        return latest or build_progress_message(0, 0, 0)
+
+    async def unsubscribe(self, callback: ProgressCallback) -> None:
+        """Remove a callback, stopping the watch task when none remain."""
+        with self._subscribers_lock:
+            self._subscribers.discard(callback)
+            idle = not self._subscribers
+        if idle:
+            await self.stop()
+
+    async def stop(self) -> None:
+        """Stop watching and release the database connection."""
+        task = self._task
+        self._task = None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await asyncio.to_thread(self._close)
+        # Nobody is watching any more, so the cached counts may go stale
+        self._latest = None
+
+    async def _watch(self) -> None:
+        while True:
+            try:
+                await asyncio.sleep(CHECK_INTERVAL_SECONDS)
+                message = await asyncio.to_thread(self._check)
+                if message is not None:
+                    await self._broadcast(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Progress watch error for {self.project_name}: {e}")
+
+    async def _broadcast(self, message: dict) -> None:
+        with self._subscribers_lock:
+            callbacks = list(self._subscribers)
+        for callback in callbacks:
+            try:
+                await callback(message)
+            except Exception as e:
+                logger.warning(f"Progress callback error: {e}")
+
+    def _check(self) -> dict | None:
+        """
+        Re-read the counts if the database changed.
+
+        Runs in a worker thread. Returns a new progress message only when
+        the counts differ from the last one, otherwise None.
+        """
+        with self._check_lock:
+            try:
+                inode = os.stat(self.db_file).st_ino
+            except OSError:
+                # No database yet (or it was deleted)
+                self._close_locked()
+                return self._remember(build_progress_message(0, 0, 0))
+
+            try:
+                if self._conn is None or inode != self._db_inode:
+                    # First check, or the file was replaced underneath us
+                    self._close_locked()
+                    self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+                    self._db_inode = inode
+
+                version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+                if version == self._data_version and self._latest is not None:
+                    return None
+                passing, in_progress, total = query_progress_counts(self._conn)
+                # End the implicit read so the WAL can be checkpointed
+                self._conn.rollback()
+                self._data_version = version
+            except sqlite3.Error as e:
+                logger.warning(f"Progress check failed for {self.project_name}: {e}")
+                self._close_locked()
+                return None
+
+            return self._remember(build_progress_message(passing, in_progress, total))
+
+    def _remember(self, message: dict) -> dict | None:
+        if message == self._latest:
+            return None
+        self._latest = message
+        return message
+
+    def _close(self) -> None:
+        with self._check_lock:
+            self._close_locked()
+
+    def _close_locked(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+        self._conn = None
+        self._db_inode = None
+        self._data_version = None
+
+
+# Global registry of notifiers per project
+_notifiers: dict[tuple[str, str], ProgressNotifier] = {}
+_notifiers_lock = threading.Lock()
+
+
+def get_progress_notifier(project_name: str, project_dir: Path) -> ProgressNotifier:
+    """
+    Get or create the progress notifier for a project (thread-safe).
+
+    Args:
+        project_name: Name of the project
+        project_dir: Absolute path to the project directory
+
+    Returns:
+        ProgressNotifier shared by all WebSocket clients of the project
+    """
+    with _notifiers_lock:
+        key = (project_name, str(project_dir.resolve()))
+        if key not in _notifiers:
+            _notifiers[key] = ProgressNotifier(project_name, project_dir)
+        return _notifiers[key]
+
+
+async def cleanup_all_progress_notifiers() -> None:
+    """Stop all notifiers. Called on server shutdown."""
+    with _notifiers_lock:
+        notifiers = list(_notifiers.values())
+        _notifiers.clear()
+
+    for notifier in notifiers:
+        try:
+            await notifier.stop()
+        except Exception as e:
+            logger.warning(f"Error stopping progress notifier for {notifier.project_name}: {e}")
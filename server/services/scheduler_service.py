@@ -91,14 +91,14 @@ class SchedulerService:
 
     async def _load_project_schedules(self, project_name: str, project_dir: Path) -> int:
         """Load schedules for a single project. Returns count of schedules loaded."""
-        from api.database import Schedule, create_database
+        from api.database import Schedule, get_database
 
         db_path = project_dir / "features.db"
         if not db_path.exists():
             return 0
 
         try:
-            _, SessionLocal = create_database(project_dir)
+            _, SessionLocal = get_database(project_dir)
             db = SessionLocal()
             try:
                 schedules = db.query(Schedule).filter(
@@ -212,9 +212,9 @@ class SchedulerService:
         project_dir = Path(project_dir_str)
 
         try:
-            from api.database import Schedule, ScheduleOverride, create_database
+            from api.database import Schedule, ScheduleOverride, get_database
 
-            _, SessionLocal = create_database(project_dir)
+            _, SessionLocal = get_database(project_dir)
             db = SessionLocal()
 
             try:
@@ -258,9 +258,9 @@ class SchedulerService:
         project_dir = Path(project_dir_str)
 
         try:
-            from api.database import Schedule, ScheduleOverride, create_database
+            from api.database import Schedule, ScheduleOverride, get_database
 
-            _, SessionLocal = create_database(project_dir)
+            _, SessionLocal = get_database(project_dir)
             db = SessionLocal()
 
             try:
@@ -414,9 +414,9 @@ class SchedulerService:
 
     async def handle_crash_during_window(self, project_name: str, project_dir: Path):
         """Called when agent crashes. Attempt restart with backoff."""
-        from api.database import Schedule, create_database
+        from api.database import Schedule, get_database
 
-        _, SessionLocal = create_database(project_dir)
+        _, SessionLocal = get_database(project_dir)
         db = SessionLocal()
 
         try:
@@ -471,10 +471,10 @@ class SchedulerService:
 
         Uses atomic delete-then-create pattern to prevent race conditions.
         """
-        from api.database import Schedule, ScheduleOverride, create_database
+        from api.database import Schedule, ScheduleOverride, get_database
 
         try:
-            _, SessionLocal = create_database(project_dir)
+            _, SessionLocal = get_database(project_dir)
             db = SessionLocal()
 
             try:
@@ -566,14 +566,14 @@ class SchedulerService:
         self, project_name: str, project_dir: Path, now: datetime
     ):
         """Check if a project should be started on server startup."""
-        from api.database import Schedule, ScheduleOverride, create_database
+        from api.database import Schedule, ScheduleOverride, get_database
 
         db_path = project_dir / "features.db"
         if not db_path.exists():
             return
 
         try:
-            _, SessionLocal = create_database(project_dir)
+            _, SessionLocal = get_database(project_dir)
             db = SessionLocal()
 
             try:
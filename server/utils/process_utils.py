@@ -5,6 +5,7 @@ Process Utilities
 Shared utilities for process management across the codebase.
 """
 
+import asyncio
 import logging
 import subprocess
 from dataclasses import dataclass
@@ -37,6 +38,54 @@ class KillResult:
     parent_forcekilled: bool = False
 
 
+def _kill_children(pid: int, timeout: float, result: KillResult) -> None:
+    """Terminate (then force-kill) all descendants of pid, recording stats in result.
+
+    Raises:
+        psutil.NoSuchProcess, psutil.AccessDenied: If the parent is inaccessible
+    """
+    parent = psutil.Process(pid)
+    # Get all children recursively before terminating
+    children = parent.children(recursive=True)
+    result.children_found = len(children)
+
+    logger.debug(
+        "Killing process tree: PID %d with %d children",
+        pid, len(children)
+    )
+
+    # Terminate children first (graceful)
+    for child in children:
+        try:
+            logger.debug("Terminating child PID %d (%s)", child.pid, child.name())
+            child.terminate()
+        except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+            # NoSuchProcess: already dead
+            # AccessDenied: Windows can raise this for system processes or already-exited processes
+            logger.debug("Child PID %d already gone or inaccessible: %s", child.pid, e)
+
+    # Wait for children to terminate
+    gone, still_alive = psutil.wait_procs(children, timeout=timeout)
+    result.children_terminated = len(gone)
+
+    logger.debug(
+        "Children after graceful wait: %d terminated, %d still alive",
+        len(gone), len(still_alive)
+    )
+
+    # Force kill any remaining children
+    for child in still_alive:
+        try:
+            logger.debug("Force-killing child PID %d", child.pid)
+            child.kill()
+            result.children_killed += 1
+        except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+            logger.debug("Child PID %d gone during force-kill: %s", child.pid, e)
+
+    if result.children_killed > 0:
+        result.status = "partial"
+
+
 def kill_process_tree(proc: subprocess.Popen, timeout: float = 5.0) -> KillResult:
     """Kill a process and all its child processes.
 
@@ -54,46 +103,7 @@ def kill_process_tree(proc: subprocess.Popen, timeout: float = 5.0) -> KillResul
     result = KillResult(status="success", parent_pid=proc.pid)
 
     try:
-        parent = psutil.Process(proc.pid)
-        # Get all children recursively before terminating
-        children = parent.children(recursive=True)
-        result.children_found = len(children)
-
-        logger.debug(
-            "Killing process tree: PID %d with %d children",
-            proc.pid, len(children)
-        )
-
-        # Terminate children first (graceful)
-        for child in children:
-            try:
-                logger.debug("Terminating child PID %d (%s)", child.pid, child.name())
-                child.terminate()
-            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                # NoSuchProcess: already dead
-                # AccessDenied: Windows can raise this for system processes or already-exited processes
-                logger.debug("Child PID %d already gone or inaccessible: %s", child.pid, e)
-
-        # Wait for children to terminate
-        gone, still_alive = psutil.wait_procs(children, timeout=timeout)
-        result.children_terminated = len(gone)
-
-        logger.debug(
-            "Children after graceful wait: %d terminated, %d still alive",
-            len(gone), len(still_alive)
-        )
-
-        # Force kill any remaining children
-        for child in still_alive:
-            try:
-                logger.debug("Force-killing child PID %d", child.pid)
-                child.kill()
-                result.children_killed += 1
-            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                logger.debug("Child PID %d gone during force-kill: %s", child.pid, e)
-
-        if result.children_killed > 0:
-            result.status = "partial"
+        _kill_children(proc.pid, timeout, result)
 
         # Now terminate the parent
         logger.debug("Terminating parent PID %d", proc.pid)
@@ -132,3 +142,56 @@ def kill_process_tree(proc: subprocess.Popen, timeout: float = 5.0) -> KillResul
                 result.status = "failure"
 
     return result
+
+
+async def kill_process_tree_async(
+    proc: asyncio.subprocess.Process, timeout: float = 5.0
+) -> KillResult:
+    """Kill an asyncio subprocess and all its child processes.
+
+    Same behaviour as kill_process_tree(), but the parent is awaited through
+    asyncio so its exit status is reaped by the event loop's child watcher
+    (psutil or Popen-style waits would steal it). The blocking psutil wait
+    for descendants runs in a worker thread.
+
+    Args:
+        proc: The asyncio.subprocess.Process to kill
+        timeout: Seconds to wait for graceful termination before force-killing
+
+    Returns:
+        KillResult with status and statistics about the termination
+    """
+    result = KillResult(status="success", parent_pid=proc.pid)
+
+    if proc.returncode is None:
+        try:
+            await asyncio.to_thread(_kill_children, proc.pid, timeout, result)
+        except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+            logger.debug("Parent PID %d inaccessible (%s), attempting direct cleanup", proc.pid, e)
+
+    try:
+        if proc.returncode is None:
+            logger.debug("Terminating parent PID %d", proc.pid)
+            proc.terminate()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=timeout)
+            logger.debug("Parent PID %d terminated gracefully", proc.pid)
+        except asyncio.TimeoutError:
+            logger.debug("Parent PID %d did not terminate, force-killing", proc.pid)
+            proc.kill()
+            await proc.wait()
+            result.parent_forcekilled = True
+            result.status = "partial"
+    except ProcessLookupError:
+        # Exited between the returncode check and the signal
+        await proc.wait()
+    except OSError as e:
+        logger.debug("Direct termination of PID %d failed: %s", proc.pid, e)
+        result.status = "failure"
+
+    logger.debug(
+        "Process tree kill complete: status=%s, children=%d (terminated=%d, killed=%d)",
+        result.status, result.children_found,
+        result.children_terminated, result.children_killed
+    )
+    return result
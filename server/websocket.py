@@ -18,9 +18,7 @@ from fastapi import WebSocket, WebSocketDisconnect
 from .schemas import AGENT_MASCOTS
 from .services.dev_server_manager import get_devserver_manager
 from .services.process_manager import get_manager
-
-# Lazy imports
-_count_passing_tests = None
+from .services.progress_notifier import get_progress_notifier
 
 logger = logging.getLogger(__name__)
 
@@ -498,67 +496,257 @@ def _get_project_path(project_name: str) -> Path:
     return get_project_path(project_name)
 
 
-def _get_count_passing_tests():
-    """Lazy import of count_passing_tests."""
-    global _count_passing_tests
-    if _count_passing_tests is None:
-        import sys
-        root = Path(__file__).parent.parent
-        if str(root) not in sys.path:
-            sys.path.insert(0, str(root))
-        from progress import count_passing_tests
-        _count_passing_tests = count_passing_tests
-    return _count_passing_tests
+# Maximum number of messages queued for one client before it is considered
+# too slow and disconnected (the UI reconnects and receives a fresh snapshot)
+CLIENT_QUEUE_SIZE = 1000
+
+# WebSocket close code for clients dropped because they could not keep up
+SLOW_CLIENT_CLOSE_CODE = 1013  # "Try Again Later"
+
+
+def _encode(message: dict) -> str:
+    """Serialize a message once for all clients (same encoding as send_json)."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+class ClientConnection:
+    """A WebSocket with a bounded outgoing queue drained by its own sender task.
+
+    Messages are enqueued pre-encoded, so a slow socket only delays itself
+    and never the producers or other clients.
+    """
+
+    def __init__(self, websocket: WebSocket, max_queue: int = CLIENT_QUEUE_SIZE):
+        self.websocket = websocket
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue)
+        self._sender: asyncio.Task | None = None
+        self.closed = False
+
+    def start(self) -> None:
+        self._sender = asyncio.create_task(self._send_loop())
+
+    def offer(self, payload: str) -> bool:
+        """Queue a pre-encoded message. Returns False if the client is full or closed."""
+        if self.closed:
+            return False
+        try:
+            self._queue.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def send(self, message: dict) -> bool:
+        """Queue a message for this client only."""
+        return self.offer(_encode(message))
+
+    async def _send_loop(self) -> None:
+        try:
+            while True:
+                payload = await self._queue.get()
+                await self.websocket.send_text(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.closed = True  # Connection closed
+
+    async def close(self, code: int | None = None) -> None:
+        """Stop the sender task, optionally closing the socket with a code."""
+        self.closed = True
+        if self._sender is not None:
+            self._sender.cancel()
+            try:
+                await self._sender
+            except asyncio.CancelledError:
+                pass
+            self._sender = None
+        if code is not None:
+            try:
+                await self.websocket.close(code=code, reason="Client too slow")
+            except Exception:
+                pass  # Already closed
+
+
+class ProjectChannel:
+    """One tracker pipeline per project, fanned out to all connected clients.
+
+    Agent and dev server callbacks are registered once per project rather
+    than once per socket, so each output line is regex-parsed by a single
+    AgentTracker/OrchestratorTracker pair and each resulting message is
+    JSON-encoded once, regardless of how many browser tabs are watching.
+    """
+
+    def __init__(self, project_name: str, project_dir: Path):
+        self.project_name = project_name
+        self.project_dir = project_dir
+        self.clients: Set[ClientConnection] = set()
+
+        self.agent_tracker = AgentTracker()
+        self.orchestrator_tracker = OrchestratorTracker()
+
+        self.agent_manager = get_manager(project_name, project_dir, ROOT_DIR)
+        self.devserver_manager = get_devserver_manager(project_name, project_dir)
+        self.progress_notifier = get_progress_notifier(project_name, project_dir)
+        self._progress: dict | None = None
+
+    async def start(self) -> None:
+        """Register the shared callbacks."""
+        self.agent_manager.add_output_callback(self._on_output)
+        self.agent_manager.add_status_callback(self._on_status_change)
+        self.devserver_manager.add_output_callback(self._on_dev_output)
+        self.devserver_manager.add_status_callback(self._on_dev_status_change)
+        self._progress = await self.progress_notifier.subscribe(self._on_progress)
+
+    async def stop(self) -> None:
+        """Unregister the shared callbacks."""
+        self.agent_manager.remove_output_callback(self._on_output)
+        self.agent_manager.remove_status_callback(self._on_status_change)
+        self.devserver_manager.remove_output_callback(self._on_dev_output)
+        self.devserver_manager.remove_status_callback(self._on_dev_status_change)
+        await self.progress_notifier.unsubscribe(self._on_progress)
+
+    def snapshot(self) -> list[dict]:
+        """Initial state messages for a newly connected client."""
+        messages: list[dict] = [
+            {
+                "type": "agent_status",
+                "status": self.agent_manager.status,
+            },
+            {
+                "type": "dev_server_status",
+                "status": self.devserver_manager.status,
+                "url": self.devserver_manager.detected_url,
+            },
+        ]
+        if self._progress is not None:
+            messages.append(self._progress)
+        return messages
+
+    def publish(self, message: dict) -> None:
+        """Encode a message once and queue it for every client."""
+        payload = _encode(message)
+        slow = [client for client in list(self.clients) if not client.offer(payload)]
+        for client in slow:
+            self.clients.discard(client)
+            if not client.closed:
+                logger.warning(f"Dropping slow WebSocket client for project {self.project_name}")
+            asyncio.create_task(client.close(code=SLOW_CLIENT_CLOSE_CODE))
+
+    async def _on_output(self, line: str):
+        """Handle agent output - parse once, broadcast to all clients."""
+        # Extract feature ID from line if present
+        feature_id = None
+        agent_index = None
+        match = FEATURE_ID_PATTERN.match(line)
+        if match:
+            feature_id = int(match.group(1))
+            agent_index, _ = await self.agent_tracker.get_agent_info(feature_id)
+
+        # Send the raw log line with optional feature/agent attribution
+        log_msg = {
+            "type": "log",
+            "line": line,
+            "timestamp": datetime.now().isoformat(),
+        }
+        if feature_id is not None:
+            log_msg["featureId"] = feature_id
+        if agent_index is not None:
+            log_msg["agentIndex"] = agent_index
+
+        self.publish(log_msg)
+
+        # Check if this line indicates agent activity (parallel mode)
+        # and emit agent_update messages if so
+        agent_update = await self.agent_tracker.process_line(line)
+        if agent_update:
+            self.publish(agent_update)
+
+        # Also check for orchestrator events and emit orchestrator_update messages
+        orch_update = await self.orchestrator_tracker.process_line(line)
+        if orch_update:
+            self.publish(orch_update)
+
+    async def _on_status_change(self, status: str):
+        """Handle status change - broadcast to all clients."""
+        self.publish({
+            "type": "agent_status",
+            "status": status,
+        })
+        # Reset trackers when agent stops OR crashes to prevent ghost agents on restart
+        if status in ("stopped", "crashed"):
+            await self.agent_tracker.reset()
+            await self.orchestrator_tracker.reset()
+
+    async def _on_dev_output(self, line: str):
+        """Handle dev server output - broadcast to all clients."""
+        self.publish({
+            "type": "dev_log",
+            "line": line,
+            "timestamp": datetime.now().isoformat(),
+        })
+
+    async def _on_dev_status_change(self, status: str):
+        """Handle dev server status change - broadcast to all clients."""
+        self.publish({
+            "type": "dev_server_status",
+            "status": status,
+            "url": self.devserver_manager.detected_url,
+        })
+
+    async def _on_progress(self, message: dict):
+        """Handle progress changes from the shared notifier."""
+        self._progress = message
+        self.publish(message)
 
 
 class ConnectionManager:
     """Manages WebSocket connections per project."""
 
     def __init__(self):
-        # project_name -> set of WebSocket connections
-        self.active_connections: dict[str, Set[WebSocket]] = {}
+        # project_name -> shared channel holding that project's connections
+        self.channels: dict[str, ProjectChannel] = {}
         self._lock = asyncio.Lock()
 
-    async def connect(self, websocket: WebSocket, project_name: str):
-        """Accept a WebSocket connection for a project."""
+    async def connect(self, websocket: WebSocket, project_name: str, project_dir: Path) -> ClientConnection:
+        """Accept a WebSocket connection for a project and queue its initial state."""
         await websocket.accept()
 
         async with self._lock:
-            if project_name not in self.active_connections:
-                self.active_connections[project_name] = set()
-            self.active_connections[project_name].add(websocket)
-
-    async def disconnect(self, websocket: WebSocket, project_name: str):
-        """Remove a WebSocket connection."""
+            channel = self.channels.get(project_name)
+            if channel is None:
+                channel = ProjectChannel(project_name, project_dir)
+                await channel.start()
+                self.channels[project_name] = channel
+
+            client = ClientConnection(websocket)
+            client.start()
+            # Queue the snapshot before joining so it precedes any broadcast
+            for message in channel.snapshot():
+                client.send(message)
+            channel.clients.add(client)
+        return client
+
+    async def disconnect(self, client: ClientConnection, project_name: str):
+        """Remove a WebSocket connection, tearing down the channel when it was the last."""
+        await client.close()
         async with self._lock:
-            if project_name in self.active_connections:
-                self.active_connections[project_name].discard(websocket)
-                if not self.active_connections[project_name]:
-                    del self.active_connections[project_name]
+            channel = self.channels.get(project_name)
+            if channel is None:
+                return
+            channel.clients.discard(client)
+            if not channel.clients:
+                del self.channels[project_name]
+                await channel.stop()
 
     async def broadcast_to_project(self, project_name: str, message: dict):
         """Broadcast a message to all connections for a project."""
-        async with self._lock:
-            connections = list(self.active_connections.get(project_name, set()))
-
-        dead_connections = []
-
-        for connection in connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                dead_connections.append(connection)
-
-        # Clean up dead connections
-        if dead_connections:
-            async with self._lock:
-                for connection in dead_connections:
-                    if project_name in self.active_connections:
-                        self.active_connections[project_name].discard(connection)
+        channel = self.channels.get(project_name)
+        if channel is not None:
+            channel.publish(message)
 
     def get_connection_count(self, project_name: str) -> int:
         """Get number of active connections for a project."""
-        return len(self.active_connections.get(project_name, set()))
+        channel = self.channels.get(project_name)
+        return len(channel.clients) if channel else 0
 
 
 # Global connection manager
@@ -573,40 +761,6 @@ def validate_project_name(name: str) -> bool:
     return bool(re.match(r'^[a-zA-Z0-9_-]{1,50}$', name))
 
 
-async def poll_progress(websocket: WebSocket, project_name: str, project_dir: Path):
-    """Poll database for progress changes and send updates."""
-    count_passing_tests = _get_count_passing_tests()
-    last_passing = -1
-    last_in_progress = -1
-    last_total = -1
-
-    while True:
-        try:
-            passing, in_progress, total = count_passing_tests(project_dir)
-
-            # Only send if changed
-            if passing != last_passing or in_progress != last_in_progress or total != last_total:
-                last_passing = passing
-                last_in_progress = in_progress
-                last_total = total
-                percentage = (passing / total * 100) if total > 0 else 0
-
-                await websocket.send_json({
-                    "type": "progress",
-                    "passing": passing,
-                    "in_progress": in_progress,
-                    "total": total,
-                    "percentage": round(percentage, 1),
-                })
-
-            await asyncio.sleep(2)  # Poll every 2 seconds
-        except asyncio.CancelledError:
-            raise
-        except Exception as e:
-            logger.warning(f"Progress polling error: {e}")
-            break
-
-
 async def project_websocket(websocket: WebSocket, project_name: str):
     """
     WebSocket endpoint for project updates.
@@ -629,130 +783,9 @@ async def project_websocket(websocket: WebSocket, project_name: str):
         await websocket.close(code=4004, reason="Project directory not found")
         return
 
-    await manager.connect(websocket, project_name)
-
-    # Get agent manager and register callbacks
-    agent_manager = get_manager(project_name, project_dir, ROOT_DIR)
-
-    # Create agent tracker for multi-agent mode
-    agent_tracker = AgentTracker()
-
-    # Create orchestrator tracker for observability
-    orchestrator_tracker = OrchestratorTracker()
-
-    async def on_output(line: str):
-        """Handle agent output - broadcast to this WebSocket."""
-        try:
-            # Extract feature ID from line if present
-            feature_id = None
-            agent_index = None
-            match = FEATURE_ID_PATTERN.match(line)
-            if match:
-                feature_id = int(match.group(1))
-                agent_index, _ = await agent_tracker.get_agent_info(feature_id)
-
-            # Send the raw log line with optional feature/agent attribution
-            log_msg = {
-                "type": "log",
-                "line": line,
-                "timestamp": datetime.now().isoformat(),
-            }
-            if feature_id is not None:
-                log_msg["featureId"] = feature_id
-            if agent_index is not None:
-                log_msg["agentIndex"] = agent_index
-
-            await websocket.send_json(log_msg)
-
-            # Check if this line indicates agent activity (parallel mode)
-            # and emit agent_update messages if so
-            agent_update = await agent_tracker.process_line(line)
-            if agent_update:
-                await websocket.send_json(agent_update)
-
-            # Also check for orchestrator events and emit orchestrator_update messages
-            orch_update = await orchestrator_tracker.process_line(line)
-            if orch_update:
-                await websocket.send_json(orch_update)
-        except Exception:
-            pass  # Connection may be closed
-
-    async def on_status_change(status: str):
-        """Handle status change - broadcast to this WebSocket."""
-        try:
-            await websocket.send_json({
-                "type": "agent_status",
-                "status": status,
-            })
-            # Reset trackers when agent stops OR crashes to prevent ghost agents on restart
-            if status in ("stopped", "crashed"):
-                await agent_tracker.reset()
-                await orchestrator_tracker.reset()
-        except Exception:
-            pass  # Connection may be closed
-
-    # Register callbacks
-    agent_manager.add_output_callback(on_output)
-    agent_manager.add_status_callback(on_status_change)
-
-    # Get dev server manager and register callbacks
-    devserver_manager = get_devserver_manager(project_name, project_dir)
-
-    async def on_dev_output(line: str):
-        """Handle dev server output - broadcast to this WebSocket."""
-        try:
-            await websocket.send_json({
-                "type": "dev_log",
-                "line": line,
-                "timestamp": datetime.now().isoformat(),
-            })
-        except Exception:
-            pass  # Connection may be closed
-
-    async def on_dev_status_change(status: str):
-        """Handle dev server status change - broadcast to this WebSocket."""
-        try:
-            await websocket.send_json({
-                "type": "dev_server_status",
-                "status": status,
-                "url": devserver_manager.detected_url,
-            })
-        except Exception:
-            pass  # Connection may be closed
-
-    # Register dev server callbacks
-    devserver_manager.add_output_callback(on_dev_output)
-    devserver_manager.add_status_callback(on_dev_status_change)
-
-    # Start progress polling task
-    poll_task = asyncio.create_task(poll_progress(websocket, project_name, project_dir))
+    client = await manager.connect(websocket, project_name, project_dir)
 
     try:
-        # Send initial agent status
-        await websocket.send_json({
-            "type": "agent_status",
-            "status": agent_manager.status,
-        })
-
-        # Send initial dev server status
-        await websocket.send_json({
-            "type": "dev_server_status",
-            "status": devserver_manager.status,
-            "url": devserver_manager.detected_url,
-        })
-
-        # Send initial progress
-        count_passing_tests = _get_count_passing_tests()
-        passing, in_progress, total = count_passing_tests(project_dir)
-        percentage = (passing / total * 100) if total > 0 else 0
-        await websocket.send_json({
-            "type": "progress",
-            "passing": passing,
-            "in_progress": in_progress,
-            "total": total,
-            "percentage": round(percentage, 1),
-        })
-
         # Keep connection alive and handle incoming messages
         while True:
             try:
@@ -762,7 +795,7 @@ async def project_websocket(websocket: WebSocket, project_name: str):
 
                 # Handle ping
                 if message.get("type") == "ping":
-                    await websocket.send_json({"type": "pong"})
+                    client.send({"type": "pong"})
 
             except WebSocketDisconnect:
                 break
@@ -773,20 +806,5 @@ async def project_websocket(websocket: WebSocket, project_name: str):
                 break
 
     finally:
-        # Clean up
-        poll_task.cancel()
-        try:
-            await poll_task
-        except asyncio.CancelledError:
-            pass
-
-        # Unregister agent callbacks
-        agent_manager.remove_output_callback(on_output)
-        agent_manager.remove_status_callback(on_status_change)
-
-        # Unregister dev server callbacks
-        devserver_manager.remove_output_callback(on_dev_output)
-        devserver_manager.remove_status_callback(on_dev_status_change)
-
-        # Disconnect from manager
-        await manager.disconnect(websocket, project_name)
+        # Disconnect from manager (unregisters shared callbacks with the last client)
+        await manager.disconnect(client, project_name)
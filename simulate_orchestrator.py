@@ -0,0 +1,522 @@
+"""
+Orchestrator Simulator
+======================
+
+Discrete-event simulation of the parallel orchestrator's feature loop, for
+choosing max_concurrency, testing_agent_ratio, POLL_INTERVAL and the ranking
+policy before spending real agent hours.
+
+A project's feature graph is replayed on a virtual clock. Attempt durations
+and outcomes are drawn from the project's recorded attempts (see
+api/feature_durations.py): the feature's own attempts when it has any
+("recorded"), otherwise attempts of its category and then of the whole
+project scaled to its step count, otherwise the estimator's priors.
+
+Decisions go through the same code as ParallelOrchestrator: rank_features()
+with critical paths from the duration estimator and SchedulingIndex scores,
+coding_capacity(), MAX_FEATURE_RETRIES, and the loop's timing (wake on agent
+completion, POLL_INTERVAL timeouts, SPAWN_PAUSE after starting agents).
+Host load is not simulated: pools are sized as an unloaded AdmissionController
+sizes them.
+
+Reported per setting (averaged over --runs seeds):
+- makespan: virtual time until the last feature passes (or the loop stalls)
+- utilization: coding agent time / (max_concurrency * makespan)
+- blocked idle: coding slot time left idle because nothing was ready and
+  unstarted features were waiting on dependencies
+- drain idle: coding slot time left idle in the tail, when every remaining
+  feature was already running
+- latency idle: coding slot time left idle while features were ready
+  (loop pauses and poll timeouts)
+- testing: testing agent time, and coding slot time it displaced under the
+  total agent limit while features were ready
+
+Usage:
+    python simulate_orchestrator.py --project-dir my-app --max-concurrency 2,3,5 --testing-agent-ratio 0,1
+"""
+
+import argparse
+import heapq
+import itertools
+import math
+import random
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from admission import AdmissionLimits
+from api.database import create_database
+from api.dependency_resolver import SchedulingIndex, compute_critical_paths
+from api.feature_durations import (
+    DEFAULT_FAILED_ATTEMPT_RATIO,
+    DEFAULT_FAILURE_RATE,
+    DEFAULT_SECONDS_PER_STEP,
+    DurationEstimator,
+    get_attempts,
+    get_feature_sizes,
+)
+from api.feature_queries import get_scheduling_features
+from api.sqlite_profile import forget_engine
+from parallel_orchestrator import (
+    MAX_FEATURE_RETRIES,
+    POLL_INTERVAL,
+    SPAWN_PAUSE,
+    coding_capacity,
+    rank_features,
+)
+
+POLICIES = ("critical_path", "score", "priority")
+
+# Spread of prior-based attempt durations (sigma of a mean-preserving lognormal)
+_DURATION_SIGMA = 0.5
+
+
+@dataclass(frozen=True)
+class SimulationSettings:
+    """One orchestrator configuration to simulate."""
+    max_concurrency: int = 3
+    testing_agent_ratio: int = 1
+    yolo_mode: bool = False
+    poll_interval: float = POLL_INTERVAL
+    # critical_path (the orchestrator's ranking), score (scheduling score only)
+    # or priority (priority only)
+    policy: str = "critical_path"
+    # Ceiling for coding + testing agents (default: twice max_concurrency,
+    # as AUTOCODER_MAX_TOTAL_AGENTS defaults)
+    max_total_agents: int | None = None
+
+    def admission_limits(self) -> AdmissionLimits:
+        """Pool sizes of an unloaded AdmissionController with these ceilings."""
+        total = max(self.max_total_agents or 2 * self.max_concurrency, self.max_concurrency)
+        coding = max(1, min(self.max_concurrency, total))
+        testing = min(self.max_concurrency, max(0, total - coding))
+        return AdmissionLimits(coding=coding, testing=testing, total=total, reason="simulated")
+
+
+@dataclass
+class SimulationResult:
+    """Outcome of one simulated run (or the mean of several)."""
+    settings: SimulationSettings
+    makespan: float = 0.0
+    passed: int = 0
+    gave_up: int = 0  # Features that failed MAX_FEATURE_RETRIES times
+    stalled: bool = False  # Work remained that could never become ready
+    coding_seconds: float = 0.0
+    testing_seconds: float = 0.0
+    blocked_idle_seconds: float = 0.0
+    drain_idle_seconds: float = 0.0
+    latency_idle_seconds: float = 0.0
+    testing_displaced_seconds: float = 0.0
+
+    @property
+    def utilization(self) -> float:
+        capacity = self.settings.max_concurrency * self.makespan
+        return self.coding_seconds / capacity if capacity > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "utilization": self.utilization}
+
+
+class AttemptSampler:
+    """Draws (duration, passed) for feature attempts from recorded history."""
+
+    def __init__(
+        self,
+        sizes: dict[int, tuple[str, int]],
+        attempts: list[tuple[int, str, int, float, str]],
+        use_feature_history: bool = True,
+    ):
+        """Build the sampler.
+
+        Args:
+            sizes: Map of feature_id -> (category, step count)
+            attempts: Recorded (feature_id, category, steps, seconds, outcome) attempts
+            use_feature_history: Replay a feature's own attempts when it has any
+                ("recorded"); otherwise only category and project history is used ("sampled")
+        """
+        self._sizes = sizes
+        self._by_feature: dict[int, list[tuple[float, bool]]] = {}
+        self._by_category: dict[str, list[tuple[float, bool]]] = {}
+        self._all: list[tuple[float, bool]] = []
+        for feature_id, category, steps, seconds, outcome in attempts:
+            passed = outcome == "passed"
+            if use_feature_history:
+                self._by_feature.setdefault(feature_id, []).append((seconds, passed))
+            per_step = (seconds / max(steps, 1), passed)
+            self._by_category.setdefault(category, []).append(per_step)
+            self._all.append(per_step)
+
+        # Mean passed attempt, the default length of a testing agent session
+        passed_seconds = [seconds for _, _, _, seconds, outcome in attempts if outcome == "passed"]
+        if passed_seconds:
+            self.mean_seconds = sum(passed_seconds) / len(passed_seconds)
+        else:
+            step_counts = [max(count, 1) for _, count in sizes.values()] or [1]
+            self.mean_seconds = DEFAULT_SECONDS_PER_STEP * sum(step_counts) / len(step_counts)
+
+    def sample(self, feature_id: int, rng: random.Random) -> tuple[float, bool]:
+        """Duration in seconds and outcome of one attempt on a feature."""
+        own = self._by_feature.get(feature_id)
+        if own:
+            return rng.choice(own)
+        category, steps = self._sizes.get(feature_id, ("", 1))
+        pool = self._by_category.get(category) or self._all
+        if pool:
+            per_step, passed = rng.choice(pool)
+            return per_step * max(steps, 1), passed
+        passed = rng.random() >= DEFAULT_FAILURE_RATE
+        seconds = DEFAULT_SECONDS_PER_STEP * max(steps, 1) * _lognormal(rng)
+        return (seconds if passed else seconds * DEFAULT_FAILED_ATTEMPT_RATIO), passed
+
+
+def _lognormal(rng: random.Random) -> float:
+    """Lognormal factor with mean 1."""
+    return rng.lognormvariate(-_DURATION_SIGMA ** 2 / 2, _DURATION_SIGMA)
+
+
+class _Simulation:
+    """One run of the orchestrator's feature loop on a virtual clock."""
+
+    def __init__(
+        self,
+        features: list[dict],
+        estimates: dict[int, float],
+        sampler: AttemptSampler,
+        settings: SimulationSettings,
+        testing_seconds: float,
+        rng: random.Random,
+        resume: bool,
+    ):
+        self.settings = settings
+        self.sampler = sampler
+        self.rng = rng
+        self.testing_seconds = testing_seconds
+        self.limits = settings.admission_limits()
+        self.result = SimulationResult(settings=settings)
+
+        self.features = {f["id"]: {**f, "passes": resume and f["passes"]} for f in features}
+        self.estimates = estimates
+        self.index = SchedulingIndex(list(self.features.values()))
+        self.passing = {fid for fid, f in self.features.items() if f["passes"]}
+        self.failures: dict[int, int] = {}
+        self.dependents: dict[int, list[int]] = {}
+        # Dependencies not passing yet; missing dependencies never pass
+        self.unmet: dict[int, int] = {}
+        for fid, f in self.features.items():
+            if fid in self.passing:
+                continue
+            deps = [d for d in f.get("dependencies") or [] if d not in self.passing]
+            self.unmet[fid] = len(deps)
+            for dep_id in deps:
+                self.dependents.setdefault(dep_id, []).append(fid)
+        self.ready = {fid for fid, count in self.unmet.items() if count == 0}
+        self.pending = len(self.unmet)
+
+        self.now = 0.0
+        self.completed_event = False
+        # (end time, sequence, kind, feature_id, passed)
+        self.agents: list[tuple[float, int, str, int, bool]] = []
+        self.sequence = itertools.count()
+        self.running_coding: set[int] = set()
+        self.running_testing = 0
+        self.critical_paths: dict[int, float] | None = None
+
+    # Time -------------------------------------------------------------
+
+    def _advance(self, until: float) -> None:
+        """Move the clock to `until`, completing agents on the way."""
+        while self.agents and self.agents[0][0] <= until:
+            end = self.agents[0][0]
+            self._account(end)
+            while self.agents and self.agents[0][0] == end:
+                self._complete(*heapq.heappop(self.agents)[2:])
+        self._account(until)
+
+    def _account(self, until: float) -> None:
+        """Add the time up to `until` to the utilization counters."""
+        elapsed = until - self.now
+        if elapsed <= 0:
+            return
+        result = self.result
+        coding = len(self.running_coding)
+        result.coding_seconds += coding * elapsed
+        result.testing_seconds += self.running_testing * elapsed
+        idle = max(0, self.settings.max_concurrency - coding)
+        remaining = self._remaining()
+        if idle and remaining:
+            if self.ready:
+                displaced = min(idle, self.settings.max_concurrency - coding_capacity(
+                    self.limits, coding, self.running_testing
+                ))
+                result.testing_displaced_seconds += max(0, displaced) * elapsed
+                result.latency_idle_seconds += (idle - max(0, displaced)) * elapsed
+            elif remaining > coding:
+                # Unstarted features are waiting on dependencies
+                result.blocked_idle_seconds += idle * elapsed
+            else:
+                result.drain_idle_seconds += idle * elapsed
+        self.now = until
+
+    def _wait(self, timeout: float) -> None:
+        """_wait_for_agent_completion: return on the next completion or after timeout."""
+        if self.completed_event:
+            self.completed_event = False
+            return
+        deadline = self.now + timeout
+        if self.agents and self.agents[0][0] <= deadline:
+            self._advance(self.agents[0][0])
+            self.completed_event = False
+        else:
+            self._advance(deadline)
+
+    # State ------------------------------------------------------------
+
+    def _complete(self, kind: str, feature_id: int, passed: bool) -> None:
+        self.completed_event = True
+        if kind == "testing":
+            self.running_testing -= 1
+            return
+        self.running_coding.discard(feature_id)
+        self.result.makespan = self.now
+        if passed:
+            self.passing.add(feature_id)
+            self.features[feature_id]["passes"] = True
+            self.index.mark_passing(feature_id)
+            self.critical_paths = None
+            self.result.passed += 1
+            for child_id in self.dependents.get(feature_id, ()):
+                self.unmet[child_id] -= 1
+                if self.unmet[child_id] == 0:
+                    self.ready.add(child_id)
+        else:
+            self.failures[feature_id] = self.failures.get(feature_id, 0) + 1
+            if self.failures[feature_id] >= MAX_FEATURE_RETRIES:
+                self.result.gave_up += 1
+            else:
+                self.ready.add(feature_id)
+
+    def _remaining(self) -> int:
+        """Features that can still pass: not passing and not given up on."""
+        return self.pending - self.result.passed - self.result.gave_up
+
+    def _start(self, kind: str, feature_id: int, seconds: float, passed: bool) -> None:
+        heapq.heappush(self.agents, (self.now + seconds, next(self.sequence), kind, feature_id, passed))
+
+    def _ranked_ready(self) -> list[dict]:
+        policy = self.settings.policy
+        critical: dict[int, float] = {}
+        if policy == "critical_path":
+            if self.critical_paths is None:
+                self.critical_paths = compute_critical_paths(list(self.features.values()), self.estimates)
+            critical = self.critical_paths
+        score = self.index.score if policy != "priority" else (lambda fid: 0.0)
+        return rank_features([self.features[fid] for fid in self.ready], critical, score)
+
+    def _maintain_testing_agents(self) -> None:
+        settings = self.settings
+        if settings.yolo_mode or settings.testing_agent_ratio == 0 or not self.passing:
+            return
+        while (
+            self.running_testing < min(settings.testing_agent_ratio, self.limits.testing)
+            and len(self.running_coding) + self.running_testing < self.limits.total
+        ):
+            self.running_testing += 1
+            self._start("testing", 0, self.testing_seconds * _lognormal(self.rng), True)
+
+    # Loop -------------------------------------------------------------
+
+    def run(self) -> SimulationResult:
+        """ParallelOrchestrator.run_loop's feature loop, minus I/O."""
+        poll = self.settings.poll_interval
+        while self._remaining():
+            self._maintain_testing_agents()
+
+            current = len(self.running_coding)
+            capacity = coding_capacity(self.limits, current, self.running_testing)
+            if current >= capacity:
+                self._wait(poll)
+                continue
+
+            if not self.ready:
+                if current > 0:
+                    self._wait(poll)
+                    continue
+                # Nothing running and nothing can become ready
+                self.result.stalled = True
+                break
+
+            for feature in self._ranked_ready()[:capacity - current]:
+                fid = feature["id"]
+                self.ready.discard(fid)
+                self.running_coding.add(fid)
+                seconds, passed = self.sampler.sample(fid, self.rng)
+                self._start("coding", fid, seconds, passed)
+            self._advance(self.now + SPAWN_PAUSE)
+
+        if self.result.stalled:
+            self.result.makespan = self.now
+        return self.result
+
+
+def simulate(
+    features: list[dict],
+    estimates: dict[int, float],
+    sampler: AttemptSampler,
+    settings: SimulationSettings,
+    runs: int = 5,
+    seed: int = 0,
+    testing_seconds: float | None = None,
+    resume: bool = False,
+) -> SimulationResult:
+    """Simulate the feature loop `runs` times and average the results.
+
+    Args:
+        features: Feature dicts with id, priority, passes and dependencies
+        estimates: Map of feature_id -> estimated seconds, as the orchestrator would see them
+        sampler: Source of actual attempt durations and outcomes
+        settings: Orchestrator configuration
+        runs: Number of seeded runs to average
+        seed: Seed of the first run
+        testing_seconds: Mean testing agent session (default: the mean passed attempt)
+        resume: Start from the features' current passes state instead of from scratch
+    """
+    if settings.policy not in POLICIES:
+        raise ValueError(f"Unknown policy: {settings.policy}")
+    mean = SimulationResult(settings=settings)
+    averaged = (
+        "makespan", "passed", "gave_up", "coding_seconds", "testing_seconds",
+        "blocked_idle_seconds", "drain_idle_seconds", "latency_idle_seconds", "testing_displaced_seconds",
+    )
+    for run in range(runs):
+        result = _Simulation(
+            features, estimates, sampler, settings,
+            testing_seconds if testing_seconds is not None else sampler.mean_seconds,
+            random.Random(seed + run),
+            resume,
+        ).run()
+        for name in averaged:
+            setattr(mean, name, getattr(mean, name) + getattr(result, name) / runs)
+        mean.stalled = mean.stalled or result.stalled
+    return mean
+
+
+def load_project(project_dir: Path, use_feature_history: bool = True) -> tuple[list[dict], dict[int, float], AttemptSampler]:
+    """Read a project's graph, duration estimates and attempt history.
+
+    Returns:
+        (features, estimated seconds per feature, sampler)
+    """
+    engine, session_maker = create_database(project_dir)
+    session = session_maker()
+    try:
+        features = get_scheduling_features(session)
+        sizes = get_feature_sizes(session)
+        estimator = DurationEstimator.load(session)
+        attempts = get_attempts(session)
+    finally:
+        session.close()
+        engine.dispose()
+        forget_engine(engine)
+    estimates = {fid: estimator.estimate(category, steps, fid) for fid, (category, steps) in sizes.items()}
+    return features, estimates, AttemptSampler(sizes, attempts, use_feature_history)
+
+
+def _format_hours(seconds: float) -> str:
+    return f"{seconds / 3600:.1f}h"
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _float_list(value: str) -> list[float]:
+    return [float(v) for v in value.split(",") if v.strip()]
+
+
+def main():
+    """Simulate a grid of settings for a project and print a comparison table."""
+    import json
+
+    from registry import get_project_path
+
+    parser = argparse.ArgumentParser(description="Simulate orchestrator settings on a project's feature graph")
+    parser.add_argument("--project-dir", required=True, help="Project directory path or registered project name")
+    parser.add_argument("--max-concurrency", "-p", type=_int_list, default=[3], help="Comma-separated values (default: 3)")
+    parser.add_argument("--testing-agent-ratio", type=_int_list, default=[1], help="Comma-separated values (default: 1)")
+    parser.add_argument("--poll-interval", type=_float_list, default=[POLL_INTERVAL],
+                        help=f"Comma-separated seconds (default: {POLL_INTERVAL})")
+    parser.add_argument("--policy", default="critical_path",
+                        help=f"Comma-separated ranking policies: {', '.join(POLICIES)} (default: critical_path)")
+    parser.add_argument("--yolo", action="store_true", help="Simulate YOLO mode (no testing agents)")
+    parser.add_argument("--durations", choices=("recorded", "sampled"), default="recorded",
+                        help="recorded: replay each feature's own attempts when it has any; "
+                             "sampled: only category and project history (default: recorded)")
+    parser.add_argument("--testing-seconds", type=float, default=None,
+                        help="Mean testing agent session in seconds (default: mean passed attempt)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Simulate only the remaining work instead of the whole project")
+    parser.add_argument("--runs", type=int, default=5, help="Seeded runs per setting (default: 5)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    project_dir = Path(args.project_dir)
+    if not project_dir.is_absolute():
+        project_dir = get_project_path(args.project_dir) or project_dir
+    if not (project_dir / "features.db").exists():
+        print(f"Error: No features.db in {project_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    policies = [p.strip() for p in args.policy.split(",") if p.strip()]
+    unknown = [p for p in policies if p not in POLICIES]
+    if unknown:
+        parser.error(f"unknown policy: {', '.join(unknown)}")
+
+    features, estimates, sampler = load_project(project_dir, args.durations == "recorded")
+    results = [
+        simulate(
+            features, estimates, sampler,
+            SimulationSettings(
+                max_concurrency=concurrency,
+                testing_agent_ratio=ratio,
+                yolo_mode=args.yolo,
+                poll_interval=poll,
+                policy=policy,
+            ),
+            runs=args.runs,
+            seed=args.seed,
+            testing_seconds=args.testing_seconds,
+            resume=args.resume,
+        )
+        for concurrency, ratio, poll, policy in itertools.product(
+            args.max_concurrency, args.testing_agent_ratio, args.poll_interval, policies
+        )
+    ]
+
+    if args.json:
+        print(json.dumps([r.to_dict() for r in results], indent=2))
+        return
+
+    pending = sum(1 for f in features if not (args.resume and f["passes"]))
+    print(f"{pending} features to run, {args.runs} runs per setting, {args.durations} durations")
+    header = ("conc", "test", "poll", "policy", "makespan", "passed", "util", "blocked", "drain", "latency", "testing", "displaced")
+    print("{:>4} {:>4} {:>5} {:<13} {:>9} {:>7} {:>5} {:>8} {:>8} {:>8} {:>8} {:>9}".format(*header))
+    for r in results:
+        s = r.settings
+        print("{:>4} {:>4} {:>5g} {:<13} {:>9} {:>7} {:>5} {:>8} {:>8} {:>8} {:>8} {:>9}".format(
+            s.max_concurrency, 0 if s.yolo_mode else s.testing_agent_ratio, s.poll_interval, s.policy,
+            _format_hours(r.makespan) + ("*" if r.stalled else ""),
+            f"{math.floor(r.passed + 0.5)}/{pending}",
+            f"{r.utilization:.0%}",
+            _format_hours(r.blocked_idle_seconds),
+            _format_hours(r.drain_idle_seconds),
+            _format_hours(r.latency_idle_seconds),
+            _format_hours(r.testing_seconds),
+            _format_hours(r.testing_displaced_seconds),
+        ))
+    if any(r.stalled for r in results):
+        print("* stalled: some features could never become ready (failed dependencies, cycles or missing IDs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Stub Agent Worker
+=================
+
+Stand-in for ``autonomous_agent_demo.py --worker`` that does no LLM work, so
+orchestrator overhead can be measured on its own (see benchmark_orchestrator.py).
+
+Speaks the worker pool protocol (see worker_pool.py): prints the ready
+marker, takes JSON assignments on stdin and prints a done marker after each.
+Every assignment goes through the same feature MCP server a real agent
+session would use (client.get_feature_mcp_config: the orchestrator's shared
+HTTP server, or a stdio server of its own):
+
+- coding: feature_claim_and_get, print output lines over --work-seconds,
+  then feature_mark_passing (or exit status 1 with probability --fail-rate)
+- testing: feature_get_by_id, then the same output and sleep
+
+Usage:
+    python stub_agent.py --project-dir my-app --work-seconds 1 --output-lines 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+import httpx
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamable_http_client
+from mcp.types import TextContent
+
+from client import get_feature_mcp_config
+from worker_pool import WORKER_DONE_MARKER, WORKER_READY_MARKER
+
+
+@asynccontextmanager
+async def feature_session(project_dir: Path):
+    """Open an MCP session to the features server, as an agent session would."""
+    config = get_feature_mcp_config(project_dir)
+    if config.get("type") == "http":
+        async with httpx.AsyncClient(headers=config["headers"]) as http:
+            async with streamable_http_client(config["url"], http_client=http) as (read, write, _):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    yield session
+    else:
+        params = StdioServerParameters(
+            command=config["command"],
+            args=config["args"],
+            env={**os.environ, **config["env"]},
+        )
+        async with stdio_client(params) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                yield session
+
+
+async def call_tool(session: ClientSession, name: str, **arguments) -> dict:
+    """Call a feature tool and decode its JSON result."""
+    result = await session.call_tool(name, arguments)
+    if result.isError:
+        raise RuntimeError(f"{name} failed: {result.content}")
+    content = result.content[0] if result.content else None
+    if not isinstance(content, TextContent):
+        raise RuntimeError(f"{name} returned no text content: {result.content}")
+    payload: dict[str, Any] = json.loads(content.text)
+    if "error" in payload:
+        raise RuntimeError(f"{name}: {payload['error']}")
+    return payload
+
+
+async def run_assignment(assignment: dict, args: argparse.Namespace) -> int:
+    """Run one assignment. Returns the exit status (0 = success)."""
+    agent_type = assignment["agent_type"]
+    feature_id = assignment.get("feature_id") or assignment.get("testing_feature_id")
+    print(f"[stub] {agent_type} agent for feature #{feature_id}", flush=True)
+
+    async with feature_session(args.project_dir) as session:
+        if agent_type == "coding":
+            feature = await call_tool(session, "feature_claim_and_get", feature_id=feature_id)
+        else:
+            feature = await call_tool(session, "feature_get_by_id", feature_id=feature_id)
+
+        lines = max(args.output_lines, 1)
+        for i in range(lines):
+            print(f"[stub] {feature['name']}: step {i + 1}/{lines}", flush=True)
+            await asyncio.sleep(args.work_seconds / lines)
+
+        if agent_type != "coding":
+            return 0
+        if random.random() < args.fail_rate:
+            print(f"[stub] feature #{feature_id} failed", flush=True)
+            return 1
+        await call_tool(session, "feature_mark_passing", feature_id=feature_id)
+    return 0
+
+
+async def run_worker(args: argparse.Namespace) -> None:
+    """Serve assignments from stdin until it is closed."""
+    print(WORKER_READY_MARKER, flush=True)
+    while True:
+        line = await asyncio.to_thread(sys.stdin.readline)
+        if not line:
+            break  # Orchestrator closed the pipe
+        if not line.strip():
+            continue
+        try:
+            status = await run_assignment(json.loads(line), args)
+        except Exception as e:
+            print(f"[stub] error: {e}", flush=True)
+            status = 1
+        print(f"{WORKER_DONE_MARKER} {json.dumps({'status': status})}", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stub agent worker for orchestrator benchmarks")
+    parser.add_argument("--project-dir", type=Path, required=True, help="Project directory path")
+    parser.add_argument("--worker", action="store_true", help="Accepted for compatibility (always a worker)")
+    parser.add_argument("--work-seconds", type=float, default=0.0, help="Simulated work per assignment")
+    parser.add_argument("--output-lines", type=int, default=3, help="Output lines per assignment")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Probability a coding assignment fails")
+    args = parser.parse_args()
+    asyncio.run(run_worker(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Database Migration Tests
+========================
+
+Schema versioning (PRAGMA user_version) and the ordered migrations in
+api/database.py, run against temporary project directories: a new database,
+a database created by the original unversioned schema, and re-runs.
+Run with: python test_database.py
+"""
+
+import sqlite3
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+from sqlalchemy import text
+
+import api.database as database
+from api.database import SCHEMA_VERSION, Feature, allocate_priorities, create_database, get_schema_version
+from api.sqlite_profile import forget_engine
+
+# Schema of a features.db written before schema versioning (user_version 0)
+BASELINE_SCHEMA = """
+CREATE TABLE features (
+    id INTEGER NOT NULL,
+    priority INTEGER NOT NULL,
+    category VARCHAR(100) NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    description TEXT NOT NULL,
+    steps JSON NOT NULL,
+    passes BOOLEAN NOT NULL,
+    in_progress BOOLEAN NOT NULL,
+    dependencies JSON,
+    PRIMARY KEY (id)
+);
+CREATE INDEX ix_features_passes ON features (passes);
+CREATE INDEX ix_features_id ON features (id);
+CREATE INDEX ix_features_in_progress ON features (in_progress);
+CREATE INDEX ix_feature_status ON features (passes, in_progress);
+CREATE INDEX ix_features_priority ON features (priority);
+CREATE TABLE schedules (
+    id INTEGER NOT NULL,
+    project_name VARCHAR(50) NOT NULL,
+    start_time VARCHAR(5) NOT NULL,
+    duration_minutes INTEGER NOT NULL,
+    days_of_week INTEGER NOT NULL,
+    enabled BOOLEAN NOT NULL,
+    yolo_mode BOOLEAN NOT NULL,
+    model VARCHAR(50),
+    max_concurrency INTEGER NOT NULL,
+    crash_count INTEGER NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    CONSTRAINT ck_schedule_duration CHECK (duration_minutes >= 1 AND duration_minutes <= 1440),
+    CONSTRAINT ck_schedule_days CHECK (days_of_week >= 0 AND days_of_week <= 127),
+    CONSTRAINT ck_schedule_concurrency CHECK (max_concurrency >= 1 AND max_concurrency <= 5),
+    CONSTRAINT ck_schedule_crash_count CHECK (crash_count >= 0)
+);
+CREATE INDEX ix_schedules_id ON schedules (id);
+CREATE INDEX ix_schedules_project_name ON schedules (project_name);
+CREATE INDEX ix_schedules_enabled ON schedules (enabled);
+CREATE TABLE schedule_overrides (
+    id INTEGER NOT NULL,
+    schedule_id INTEGER NOT NULL,
+    override_type VARCHAR(10) NOT NULL,
+    expires_at DATETIME NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(schedule_id) REFERENCES schedules (id) ON DELETE CASCADE
+);
+CREATE INDEX ix_schedule_overrides_id ON schedule_overrides (id);
+"""
+
+CURRENT_TABLES = {
+    "features", "feature_content", "feature_dependencies", "feature_tombstones", "feature_attempts",
+    "scheduling_state", "priority_sequence", "data_version", "schedules", "schedule_overrides",
+}
+
+
+@contextmanager
+def opened_database(project_dir: Path):
+    """create_database() on project_dir, disposing the engine afterwards."""
+    engine, SessionLocal = create_database(project_dir)
+    try:
+        yield engine, SessionLocal
+    finally:
+        engine.dispose()
+        forget_engine(engine)
+
+
+def _tables(engine) -> set[str]:
+    with engine.connect() as conn:
+        return set(conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars())
+
+
+def _columns(engine, table: str) -> set[str]:
+    with engine.connect() as conn:
+        return {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+
+
+def _write_baseline_database(project_dir: Path) -> None:
+    conn = sqlite3.connect(project_dir / "features.db")
+    conn.executescript(BASELINE_SCHEMA)
+    conn.executemany(
+        "INSERT INTO features (id, priority, category, name, description, steps, passes, in_progress, dependencies) "
+        "VALUES (?, ?, 'core', ?, ?, ?, ?, 0, ?)",
+        [
+            (1, 1, "Login", "Users can log in", '["open page", "submit"]', 1, None),
+            (2, 2, "Profile", "Users edit profiles", '["edit"]', 0, "[1]"),
+            (3, 3, "Admin", "Admins manage users", "[]", 0, "[1, 2]"),
+        ],
+    )
+    conn.execute(
+        "INSERT INTO schedules (id, project_name, start_time, duration_minutes, days_of_week, enabled, "
+        "yolo_mode, max_concurrency, crash_count, created_at) "
+        "VALUES (1, 'demo', '09:00', 60, 127, 1, 0, 5, 0, '2025-01-01 00:00:00')"
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_new_database_is_stamped_current():
+    """A new database gets every table and the current schema version."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with opened_database(Path(tmpdir)) as (engine, _):
+            assert get_schema_version(engine) == SCHEMA_VERSION
+            assert CURRENT_TABLES <= _tables(engine), _tables(engine)
+            assert not {"description", "steps"} & _columns(engine, "features")
+
+
+def test_baseline_database_is_migrated():
+    """A database from the unversioned schema keeps its data through every migration."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+        _write_baseline_database(project_dir)
+
+        with opened_database(project_dir) as (engine, SessionLocal):
+            assert get_schema_version(engine) == SCHEMA_VERSION
+            assert CURRENT_TABLES <= _tables(engine), _tables(engine)
+
+            # Description and steps moved to feature_content
+            assert not {"description", "steps"} & _columns(engine, "features")
+            session = SessionLocal()
+            try:
+                login = session.get(Feature, 1)
+                assert login.description == "Users can log in"
+                assert login.steps == ["open page", "submit"]
+                assert login.passes is True
+
+                # JSON dependencies backfilled into the edge table
+                with engine.connect() as conn:
+                    edges = set(conn.execute(text("SELECT feature_id, depends_on_id FROM feature_dependencies")))
+                assert edges == {(2, 1), (3, 1), (3, 2)}, edges
+
+                # The priority sequence continues after the existing features
+                assert allocate_priorities(session, 2) == 4
+                assert allocate_priorities(session, 1) == 6
+                session.rollback()
+
+                # Scores are stale until the first reader computes them
+                with engine.connect() as conn:
+                    graph, scored = conn.execute(
+                        text("SELECT graph_version, scored_version FROM scheduling_state")
+                    ).one()
+                assert graph > scored
+
+                # Schedules kept, and the concurrency cap was relaxed
+                with engine.connect() as conn:
+                    conn.execute(text("UPDATE schedules SET max_concurrency = 10 WHERE id = 1"))
+                    conn.commit()
+                    assert conn.execute(text("SELECT max_concurrency FROM schedules")).scalar() == 10
+            finally:
+                session.close()
+
+
+def test_current_database_skips_migrations():
+    """Reopening a current database runs no migration."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+        with opened_database(project_dir):
+            pass
+
+        def fail(engine, version):
+            raise AssertionError(f"migrations ran from version {version}")
+
+        run_migrations = database._run_migrations
+        database._run_migrations = fail
+        try:
+            with opened_database(project_dir) as (engine, _):
+                assert get_schema_version(engine) == SCHEMA_VERSION
+        finally:
+            database._run_migrations = run_migrations
+
+
+def test_migrations_are_idempotent():
+    """Every migration re-runs harmlessly on a migrated database (user_version reset to 0)."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+        _write_baseline_database(project_dir)
+        with opened_database(project_dir) as (engine, _):
+            with engine.connect() as conn:
+                conn.execute(text("PRAGMA user_version = 0"))
+                conn.commit()
+
+        with opened_database(project_dir) as (engine, SessionLocal):
+            assert get_schema_version(engine) == SCHEMA_VERSION
+            session = SessionLocal()
+            try:
+                features = session.query(Feature).order_by(Feature.id).all()
+                assert [f.name for f in features] == ["Login", "Profile", "Admin"]
+                assert features[2].description == "Admins manage users"
+                assert features[2].dependencies == [1, 2]
+            finally:
+                session.close()
+
+
+def test_old_sqlite_is_rejected():
+    """create_database refuses a SQLite library without RETURNING / DROP COLUMN."""
+    with mock.patch.object(sqlite3, "sqlite_version_info", (3, 31, 1)), tempfile.TemporaryDirectory() as tmpdir:
+        try:
+            create_database(Path(tmpdir))
+        except RuntimeError as e:
+            assert "3.35.0" in str(e), e
+        else:
+            raise AssertionError("create_database accepted SQLite 3.31.1")
+
+
+def main():
+    tests = [
+        test_new_database_is_stamped_current,
+        test_baseline_database_is_migrated,
+        test_current_database_skips_migrations,
+        test_migrations_are_idempotent,
+        test_old_sqlite_is_rejected,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  PASS: {test.__name__}")
+        except AssertionError as e:
+            print(f"  FAIL: {test.__name__}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Dependency Resolver Tests
+=========================
+
+Randomized checks that the incrementally maintained SchedulingIndex matches
+an index built from scratch after every update, and that the scores it
+reports as changed are all the scores that moved.
+Run with: python test_dependency_resolver.py
+"""
+
+import random
+import sys
+
+from api.dependency_resolver import SchedulingIndex
+
+
+def _fresh(features: dict[int, dict]) -> SchedulingIndex:
+    return SchedulingIndex([dict(f, dependencies=sorted(f["dependencies"])) for f in features.values()])
+
+
+def _assert_matches(index: SchedulingIndex, features: dict[int, dict], context: str) -> None:
+    fresh = _fresh(features)
+    assert index._downstream == fresh._downstream, f"{context}: downstream {index._downstream} != {fresh._downstream}"
+    assert index._depth == fresh._depth, f"{context}: depth {index._depth} != {fresh._depth}"
+    assert index.scores() == fresh.scores(), context
+
+
+def _random_updates(seed: int, steps: int = 60, id_space: int = 25) -> None:
+    """Apply random feature/edge/passing updates, comparing against a rebuild after each.
+
+    Scores taken with take_changed_scores() are kept in `persisted`, the way
+    refresh_scheduling_scores keeps the column, and must match every score.
+    """
+    rng = random.Random(seed)
+    features: dict[int, dict] = {}
+    persisted: dict[int, float] = {}
+    index = SchedulingIndex([])
+    for step in range(steps):
+        op = rng.choice((
+            "add_feature", "add_feature", "add_edge", "remove_edge", "set_dependencies",
+            "mark_passing", "set_priority", "remove_feature",
+        ))
+        fid = rng.randrange(1, id_space)
+        context = f"seed {seed} step {step} {op}({fid})"
+        try:
+            if op == "add_feature" and fid not in features:
+                # Dependencies may name features that don't exist yet
+                deps = sorted({rng.randrange(1, id_space) for _ in range(rng.randint(0, 3))} - {fid})
+                passes = rng.random() < 0.3
+                features[fid] = {"id": fid, "priority": rng.randint(1, 12), "passes": passes, "dependencies": set(deps)}
+                index.add_feature(fid, features[fid]["priority"], deps, passes)
+            elif op == "add_edge" and fid in features:
+                dep_id = rng.randrange(1, id_space)
+                if dep_id != fid:
+                    features[fid]["dependencies"].add(dep_id)
+                    index.add_edge(fid, dep_id)
+            elif op == "remove_edge" and fid in features and features[fid]["dependencies"]:
+                dep_id = rng.choice(sorted(features[fid]["dependencies"]))
+                features[fid]["dependencies"].discard(dep_id)
+                index.remove_edge(fid, dep_id)
+            elif op == "set_dependencies" and fid in features:
+                deps = sorted({rng.randrange(1, id_space) for _ in range(rng.randint(0, 3))} - {fid})
+                features[fid]["dependencies"] = set(deps)
+                index.set_dependencies(fid, deps)
+            elif op == "mark_passing" and fid in features:
+                features[fid]["passes"] = not features[fid]["passes"]
+                index.mark_passing(fid, features[fid]["passes"])
+            elif op == "set_priority" and fid in features:
+                features[fid]["priority"] = rng.randint(1, 12)
+                index.set_priority(fid, features[fid]["priority"])
+            elif op == "remove_feature" and fid in features:
+                del features[fid]
+                index.remove_feature(fid)
+                persisted.pop(fid, None)
+        except ValueError:
+            # Rejected cycle: callers (FeatureGraph) rebuild from their own state
+            index = _fresh(features)
+        _assert_matches(index, features, context)
+        persisted.update(index.take_changed_scores())
+        assert persisted == index.scores(), f"{context}: changed scores missed {persisted} != {index.scores()}"
+
+
+def test_incremental_matches_rebuild():
+    """Random update sequences keep the incremental index equal to a fresh one."""
+    for seed in range(300):
+        _random_updates(seed)
+
+
+def test_add_feature_links_every_waiting_dependent_once():
+    """Dependents waiting on a missing feature are counted once, even when one forces a rebuild."""
+    features = {
+        1: {"id": 1, "priority": 1, "dependencies": {10, 2}},
+        2: {"id": 2, "priority": 1, "dependencies": {1}},  # Cycle with 1
+        3: {"id": 3, "priority": 1, "dependencies": {10}},
+        4: {"id": 4, "priority": 1, "dependencies": {10}},
+    }
+    index = _fresh(features)
+    features[10] = {"id": 10, "priority": 1, "dependencies": set()}
+    index.add_feature(10, 1, [])
+    _assert_matches(index, features, "waiting dependents")
+    assert index._downstream[10] == 2
+
+
+def main():
+    tests = [test_incremental_matches_rebuild, test_add_feature_links_every_waiting_dependent_once]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  PASS: {test.__name__}")
+        except AssertionError as e:
+            print(f"  FAIL: {test.__name__}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
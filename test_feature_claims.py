@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Feature Claim Tests
+===================
+
+Atomic claims and leases from api/feature_claims.py against a temporary
+project database: racing claimers, scheduling order, lease expiry and
+takeover, and per-owner renewal and release.
+Run with: python test_feature_claims.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+
+from api.database import Feature, create_database
+from api.feature_claims import (
+    AGENT_CLAIM_OWNER,
+    AGENT_ID_ENV,
+    agent_claim_owner,
+    claim_feature,
+    claim_next_feature,
+    release_claim,
+    release_expired_leases,
+    release_owner_claims,
+    renew_owner_leases,
+    take_over_claim,
+)
+from api.sqlite_profile import forget_engine
+
+EXPIRED = timedelta(seconds=-1)
+
+
+@contextmanager
+def project_database(features: list[tuple[int, int, list[int]]]):
+    """Yield a session factory for a temporary project holding (id, priority, dependencies) features."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine, SessionLocal = create_database(Path(tmpdir))
+        try:
+            session = SessionLocal()
+            for feature_id, priority, dependencies in features:
+                session.add(Feature(
+                    id=feature_id, priority=priority, category="core", name=f"Feature {feature_id}",
+                    description="", steps=[], passes=False, in_progress=False, dependencies=dependencies,
+                ))
+            session.commit()
+            session.close()
+            yield SessionLocal
+        finally:
+            engine.dispose()
+            forget_engine(engine)
+
+
+def test_racing_claims_have_one_winner():
+    """Concurrent claims on one feature: exactly one UPDATE wins."""
+    with project_database([(1, 1, [])]) as SessionLocal:
+        winners = []
+        start = threading.Barrier(8)
+
+        def claim(owner):
+            session = SessionLocal()
+            try:
+                start.wait()
+                if claim_feature(session, 1, owner) is not None:
+                    winners.append(owner)
+                session.commit()
+            finally:
+                session.close()
+
+        threads = [threading.Thread(target=claim, args=(f"agent:{n}",)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(winners) == 1, winners
+        session = SessionLocal()
+        try:
+            feature = session.get(Feature, 1)
+            assert feature.in_progress and feature.claimed_by == winners[0]
+            assert feature.lease_expires_at is not None
+            assert claim_feature(session, 1, "late") is None
+        finally:
+            session.close()
+
+
+def test_claim_next_follows_scheduling_order():
+    """claim_next_feature takes the best ready feature and skips blocked ones."""
+    # 1 unblocks 2, so it outranks 3 despite its priority; 4 waits on a missing feature
+    with project_database([(1, 5, []), (2, 1, [1]), (3, 2, []), (4, 3, [99])]) as SessionLocal:
+        session = SessionLocal()
+        try:
+            claimed = [claim_next_feature(session, "agent:a") for _ in range(3)]
+            session.commit()
+            assert [f.id if f else None for f in claimed] == [1, 3, None], claimed
+            assert claimed[0].claimed_by == "agent:a"
+
+            session.get(Feature, 1).passes = True
+            session.commit()
+            assert release_claim(session, 1)
+            feature = claim_next_feature(session, "agent:b")
+            session.commit()
+            assert feature is not None and feature.id == 2
+        finally:
+            session.close()
+
+
+def test_expired_leases_are_released():
+    """A lease that ran out returns its feature to the ready pool."""
+    with project_database([(1, 1, []), (2, 2, [])]) as SessionLocal:
+        session = SessionLocal()
+        try:
+            claim_feature(session, 1, "agent:gone", duration=EXPIRED)
+            claim_feature(session, 2, "agent:live")
+            session.commit()
+
+            assert release_expired_leases(session) == [1]
+            session.commit()
+            feature = session.get(Feature, 1, populate_existing=True)
+            assert not feature.in_progress and feature.claimed_by is None
+
+            # Released work is claimable again
+            assert claim_next_feature(session, "agent:new").id == 1
+            session.commit()
+        finally:
+            session.close()
+
+
+def test_take_over_only_expired_or_own_claims():
+    """take_over_claim refuses a live foreign lease and resumes an expired one."""
+    with project_database([(1, 1, []), (2, 2, [])]) as SessionLocal:
+        session = SessionLocal()
+        try:
+            claim_feature(session, 1, "agent:live")
+            claim_feature(session, 2, "agent:gone", duration=EXPIRED)
+            session.commit()
+
+            assert take_over_claim(session, 1, "orchestrator") is None
+            assert take_over_claim(session, 1, "agent:live") is not None
+            resumed = take_over_claim(session, 2, "orchestrator")
+            session.commit()
+            assert resumed is not None and resumed.claimed_by == "orchestrator"
+        finally:
+            session.close()
+
+
+def test_owner_renewal_and_release():
+    """Leases are renewed and released per owner, never across owners."""
+    with project_database([(1, 1, []), (2, 2, []), (3, 3, [])]) as SessionLocal:
+        session = SessionLocal()
+        try:
+            claim_feature(session, 1, "agent:a", duration=EXPIRED)
+            claim_feature(session, 2, "agent:a", duration=EXPIRED)
+            claim_feature(session, 3, "agent:b", duration=EXPIRED)
+            session.commit()
+
+            assert renew_owner_leases(session, "agent:a") == 2
+            session.commit()
+            assert release_expired_leases(session) == [3]
+            session.commit()
+
+            assert not release_claim(session, 1, owner="agent:b")
+            assert release_claim(session, 1, owner="agent:a")
+            assert release_owner_claims(session, "agent:a") == [2]
+            assert release_owner_claims(session, "agent:a") == []
+            session.commit()
+            assert not any(f.in_progress for f in session.query(Feature).populate_existing())
+        finally:
+            session.close()
+
+
+def test_agent_claim_owner():
+    """Agent owners come from the given ID, then AUTOCODER_AGENT_ID, then the process ID."""
+    saved = os.environ.pop(AGENT_ID_ENV, None)
+    try:
+        assert agent_claim_owner("1234") == f"{AGENT_CLAIM_OWNER}:1234"
+        assert agent_claim_owner() == f"{AGENT_CLAIM_OWNER}:{os.getpid()}"
+        os.environ[AGENT_ID_ENV] = "5678"
+        assert agent_claim_owner() == f"{AGENT_CLAIM_OWNER}:5678"
+    finally:
+        os.environ.pop(AGENT_ID_ENV, None)
+        if saved is not None:
+            os.environ[AGENT_ID_ENV] = saved
+
+
+def main():
+    tests = [
+        test_racing_claims_have_one_winner,
+        test_claim_next_follows_scheduling_order,
+        test_expired_leases_are_released,
+        test_take_over_only_expired_or_own_claims,
+        test_owner_renewal_and_release,
+        test_agent_claim_owner,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  PASS: {test.__name__}")
+        except AssertionError as e:
+            print(f"  FAIL: {test.__name__}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
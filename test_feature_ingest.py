@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Feature Ingestion Tests
+=======================
+
+Bulk creation through api/feature_ingest.py and priority allocation from
+the priority sequence, against a temporary project database: per-row
+validation errors, chunked transactions, and concurrent allocators.
+Run with: python test_feature_ingest.py
+"""
+
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from sqlalchemy import text
+
+from api.database import Feature, allocate_priorities, create_database
+from api.feature_ingest import ingest_features
+from api.sqlite_profile import forget_engine
+
+
+@contextmanager
+def project_database():
+    """Yield a session factory for an empty temporary project."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine, SessionLocal = create_database(Path(tmpdir))
+        try:
+            yield SessionLocal
+        finally:
+            engine.dispose()
+            forget_engine(engine)
+
+
+def feature(name: str, **extra) -> dict:
+    return {"category": "core", "name": name, "description": f"{name} works", "steps": ["check"], **extra}
+
+
+def _errors(result) -> dict[int, str]:
+    return {error["index"]: error["error"] for error in result.errors}
+
+
+def test_invalid_rows_are_reported_and_skipped():
+    """Bad rows, and rows depending on them, are skipped; the rest is created."""
+    with project_database() as SessionLocal:
+        session = SessionLocal()
+        try:
+            result = ingest_features(session, [
+                feature("A"),
+                {"category": "core", "name": "No description"},
+                feature("Depends on 1", depends_on_indices=[1]),
+                feature("Forward", depends_on_indices=[4]),
+                feature("Unknown ID", dependencies=[999]),
+                feature("Depends on A", depends_on_indices=[0]),
+            ])
+            errors = _errors(result)
+            assert set(errors) == {1, 2, 3, 4}, errors
+            assert "missing required fields" in errors[1]
+            assert "which was not created" in errors[2]
+            assert "forward reference not allowed" in errors[3]
+            assert "depends on feature 999, which does not exist" in errors[4]
+
+            assert [i for i, _ in result.created] == [0, 5]
+            a_id, dependent_id = result.created_ids
+            assert session.get(Feature, dependent_id).dependencies == [a_id]
+            assert result.with_dependencies == 1
+        finally:
+            session.close()
+
+
+def test_existing_dependency_ids_are_accepted():
+    """`dependencies` may name features created before this batch."""
+    with project_database() as SessionLocal:
+        session = SessionLocal()
+        try:
+            (existing_id,) = ingest_features(session, [feature("Base")]).created_ids
+            result = ingest_features(session, [feature("Uses base", dependencies=[existing_id])])
+            assert result.errors == []
+            assert session.get(Feature, result.created_ids[0]).dependencies == [existing_id]
+        finally:
+            session.close()
+
+
+def test_dependencies_across_and_within_chunks():
+    """depends_on_indices resolve to IDs whether the target is in an earlier or the same chunk."""
+    with project_database() as SessionLocal:
+        session = SessionLocal()
+        try:
+            result = ingest_features(session, [
+                feature("A"),
+                feature("B", depends_on_indices=[0]),  # same chunk
+                feature("C", depends_on_indices=[0, 1]),  # earlier chunk
+                feature("D", depends_on_indices=[2]),  # same chunk
+                feature("E"),
+            ], chunk_size=2)
+            assert result.errors == []
+            ids = dict(result.created)
+            dependencies = {i: session.get(Feature, ids[i]).dependencies for i in ids}
+            assert dependencies == {0: None, 1: [ids[0]], 2: sorted([ids[0], ids[1]]), 3: [ids[2]], 4: None}
+            assert result.with_dependencies == 3
+
+            priorities = [session.get(Feature, ids[i]).priority for i in range(5)]
+            assert priorities == list(range(priorities[0], priorities[0] + 5)), priorities
+        finally:
+            session.close()
+
+
+def test_failed_chunk_rejects_later_dependents():
+    """A chunk that fails to insert is reported row by row, and so are its dependents in later chunks."""
+    with project_database() as SessionLocal:
+        session = SessionLocal()
+        try:
+            result = ingest_features(session, [
+                feature("A"),
+                feature("B"),
+                feature("Unserializable", steps=[object()]),
+                feature("D"),
+                feature("Depends on D", depends_on_indices=[3]),
+                feature("Depends on A", depends_on_indices=[0]),
+            ], chunk_size=2)
+            errors = _errors(result)
+            assert set(errors) == {2, 3, 4}, errors
+            assert "was not created:" in errors[2] and "was not created:" in errors[3]
+            assert "depends on a feature that was not created" in errors[4]
+            assert [i for i, _ in result.created] == [0, 1, 5]
+            assert session.query(Feature).count() == 3
+        finally:
+            session.close()
+
+
+def test_allocate_priorities_appends():
+    """Allocated ranges follow the highest existing priority and never overlap."""
+    with project_database() as SessionLocal:
+        session = SessionLocal()
+        try:
+            ingest_features(session, [feature("A"), feature("B")], start_priority=40)
+            assert allocate_priorities(session, 3) == 42
+            assert allocate_priorities(session) == 45
+            session.commit()
+
+            # A missing counter row is reseeded from the features table
+            session.execute(text("DELETE FROM priority_sequence"))
+            session.commit()
+            assert allocate_priorities(session) == 42
+            session.commit()
+        finally:
+            session.close()
+
+
+def test_concurrent_allocations_are_disjoint():
+    """Allocators on separate connections each get their own range."""
+    with project_database() as SessionLocal:
+        starts = []
+        start = threading.Barrier(6)
+
+        def allocate():
+            session = SessionLocal()
+            try:
+                start.wait()
+                starts.append(allocate_priorities(session, 10))
+                session.commit()
+            finally:
+                session.close()
+
+        threads = [threading.Thread(target=allocate) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(starts) == list(range(1, 61, 10)), starts
+
+
+def main():
+    tests = [
+        test_invalid_rows_are_reported_and_skipped,
+        test_existing_dependency_ids_are_accepted,
+        test_dependencies_across_and_within_chunks,
+        test_failed_chunk_rejects_later_dependents,
+        test_allocate_priorities_appends,
+        test_concurrent_allocations_are_disjoint,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  PASS: {test.__name__}")
+        except AssertionError as e:
+            print(f"  FAIL: {test.__name__}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Features API Tests
+==================
+
+The feature listing endpoints in server/routers/features.py, served from a
+temporary project directory: keyset pagination and field projection,
+ETag / 304 revalidation, delta sync through /features/changes, and bulk
+creation errors.
+Run with: python test_features_api.py
+"""
+
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.database import dispose_database
+from server.routers import features
+
+BASE = "/api/projects/demo/features"
+
+
+@contextmanager
+def project_client(count: int = 0):
+    """Yield a TestClient for project "demo" in a temporary directory, with `count` features."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_dir = Path(tmpdir)
+        get_project_path = features._get_project_path
+        features._get_project_path = lambda project_name: project_dir
+        app = FastAPI()
+        app.include_router(features.router)
+        try:
+            with TestClient(app) as client:
+                if count:
+                    response = client.post(f"{BASE}/bulk", json={"features": [
+                        {"category": "core", "name": f"Feature {n}", "description": "x" * 300, "steps": ["check"]}
+                        for n in range(1, count + 1)
+                    ]})
+                    assert response.status_code == 200 and response.json()["created"] == count
+                yield client
+        finally:
+            features._get_project_path = get_project_path
+            dispose_database(project_dir)
+
+
+def _ids(payload: dict, status: str = "pending") -> list[int]:
+    return [item["id"] for item in payload[status]]
+
+
+def test_keyset_pagination_walks_every_feature():
+    """Following next_cursor returns each feature once, in priority order."""
+    with project_client(count=7) as client:
+        client.patch(f"{BASE}/3", json={"priority": 100})
+        seen = []
+        cursor = None
+        for _ in range(10):
+            params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+            payload = client.get(BASE, params=params).json()
+            assert len(payload["pending"]) <= 3
+            seen += _ids(payload)
+            cursor = payload["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == [1, 2, 4, 5, 6, 7, 3], seen
+
+        assert client.get(BASE, params={"limit": 3, "cursor": "not-a-cursor"}).status_code == 400
+        assert client.get(BASE, params={"limit": features.MAX_PAGE_SIZE + 1}).status_code == 422
+
+
+def test_field_projection():
+    """fields=card sends a summary instead of description and steps; fields lists select columns."""
+    with project_client(count=2) as client:
+        card = client.get(BASE, params={"fields": "card"}).json()["pending"][0]
+        assert set(card) == set(features.CARD_FIELDS), card
+        assert len(card["summary"]) == features.SUMMARY_LENGTH
+
+        item = client.get(BASE, params={"fields": "id,name"}).json()["pending"][0]
+        assert item == {"id": 1, "name": "Feature 1"}
+
+        full = client.get(BASE).json()["pending"][0]
+        assert full["description"] == "x" * 300 and full["steps"] == ["check"]
+
+        assert client.get(BASE, params={"fields": "id,secret"}).status_code == 400
+
+
+def test_etag_revalidation():
+    """An unchanged project answers If-None-Match with 304; any change issues a new tag."""
+    with project_client(count=2) as client:
+        for path in (BASE, f"{BASE}/graph"):
+            first = client.get(path)
+            etag = first.headers["ETag"]
+            assert first.status_code == 200 and first.headers["Cache-Control"] == "no-cache"
+
+            cached = client.get(path, headers={"If-None-Match": etag})
+            assert cached.status_code == 304 and cached.headers["ETag"] == etag
+            assert client.get(path, headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+
+            client.patch(f"{BASE}/1", json={"name": f"Renamed for {path}"})
+            changed = client.get(path, headers={"If-None-Match": etag})
+            assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+
+def test_changes_since_version():
+    """/changes returns updated features, their dependents, and deleted IDs since a version."""
+    with project_client(count=4) as client:
+        client.post(f"{BASE}/2/dependencies/1")
+        snapshot = client.get(f"{BASE}/changes").json()
+        assert not snapshot["reset"] and snapshot["deleted"] == []
+        assert [f["id"] for f in snapshot["features"]] == [1, 2, 3, 4]
+        epoch, version = snapshot["epoch"], snapshot["version"]
+
+        unchanged = client.get(f"{BASE}/changes", params={"since": version, "epoch": epoch}).json()
+        assert unchanged["features"] == [] and unchanged["version"] == version
+
+        # 2 depends on 1, so it is re-sent with 1; 3 is deleted
+        client.patch(f"{BASE}/1", json={"name": "Renamed"})
+        client.delete(f"{BASE}/3")
+        delta = client.get(f"{BASE}/changes", params={"since": version, "epoch": epoch, "fields": "id,name"}).json()
+        assert [f["id"] for f in delta["features"]] == [1, 2], delta
+        assert delta["features"][0] == {"id": 1, "name": "Renamed"}
+        assert delta["deleted"] == [3]
+        assert delta["version"] > version and not delta["reset"]
+
+
+def test_changes_reset():
+    """A foreign epoch or a version ahead of the database gets a full snapshot with reset."""
+    with project_client(count=2) as client:
+        snapshot = client.get(f"{BASE}/changes").json()
+        for params in ({"since": snapshot["version"], "epoch": "other"}, {"since": snapshot["version"] + 10}):
+            reset = client.get(f"{BASE}/changes", params=params).json()
+            assert reset["reset"], params
+            assert [f["id"] for f in reset["features"]] == [1, 2]
+
+
+def test_bulk_reports_rejected_rows():
+    """/bulk creates the valid rows and reports the rest by index."""
+    with project_client() as client:
+        response = client.post(f"{BASE}/bulk", json={"features": [
+            {"category": "core", "name": "A", "description": "a", "steps": []},
+            {"category": "core", "name": "B", "description": "b", "steps": [], "dependencies": [999]},
+        ]})
+        payload = response.json()
+        assert response.status_code == 200 and payload["created"] == 1
+        assert [f["name"] for f in payload["features"]] == ["A"]
+        assert [e["index"] for e in payload["errors"]] == [1]
+        assert "999" in payload["errors"][0]["error"]
+
+
+def main():
+    tests = [
+        test_keyset_pagination_walks_every_feature,
+        test_field_projection,
+        test_etag_revalidation,
+        test_changes_since_version,
+        test_changes_reset,
+        test_bulk_reports_rejected_rows,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  PASS: {test.__name__}")
+        except AssertionError as e:
+            print(f"  FAIL: {test.__name__}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
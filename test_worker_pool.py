@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Worker Pool Tests
+=================
+
+The worker protocol and WorkerPool lifecycle from worker_pool.py, driven
+with a stand-in worker process that speaks the ready / assignment / done
+marker protocol without running an agent.
+Run with: python test_worker_pool.py
+"""
+
+import asyncio
+import sys
+
+from worker_pool import (
+    MAX_ASSIGNMENTS_PER_WORKER,
+    WORKER_DONE_MARKER,
+    WORKER_READY_MARKER,
+    AgentWorker,
+    WorkerPool,
+    parse_done_marker,
+)
+
+# Answers each assignment line with a done marker carrying the requested status
+FAKE_WORKER = f"""
+import json, sys
+print({WORKER_READY_MARKER!r}, flush=True)
+for line in sys.stdin:
+    assignment = json.loads(line)
+    print("working on", assignment["feature_id"], flush=True)
+    print({WORKER_DONE_MARKER!r}, json.dumps({{"status": assignment.get("status", 0)}}), flush=True)
+"""
+
+
+async def spawn_fake_worker() -> asyncio.subprocess.Process:
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-c", FAKE_WORKER,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+    )
+    assert proc.stdout is not None
+    ready = (await proc.stdout.readline()).decode().strip()
+    assert ready == WORKER_READY_MARKER, ready
+    return proc
+
+
+async def run_assignment(worker: AgentWorker, feature_id: int, status: int = 0) -> tuple[list[str], int]:
+    """Send one assignment and read the worker's output up to its done marker."""
+    await worker.assign({"agent_type": "coding", "feature_id": feature_id, "status": status})
+    assert worker.proc.stdout is not None
+    output: list[str] = []
+    while True:
+        line = (await worker.proc.stdout.readline()).decode().strip()
+        assert line, "worker exited before its done marker"
+        done = parse_done_marker(line)
+        if done is not None:
+            return output, done
+        output.append(line)
+
+
+def make_pool(max_idle: int = 2) -> tuple[WorkerPool, list[int]]:
+    exited: list[int] = []
+    return WorkerPool(spawn_fake_worker, max_idle, on_exit=lambda worker: exited.append(worker.pid)), exited
+
+
+def test_parse_done_marker():
+    """Done markers carry the assignment's exit status; anything else is not a marker."""
+    assert parse_done_marker(f'{WORKER_DONE_MARKER} {{"status": 0}}') == 0
+    assert parse_done_marker(f'{WORKER_DONE_MARKER} {{"status": 3}}') == 3
+    assert parse_done_marker(f"{WORKER_DONE_MARKER} garbled") == 1
+    assert parse_done_marker(f"{WORKER_DONE_MARKER} []") == 1
+    assert parse_done_marker("agent output mentioning [WORKER] done") is None
+
+
+def test_worker_is_reused_across_assignments():
+    """A released worker serves the next assignment without a new process."""
+    async def scenario():
+        pool, exited = make_pool()
+        worker = await pool.acquire()
+        assert await run_assignment(worker, 1) == (["working on 1"], 0)
+        await pool.release(worker)
+        assert pool.idle_count == 1
+
+        again = await pool.acquire()
+        assert again is worker
+        assert await run_assignment(again, 2, status=1) == (["working on 2"], 1)
+        assert again.assignments == 2
+        await pool.release(again)
+        await pool.close()
+        assert exited == [worker.pid] and not worker.alive
+
+    asyncio.run(scenario())
+
+
+def test_worn_out_and_dead_workers_are_replaced():
+    """Workers past MAX_ASSIGNMENTS_PER_WORKER or found dead are retired and reported."""
+    async def scenario():
+        pool, exited = make_pool()
+        worker = await pool.acquire()
+        worker.assignments = MAX_ASSIGNMENTS_PER_WORKER
+        await pool.release(worker)
+        assert pool.idle_count == 0 and exited == [worker.pid]
+
+        idle = await pool.acquire()
+        await pool.release(idle)
+        idle.proc.kill()
+        await idle.proc.wait()
+        replacement = await pool.acquire()
+        assert replacement is not idle and replacement.alive
+        assert exited == [worker.pid, idle.pid]
+
+        await pool.release(replacement)
+        await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_prewarm_recycle_and_close():
+    """prewarm stops at max_idle; recycle retires idle workers now and busy ones on release."""
+    async def scenario():
+        pool, exited = make_pool(max_idle=2)
+        await pool.prewarm(5)
+        assert pool.idle_count == 2
+
+        busy = await pool.acquire()
+        await pool.recycle()
+        assert pool.idle_count == 0 and len(exited) == 1
+
+        await run_assignment(busy, 1)
+        await pool.release(busy)
+        assert pool.idle_count == 0 and exited[-1] == busy.pid
+
+        await pool.prewarm(1)
+        assert pool.idle_count == 1
+        await pool.close()
+        assert pool.idle_count == 0 and len(exited) == 3
+        await pool.prewarm(1)
+        assert pool.idle_count == 0
+
+    asyncio.run(scenario())
+
+
+def main():
+    tests = [
+        test_parse_done_marker,
+        test_worker_is_reused_across_assignments,
+        test_worn_out_and_dead_workers_are_replaced,
+        test_prewarm_recycle_and_close,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"  PASS: {test.__name__}")
+        except AssertionError as e:
+            print(f"  FAIL: {test.__name__}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
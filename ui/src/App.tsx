@@ -1,5 +1,5 @@
-import { useState, useEffect, useCallback } from 'react'
-import { useQueryClient, useQuery } from '@tanstack/react-query'
+import { useState, useEffect, useCallback, useMemo } from 'react'
+import { useQueryClient } from '@tanstack/react-query'
 import { useProjects, useFeatures, useAgentStatus, useSettings } from './hooks/useProjects'
 import { useProjectWebSocket } from './hooks/useWebSocket'
 import { useFeatureSound } from './hooks/useFeatureSound'
@@ -26,7 +26,7 @@ import { ViewToggle, type ViewMode } from './components/ViewToggle'
 import { DependencyGraph } from './components/DependencyGraph'
 import { KeyboardShortcutsHelp } from './components/KeyboardShortcutsHelp'
 import { ThemeSelector } from './components/ThemeSelector'
-import { getDependencyGraph } from './lib/api'
+import { buildDependencyGraph } from './lib/featureSync'
 import { Loader2, Settings, Moon, Sun } from 'lucide-react'
 import type { Feature } from './lib/types'
 import { Button } from '@/components/ui/button'
@@ -78,13 +78,11 @@ function App() {
   const selectedProjectData = projects?.find(p => p.name === selectedProject)
   const hasSpec = selectedProjectData?.has_spec ?? true
 
-  // Fetch graph data when in graph view
-  const { data: graphData } = useQuery({
-    queryKey: ['dependencyGraph', selectedProject],
-    queryFn: () => getDependencyGraph(selectedProject!),
-    enabled: !!selectedProject && viewMode === 'graph',
-    refetchInterval: 5000, // Refresh every 5 seconds
-  })
+  // Graph view is derived from the delta-synced features, so it needs no polling of its own
+  const graphData = useMemo(
+    () => (features && viewMode === 'graph' ? buildDependencyGraph(features) : undefined),
+    [features, viewMode]
+  )
 
   // Persist view mode to localStorage
   useEffect(() => {
@@ -21,7 +21,9 @@ export function AgentControl({ projectName, status }: AgentControlProps) {
   const { data: settings } = useSettings()
   const yoloMode = settings?.yolo_mode ?? false
 
-  // Concurrency: 1 = single agent, 2-5 = parallel
+  const maxConcurrency = settings?.max_concurrency_limit ?? 5
+
+  // Concurrency: 1 = single agent, 2+ = parallel
   const [concurrency, setConcurrency] = useState(3)
 
   const startAgent = useStartAgent(projectName)
@@ -55,7 +57,7 @@ export function AgentControl({ projectName, status }: AgentControlProps) {
             <input
               type="range"
               min={1}
-              max={5}
+              max={maxConcurrency}
               value={concurrency}
               onChange={(e) => setConcurrency(Number(e.target.value))}
               disabled={isLoading}
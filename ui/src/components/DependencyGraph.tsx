@@ -128,7 +128,9 @@ function FeatureNode({ data }: { data: GraphNode & { onClick?: () => void; agent
           px-4 py-3 rounded-lg border-2 cursor-pointer
           transition-all hover:shadow-md relative
           ${statusColors[data.status]}
+          ${data.in_cycle ? 'ring-2 ring-purple-500 ring-offset-1' : ''}
         `}
+        title={data.in_cycle ? 'Part of a dependency cycle: can never become ready' : undefined}
         onClick={data.onClick}
         style={{ minWidth: NODE_WIDTH - 20, maxWidth: NODE_WIDTH }}
       >
@@ -249,18 +251,27 @@ function DependencyGraphInner({ graphData, onNodeClick, activeAgents = [] }: Dep
       },
     }))
 
-    const edges: Edge[] = graphData.edges.map((edge, index) => ({
-      id: `e${edge.source}-${edge.target}-${index}`,
-      source: String(edge.source),
-      target: String(edge.target),
-      type: 'smoothstep',
-      animated: false,
-      style: { stroke: '#a1a1aa', strokeWidth: 2 },
-      markerEnd: {
-        type: MarkerType.ArrowClosed,
-        color: '#a1a1aa',
-      },
-    }))
+    // Edges inside a cycle group are highlighted
+    const cycleOf = new Map<number, number>()
+    ;(graphData.cycles ?? []).forEach((group, i) => group.forEach(id => cycleOf.set(id, i)))
+
+    const edges: Edge[] = graphData.edges.map((edge, index) => {
+      const sourceCycle = cycleOf.get(edge.source)
+      const inCycle = sourceCycle !== undefined && sourceCycle === cycleOf.get(edge.target)
+      const color = inCycle ? '#a855f7' : '#a1a1aa' // purple-500 for cycles
+      return {
+        id: `e${edge.source}-${edge.target}-${index}`,
+        source: String(edge.source),
+        target: String(edge.target),
+        type: 'smoothstep',
+        animated: inCycle,
+        style: { stroke: color, strokeWidth: 2 },
+        markerEnd: {
+          type: MarkerType.ArrowClosed,
+          color,
+        },
+      }
+    })
 
     return getLayoutedElements(nodes, edges, direction)
   }, [graphData, direction, handleNodeClick, agentByFeatureId])
@@ -284,6 +295,7 @@ function DependencyGraphInner({ graphData, onNodeClick, activeAgents = [] }: Dep
     const graphHash = JSON.stringify({
       nodes: graphData.nodes.map(n => ({ id: n.id, status: n.status })),
       edges: graphData.edges,
+      cycles: graphData.cycles,
       agents: agentInfo,
     })
 
@@ -378,6 +390,12 @@ function DependencyGraphInner({ graphData, onNodeClick, activeAgents = [] }: Dep
               <div className="w-3 h-3 rounded bg-red-100 border border-red-400" />
               <span>Blocked</span>
             </div>
+            {(graphData.cycles?.length ?? 0) > 0 && (
+              <div className="flex items-center gap-2 text-xs">
+                <div className="w-3 h-3 rounded ring-2 ring-purple-500" />
+                <span>In cycle ({graphData.cycles!.length})</span>
+              </div>
+            )}
           </div>
         </CardContent>
       </Card>
@@ -31,15 +31,16 @@ export function EditFeatureForm({ feature, projectName, onClose, onSaved }: Edit
   const formId = useId()
   const [category, setCategory] = useState(feature.category)
   const [name, setName] = useState(feature.name)
-  const [description, setDescription] = useState(feature.description)
+  const [description, setDescription] = useState(feature.description ?? '')
   const [priority, setPriority] = useState(String(feature.priority))
+  const originalSteps = feature.steps ?? []
   const [steps, setSteps] = useState<Step[]>(() =>
-    feature.steps.length > 0
-      ? feature.steps.map((step, i) => ({ id: `${formId}-step-${i}`, value: step }))
+    originalSteps.length > 0
+      ? originalSteps.map((step, i) => ({ id: `${formId}-step-${i}`, value: step }))
       : [{ id: `${formId}-step-0`, value: '' }]
   )
   const [error, setError] = useState<string | null>(null)
-  const [stepCounter, setStepCounter] = useState(feature.steps.length || 1)
+  const [stepCounter, setStepCounter] = useState(originalSteps.length || 1)
 
   const updateFeature = useUpdateFeature(projectName)
 
@@ -90,9 +91,9 @@ export function EditFeatureForm({ feature, projectName, onClose, onSaved }: Edit
   const hasChanges =
     category.trim() !== feature.category ||
     name.trim() !== feature.name ||
-    description.trim() !== feature.description ||
+    description.trim() !== (feature.description ?? '') ||
     parseInt(priority, 10) !== feature.priority ||
-    JSON.stringify(currentSteps) !== JSON.stringify(feature.steps)
+    JSON.stringify(currentSteps) !== JSON.stringify(originalSteps)
 
   return (
     <Dialog open={true} onOpenChange={(open) => !open && onClose()}>
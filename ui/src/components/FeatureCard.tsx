@@ -70,7 +70,7 @@ export function FeatureCard({ feature, onClick, isInProgress, allFeatures = [],
 
         {/* Description */}
         <p className="text-sm text-muted-foreground line-clamp-2">
-          {feature.description}
+          {feature.summary ?? feature.description}
         </p>
 
         {/* Agent working on this feature */}
@@ -1,6 +1,6 @@
 import { useState } from 'react'
 import { X, CheckCircle2, Circle, SkipForward, Trash2, Loader2, AlertCircle, Pencil, Link2, AlertTriangle } from 'lucide-react'
-import { useSkipFeature, useDeleteFeature, useFeatures } from '../hooks/useProjects'
+import { useSkipFeature, useDeleteFeature, useFeatures, useFeature } from '../hooks/useProjects'
 import { EditFeatureForm } from './EditFeatureForm'
 import type { Feature } from '../lib/types'
 import {
@@ -49,6 +49,9 @@ export function FeatureModal({ feature, projectName, onClose }: FeatureModalProp
   const skipFeature = useSkipFeature(projectName)
   const deleteFeature = useDeleteFeature(projectName)
   const { data: allFeatures } = useFeatures(projectName)
+  // The board only lists card data; load description and steps for this feature
+  const { data: detail } = useFeature(projectName, feature.id)
+  const steps = detail?.steps ?? []
 
   // Build a map of feature ID to feature for looking up dependency names
   const featureMap = new Map<number, Feature>()
@@ -89,10 +92,10 @@ export function FeatureModal({ feature, projectName, onClose }: FeatureModalProp
   }
 
   // Show edit form when in edit mode
-  if (showEdit) {
+  if (showEdit && detail) {
     return (
       <EditFeatureForm
-        feature={feature}
+        feature={detail}
         projectName={projectName}
         onClose={() => setShowEdit(false)}
         onSaved={onClose}
@@ -157,7 +160,9 @@ export function FeatureModal({ feature, projectName, onClose }: FeatureModalProp
             <h3 className="font-semibold mb-2 text-sm uppercase tracking-wide text-muted-foreground">
               Description
             </h3>
-            <p className="text-foreground">{feature.description}</p>
+            <p className="text-foreground">
+              {detail?.description ?? feature.description ?? feature.summary}
+            </p>
           </div>
 
           {/* Blocked By Warning */}
@@ -209,13 +214,13 @@ export function FeatureModal({ feature, projectName, onClose }: FeatureModalProp
           )}
 
           {/* Steps */}
-          {feature.steps.length > 0 && (
+          {steps.length > 0 && (
             <div>
               <h3 className="font-semibold mb-2 text-sm uppercase tracking-wide text-muted-foreground">
                 Test Steps
               </h3>
               <ol className="list-decimal list-inside space-y-2">
-                {feature.steps.map((step, index) => (
+                {steps.map((step, index) => (
                   <li
                     key={index}
                     className="p-3 bg-muted rounded-md text-sm"
@@ -265,7 +270,7 @@ export function FeatureModal({ feature, projectName, onClose }: FeatureModalProp
                 <div className="flex gap-3 w-full">
                   <Button
                     onClick={() => setShowEdit(true)}
-                    disabled={skipFeature.isPending}
+                    disabled={skipFeature.isPending || !detail}
                     className="flex-1"
                   >
                     <Pencil size={18} />
@@ -12,6 +12,7 @@ import {
   useDeleteSchedule,
   useToggleSchedule,
 } from '../hooks/useSchedules'
+import { useSettings } from '../hooks/useProjects'
 import {
   utcToLocalWithDayShift,
   localToUTCWithDayShift,
@@ -52,6 +53,8 @@ export function ScheduleModal({ projectName, isOpen, onClose }: ScheduleModalPro
   const createSchedule = useCreateSchedule(projectName)
   const deleteSchedule = useDeleteSchedule(projectName)
   const toggleSchedule = useToggleSchedule(projectName)
+  const { data: settings } = useSettings()
+  const maxConcurrency = settings?.max_concurrency_limit ?? 5
 
   // Form state for new schedule
   const [newSchedule, setNewSchedule] = useState<ScheduleCreate>({
@@ -346,7 +349,7 @@ export function ScheduleModal({ projectName, isOpen, onClose }: ScheduleModalPro
 
             {/* Concurrency slider */}
             <div className="mb-4 space-y-2">
-              <Label>Concurrent Agents (1-5)</Label>
+              <Label>Concurrent Agents (1-{maxConcurrency})</Label>
               <div className="flex items-center gap-3">
                 <GitBranch
                   size={16}
@@ -355,7 +358,7 @@ export function ScheduleModal({ projectName, isOpen, onClose }: ScheduleModalPro
                 <input
                   type="range"
                   min={1}
-                  max={5}
+                  max={maxConcurrency}
                   value={newSchedule.max_concurrency}
                   onChange={(e) =>
                     setNewSchedule((prev) => ({ ...prev, max_concurrency: Number(e.target.value) }))
@@ -4,7 +4,8 @@
 
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import * as api from '../lib/api'
-import type { FeatureCreate, FeatureUpdate, ModelsResponse, Settings, SettingsUpdate } from '../lib/types'
+import { applyFeatureChanges } from '../lib/featureSync'
+import type { FeatureCreate, FeatureListResponse, FeatureUpdate, ModelsResponse, Settings, SettingsUpdate } from '../lib/types'
 
 // ============================================================================
 // Projects
@@ -53,14 +54,29 @@ export function useDeleteProject() {
 // ============================================================================
 
 export function useFeatures(projectName: string | null) {
+  const queryClient = useQueryClient()
+
   return useQuery({
     queryKey: ['features', projectName],
-    queryFn: () => api.listFeatures(projectName!),
+    // Delta sync: fetch only features changed since the cached version and patch
+    // them in. Cards only need summary data; full details come from useFeature.
+    queryFn: async () => {
+      const previous = queryClient.getQueryData<FeatureListResponse>(['features', projectName])
+      const changes = await api.getFeatureChanges(projectName!, previous?.version ?? 0, previous?.epoch, 'card')
+      return applyFeatureChanges(previous, changes)
+    },
     enabled: !!projectName,
     refetchInterval: 5000, // Refetch every 5 seconds for real-time updates
   })
 }
 
+export function useFeature(projectName: string, featureId: number) {
+  return useQuery({
+    queryKey: ['features', projectName, featureId],
+    queryFn: () => api.getFeature(projectName, featureId),
+  })
+}
+
 export function useCreateFeature(projectName: string) {
   const queryClient = useQueryClient()
 
@@ -239,6 +255,7 @@ const DEFAULT_SETTINGS: Settings = {
   glm_mode: false,
   ollama_mode: false,
   testing_agent_ratio: 1,
+  max_concurrency_limit: 5,
 }
 
 export function useAvailableModels() {
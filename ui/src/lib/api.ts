@@ -7,6 +7,8 @@ import type {
   ProjectDetail,
   ProjectPrompts,
   FeatureListResponse,
+  FeatureListParams,
+  FeatureChangesResponse,
   Feature,
   FeatureCreate,
   FeatureUpdate,
@@ -104,8 +106,28 @@ export async function updateProjectPrompts(
 // Features API
 // ============================================================================
 
-export async function listFeatures(projectName: string): Promise<FeatureListResponse> {
-  return fetchJSON(`/projects/${encodeURIComponent(projectName)}/features`)
+export async function listFeatures(
+  projectName: string,
+  params: FeatureListParams = {}
+): Promise<FeatureListResponse> {
+  const query = new URLSearchParams()
+  for (const [key, value] of Object.entries(params)) {
+    if (value !== undefined) query.set(key, String(value))
+  }
+  const qs = query.toString()
+  return fetchJSON(`/projects/${encodeURIComponent(projectName)}/features${qs ? `?${qs}` : ''}`)
+}
+
+export async function getFeatureChanges(
+  projectName: string,
+  since: number,
+  epoch?: string,
+  fields?: string
+): Promise<FeatureChangesResponse> {
+  const query = new URLSearchParams({ since: String(since) })
+  if (epoch) query.set('epoch', epoch)
+  if (fields) query.set('fields', fields)
+  return fetchJSON(`/projects/${encodeURIComponent(projectName)}/features/changes?${query}`)
 }
 
 export async function createFeature(projectName: string, feature: FeatureCreate): Promise<Feature> {
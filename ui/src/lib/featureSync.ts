@@ -0,0 +1,139 @@
+/**
+ * Delta sync for the feature board and dependency graph
+ *
+ * The board keeps the last synced data version and asks the server only for
+ * features changed since then (GET /features/changes), patching its columns
+ * instead of reloading the whole backlog on every poll.
+ */
+
+import type { DependencyGraph, Feature, FeatureChangesResponse, FeatureListResponse, FeatureStatus, GraphNode } from './types'
+
+function byPriority(a: Feature, b: Feature): number {
+  return a.priority - b.priority || a.id - b.id
+}
+
+/**
+ * Apply a change set to the board. Returns `previous` unchanged (same object)
+ * when nothing changed, so subscribers don't re-render.
+ */
+export function applyFeatureChanges(
+  previous: FeatureListResponse | undefined,
+  changes: FeatureChangesResponse
+): FeatureListResponse {
+  if (previous && !changes.reset && changes.features.length === 0 && changes.deleted.length === 0) {
+    return previous.version === changes.version ? previous : { ...previous, version: changes.version }
+  }
+
+  const byId = new Map<number, Feature>()
+  if (previous && !changes.reset) {
+    for (const f of [...previous.pending, ...previous.in_progress, ...previous.done]) byId.set(f.id, f)
+  }
+  for (const id of changes.deleted) byId.delete(id)
+  for (const f of changes.features) byId.set(f.id, f)
+
+  const next: FeatureListResponse = {
+    pending: [],
+    in_progress: [],
+    done: [],
+    epoch: changes.epoch,
+    version: changes.version,
+  }
+  for (const f of byId.values()) {
+    if (f.passes) next.done.push(f)
+    else if (f.in_progress) next.in_progress.push(f)
+    else next.pending.push(f)
+  }
+  next.pending.sort(byPriority)
+  next.in_progress.sort(byPriority)
+  next.done.sort(byPriority)
+  return next
+}
+
+/**
+ * Every cycle group in a dependency graph (iterative Tarjan SCC, linear time).
+ * Same result as find_dependency_cycles in api/dependency_resolver.py.
+ */
+export function findDependencyCycles(dependencies: Map<number, number[]>): number[][] {
+  const indexOf = new Map<number, number>()
+  const lowlink = new Map<number, number>()
+  const stack: number[] = []
+  const onStack = new Set<number>()
+  const groups: number[][] = []
+
+  const open = (id: number) => {
+    indexOf.set(id, indexOf.size)
+    lowlink.set(id, indexOf.size - 1)
+    stack.push(id)
+    onStack.add(id)
+  }
+
+  for (const root of dependencies.keys()) {
+    if (indexOf.has(root)) continue
+    open(root)
+    // Explicit DFS stack: node and position in its dependency list
+    const work: [number, number][] = [[root, 0]]
+    while (work.length > 0) {
+      const frame = work[work.length - 1]
+      const [node] = frame
+      const deps = dependencies.get(node)!
+      let descended = false
+      while (frame[1] < deps.length) {
+        const dep = deps[frame[1]++]
+        if (!dependencies.has(dep)) continue
+        if (!indexOf.has(dep)) {
+          open(dep)
+          work.push([dep, 0])
+          descended = true
+          break
+        }
+        if (onStack.has(dep)) lowlink.set(node, Math.min(lowlink.get(node)!, indexOf.get(dep)!))
+      }
+      if (descended) continue
+
+      work.pop()
+      if (work.length > 0) {
+        const parent = work[work.length - 1][0]
+        lowlink.set(parent, Math.min(lowlink.get(parent)!, lowlink.get(node)!))
+      }
+      if (lowlink.get(node) === indexOf.get(node)) {
+        const group: number[] = []
+        let member: number
+        do {
+          member = stack.pop()!
+          onStack.delete(member)
+          group.push(member)
+        } while (member !== node)
+        if (group.length > 1 || deps.includes(node)) groups.push(group.sort((a, b) => a - b))
+      }
+    }
+  }
+
+  return groups.sort((a, b) => a[0] - b[0])
+}
+
+/**
+ * Dependency graph derived from synced features, matching GET /features/graph
+ */
+export function buildDependencyGraph(features: FeatureListResponse): DependencyGraph {
+  const all = [...features.pending, ...features.in_progress, ...features.done].sort((a, b) => a.id - b.id)
+  const nodes: GraphNode[] = all.map(f => {
+    let status: FeatureStatus = 'pending'
+    if (f.passes) status = 'done'
+    else if (f.blocked) status = 'blocked'
+    else if (f.in_progress) status = 'in_progress'
+    return {
+      id: f.id,
+      name: f.name,
+      category: f.category,
+      status,
+      priority: f.priority,
+      dependencies: f.dependencies ?? [],
+    }
+  })
+  const edges = nodes.flatMap(node => node.dependencies.map(dep => ({ source: dep, target: node.id })))
+
+  const cycles = findDependencyCycles(new Map(nodes.map(node => [node.id, node.dependencies])))
+  const inCycle = new Set(cycles.flat())
+  for (const node of nodes) node.in_cycle = inCycle.has(node.id)
+  return { nodes, edges, cycles }
+}
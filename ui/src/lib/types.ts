@@ -62,8 +62,9 @@ export interface Feature {
   priority: number
   category: string
   name: string
-  description: string
-  steps: string[]
+  description?: string              // Omitted by card listings (fields=card)
+  summary?: string                  // Truncated description, card listings only
+  steps?: string[]                  // Omitted by card listings (fields=card)
   passes: boolean
   in_progress: boolean
   dependencies?: number[]           // Optional for backwards compat
@@ -82,6 +83,7 @@ export interface GraphNode {
   status: FeatureStatus
   priority: number
   dependencies: number[]
+  in_cycle?: boolean                // Member of a dependency cycle group
 }
 
 export interface GraphEdge {
@@ -92,12 +94,33 @@ export interface GraphEdge {
 export interface DependencyGraph {
   nodes: GraphNode[]
   edges: GraphEdge[]
+  cycles?: number[][]               // Groups of features that depend on each other
 }
 
 export interface FeatureListResponse {
   pending: Feature[]
   in_progress: Feature[]
   done: Feature[]
+  next_cursor?: string | null       // Set when a paginated listing has more pages
+  epoch?: string                    // Delta sync position (see useFeatures)
+  version?: number
+}
+
+// Features changed since a data version (GET /features/changes)
+export interface FeatureChangesResponse {
+  epoch: string
+  version: number
+  reset: boolean                    // Full snapshot: replace local state
+  features: Feature[]               // Upsert by id
+  deleted: number[]
+}
+
+export interface FeatureListParams {
+  status?: string                   // Comma-separated: pending,in_progress,done
+  category?: string
+  fields?: string                   // Comma-separated field names, or 'card'
+  limit?: number
+  cursor?: string
 }
 
 export interface FeatureCreate {
@@ -503,9 +526,15 @@ export interface FeatureBulkCreate {
   starting_priority?: number
 }
 
+export interface FeatureBulkCreateError {
+  index: number
+  error: string
+}
+
 export interface FeatureBulkCreateResponse {
   created: number
   features: Feature[]
+  errors: FeatureBulkCreateError[]
 }
 
 // ============================================================================
@@ -528,6 +557,7 @@ export interface Settings {
   glm_mode: boolean
   ollama_mode: boolean
   testing_agent_ratio: number  // Regression testing agents (0-3)
+  max_concurrency_limit: number  // Configured ceiling for concurrent agents
 }
 
 export interface SettingsUpdate {
@@ -549,7 +579,7 @@ export interface Schedule {
   enabled: boolean
   yolo_mode: boolean
   model: string | null
-  max_concurrency: number // 1-5 concurrent agents
+  max_concurrency: number // 1-max_concurrency_limit concurrent agents
   crash_count: number
   created_at: string
 }
@@ -561,7 +591,7 @@ export interface ScheduleCreate {
   enabled: boolean
   yolo_mode: boolean
   model: string | null
-  max_concurrency: number // 1-5 concurrent agents
+  max_concurrency: number // 1-max_concurrency_limit concurrent agents
 }
 
 export interface ScheduleUpdate {
@@ -0,0 +1,169 @@
+"""
+Agent Worker Pool
+=================
+
+Pre-warmed agent worker processes for the parallel orchestrator.
+
+Spawning ``autonomous_agent_demo.py`` per feature pays for the interpreter
+start, the SQLAlchemy / claude_agent_sdk / prompts imports and the security
+setup before the agent can send its first prompt. A worker process
+(``autonomous_agent_demo.py --worker``) pays that once and then runs feature
+assignments it receives as JSON lines on stdin, one at a time, reporting the
+end of each assignment with a marker line on stdout.
+
+The orchestrator acquires a worker, sends it an assignment, reads its output
+until the done marker, and releases it back to the pool. A worker that was
+killed (stop_feature), crashed, or has served MAX_ASSIGNMENTS_PER_WORKER
+assignments is discarded and replaced on demand. recycle() retires every
+current worker, e.g. when the environment they were started with went stale.
+The pool reports every worker it retires or finds dead to its on_exit
+callback, so the orchestrator can release what the worker's agents held.
+"""
+
+import asyncio
+import json
+from typing import Awaitable, Callable
+
+from server.utils.process_utils import kill_process_tree_async
+
+# Marker lines written by the worker (see agent.run_agent_worker)
+WORKER_MARKER_PREFIX = "[WORKER]"
+WORKER_READY_MARKER = f"{WORKER_MARKER_PREFIX} ready"
+WORKER_DONE_MARKER = f"{WORKER_MARKER_PREFIX} done"
+
+# Recycle workers periodically so leaks in long-lived imports can't accumulate
+MAX_ASSIGNMENTS_PER_WORKER = 25
+
+# How long a worker gets to exit after its stdin is closed
+WORKER_SHUTDOWN_TIMEOUT = 5.0
+
+SpawnWorker = Callable[[], Awaitable[asyncio.subprocess.Process]]
+OnWorkerExit = Callable[["AgentWorker"], None]
+
+
+def parse_done_marker(line: str) -> int | None:
+    """Return the exit status from a done marker line, or None if it isn't one."""
+    if not line.startswith(WORKER_DONE_MARKER):
+        return None
+    try:
+        return int(json.loads(line[len(WORKER_DONE_MARKER):]).get("status", 1))
+    except (ValueError, AttributeError):
+        return 1
+
+
+class AgentWorker:
+    """One warm worker process."""
+
+    def __init__(self, proc: asyncio.subprocess.Process, generation: int = 0):
+        self.proc = proc
+        self.assignments = 0
+        # Pool generation the worker was started in (see WorkerPool.recycle)
+        self.generation = generation
+
+    @property
+    def pid(self) -> int:
+        return self.proc.pid
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+    @property
+    def stdin(self) -> asyncio.StreamWriter:
+        # Workers are always spawned with stdin=PIPE
+        assert self.proc.stdin is not None
+        return self.proc.stdin
+
+    async def assign(self, assignment: dict) -> None:
+        """Send an assignment (agent_type, feature_id, testing_feature_id)."""
+        self.assignments += 1
+        self.stdin.write((json.dumps(assignment) + "\n").encode("utf-8"))
+        await self.stdin.drain()
+
+    async def shutdown(self) -> None:
+        """Ask the worker to exit by closing its stdin, killing it if it doesn't."""
+        if not self.alive:
+            return
+        try:
+            self.stdin.close()
+            await asyncio.wait_for(self.proc.wait(), timeout=WORKER_SHUTDOWN_TIMEOUT)
+        except (asyncio.TimeoutError, ConnectionError):
+            await kill_process_tree_async(self.proc, timeout=WORKER_SHUTDOWN_TIMEOUT)
+
+
+class WorkerPool:
+    """
+    Idle warm workers, handed out one assignment at a time.
+
+    Not thread-safe: used only from the orchestrator's event loop.
+    """
+
+    def __init__(self, spawn: SpawnWorker, max_idle: int, on_exit: OnWorkerExit | None = None):
+        self._spawn = spawn
+        self.max_idle = max(0, max_idle)
+        self._on_exit = on_exit
+        self._idle: list[AgentWorker] = []
+        self._closed = False
+        self._generation = 0
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    async def start_worker(self) -> AgentWorker:
+        """Start a new worker in the current generation (not added to the idle list)."""
+        generation = self._generation
+        return AgentWorker(await self._spawn(), generation)
+
+    async def _retire(self, worker: AgentWorker) -> None:
+        """Shut a worker down and report its exit."""
+        await worker.shutdown()
+        if self._on_exit is not None:
+            self._on_exit(worker)
+
+    async def prewarm(self, count: int) -> None:
+        """Start workers until `count` (capped at max_idle) are idle."""
+        target = min(count, self.max_idle)
+        while not self._closed and len(self._idle) < target:
+            worker = await self.start_worker()
+            if self._closed:
+                await self._retire(worker)
+                break
+            if worker.generation != self._generation:
+                await self._retire(worker)  # Recycled while starting
+                continue
+            self._idle.append(worker)
+
+    async def acquire(self) -> AgentWorker:
+        """Return an idle worker, or start a new one if none is available."""
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.alive:
+                return worker
+            await self._retire(worker)  # Died while idle
+        return await self.start_worker()
+
+    async def release(self, worker: AgentWorker) -> None:
+        """Return a worker after its assignment finished."""
+        if (
+            self._closed
+            or not worker.alive
+            or worker.assignments >= MAX_ASSIGNMENTS_PER_WORKER
+            or worker.generation != self._generation
+            or len(self._idle) >= self.max_idle
+        ):
+            await self._retire(worker)
+            return
+        self._idle.append(worker)
+
+    async def recycle(self) -> None:
+        """Retire every current worker: idle ones now, busy ones when released."""
+        self._generation += 1
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(self._retire(worker) for worker in idle), return_exceptions=True)
+
+    async def close(self) -> None:
+        """Shut down all idle workers. Busy workers are stopped by their owner."""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(self._retire(worker) for worker in idle), return_exceptions=True)